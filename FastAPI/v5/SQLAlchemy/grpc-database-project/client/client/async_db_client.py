@@ -0,0 +1,513 @@
+# ================================
+# client/async_db_client.py
+import asyncio
+import grpc
+import json
+import random
+import structlog
+from typing import Dict, Any, AsyncIterator, Iterable, List, Optional
+
+import sys
+import os
+sys.path.insert(0, os.path.abspath(os.path.dirname(__file__)))
+
+
+# Import generated protobuf files
+import database_service_pb2
+import database_service_pb2_grpc
+
+
+
+from .config import config
+from .db_client import IDEMPOTENT_METHODS, append_requests, batch_to_dicts, channel_options, channel_compression, payload_format, record_to_dict
+
+logger = structlog.get_logger()
+
+class AsyncDatabaseClient:
+    """asyncio gRPC client for the database service
+
+    Mirrors ``DatabaseClient`` on top of ``grpc.aio``. All calls share one
+    channel, and a semaphore caps how many RPCs are in flight at once so a
+    burst of coroutines queues locally instead of overloading the server.
+    """
+
+    def __init__(self, server_address: Optional[str] = None, timeout: Optional[int] = None,
+                 max_in_flight: Optional[int] = None):
+        self.server_address = server_address or config.server_address
+        self.timeout = timeout or config.timeout
+        self.max_retries = config.max_retries
+        self.retry_delay = config.retry_delay
+        self.max_in_flight = max_in_flight or config.max_in_flight
+
+        self._channel: Optional[grpc.aio.Channel] = None
+        self._stub: Optional[database_service_pb2_grpc.DatabaseServiceStub] = None
+        self._semaphore = asyncio.Semaphore(self.max_in_flight)
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, exc_type, exc_value, traceback):
+        await self.close()
+
+    def get_stub(self) -> database_service_pb2_grpc.DatabaseServiceStub:
+        """Get the stub bound to the shared channel, opening it on first use"""
+        if self._stub is None:
+            self._channel = grpc.aio.insecure_channel(
+                self.server_address,
+                options=channel_options(),
+                compression=channel_compression()
+            )
+            self._stub = database_service_pb2_grpc.DatabaseServiceStub(self._channel)
+        return self._stub
+
+    async def close(self):
+        """Close the shared channel"""
+        channel, self._channel, self._stub = self._channel, None, None
+        if channel is not None:
+            await channel.close()
+
+    async def _retry_call(self, method: str, *args, **kwargs):
+        """Retry idempotent gRPC calls with jittered exponential backoff"""
+        attempts = self.max_retries if method in IDEMPOTENT_METHODS else 1
+        for attempt in range(attempts):
+            try:
+                async with self._semaphore:
+                    return await getattr(self.get_stub(), method)(*args, **kwargs)
+            except grpc.aio.AioRpcError as e:
+                if attempt == attempts - 1:
+                    logger.error("gRPC call failed after retries",
+                               error=e.details(),
+                               code=e.code().name,
+                               attempts=attempt + 1)
+                    raise
+
+                # Full jitter keeps many failing coroutines from retrying in lockstep
+                delay = random.uniform(0, self.retry_delay * (2 ** attempt))
+                logger.warning("gRPC call failed, retrying",
+                             error=e.details(),
+                             attempt=attempt + 1,
+                             retry_in=delay)
+                await asyncio.sleep(delay)
+            except Exception as e:
+                logger.error("Unexpected error in gRPC call", error=str(e))
+                raise
+
+    # ================================
+    # CRUD Operations
+    # ================================
+
+    async def create_record(self, table_name: str, data: Dict[str, Any]) -> Dict[str, Any]:
+        """Create a new record"""
+        try:
+            request = database_service_pb2.CreateRecordRequest(
+                table_name=table_name,
+                data=json.dumps(data)
+            )
+
+            response = await self._retry_call("CreateRecord", request, timeout=self.timeout)
+
+            return {
+                "success": response.success,
+                "message": response.message,
+                "record_id": response.record_id
+            }
+        except Exception as e:
+            logger.error("Failed to create record", table=table_name, error=str(e))
+            return {"success": False, "message": f"Failed to create record: {str(e)}"}
+
+    async def get_record(self, table_name: str, record_id: int, typed: bool = False,
+                         fields: Optional[List[str]] = None) -> Dict[str, Any]:
+        """Get a record by ID (``typed`` skips JSON and keeps native value types)
+
+        Pass ``fields`` to fetch only those columns; ``id`` is always included.
+        """
+        try:
+            request = database_service_pb2.GetRecordRequest(
+                table_name=table_name,
+                record_id=record_id,
+                format=payload_format(typed),
+                fields=fields or []
+            )
+
+            response = await self._retry_call("GetRecord", request, timeout=self.timeout)
+
+            result = {
+                "success": response.success,
+                "message": response.message
+            }
+
+            if response.success and response.HasField("record"):
+                result["data"] = record_to_dict(response.record)
+            elif response.success and response.data:
+                result["data"] = json.loads(response.data)
+
+            return result
+        except Exception as e:
+            logger.error("Failed to get record", table=table_name, record_id=record_id, error=str(e))
+            return {"success": False, "message": f"Failed to get record: {str(e)}"}
+
+    async def update_record(self, table_name: str, record_id: int, data: Dict[str, Any], return_record: bool = False) -> Dict[str, Any]:
+        """Update a record, optionally getting the updated row back in ``data``"""
+        try:
+            request = database_service_pb2.UpdateRecordRequest(
+                table_name=table_name,
+                record_id=record_id,
+                data=json.dumps(data),
+                return_record=return_record
+            )
+
+            response = await self._retry_call("UpdateRecord", request, timeout=self.timeout)
+
+            result = {
+                "success": response.success,
+                "message": response.message
+            }
+            if response.data:
+                result["data"] = json.loads(response.data)
+            return result
+        except Exception as e:
+            logger.error("Failed to update record", table=table_name, record_id=record_id, error=str(e))
+            return {"success": False, "message": f"Failed to update record: {str(e)}"}
+
+    async def delete_record(self, table_name: str, record_id: int) -> Dict[str, Any]:
+        """Delete a record"""
+        try:
+            request = database_service_pb2.DeleteRecordRequest(
+                table_name=table_name,
+                record_id=record_id
+            )
+
+            response = await self._retry_call("DeleteRecord", request, timeout=self.timeout)
+
+            return {
+                "success": response.success,
+                "message": response.message
+            }
+        except Exception as e:
+            logger.error("Failed to delete record", table=table_name, record_id=record_id, error=str(e))
+            return {"success": False, "message": f"Failed to delete record: {str(e)}"}
+
+    async def list_records(self, table_name: str, page: int = 1, page_size: int = 50, filter_conditions: Optional[str] = None,
+                           after_id: Optional[int] = None, typed: bool = False,
+                           fields: Optional[List[str]] = None, count_mode: str = "exact") -> Dict[str, Any]:
+        """List records with pagination (pass ``after_id`` for keyset paging)
+
+        Large text columns are left out unless named in ``fields``.
+        ``count_mode`` is "exact", "none", "estimate" or "cached".
+        """
+        try:
+            request = database_service_pb2.ListRecordsRequest(
+                table_name=table_name,
+                page=page,
+                page_size=page_size,
+                filter=filter_conditions or "",
+                after_id=after_id or 0,
+                format=payload_format(typed),
+                fields=fields or [],
+                count_mode=database_service_pb2.CountMode.Value(f"COUNT_{count_mode.upper()}")
+            )
+
+            response = await self._retry_call("ListRecords", request, timeout=self.timeout)
+
+            result = {
+                "success": response.success,
+                "message": response.message,
+                "total_count": response.total_count,
+                "count_mode": database_service_pb2.CountMode.Name(response.count_mode)[len("COUNT_"):].lower(),
+                "next_cursor": response.next_cursor,
+                "has_more": response.has_more
+            }
+
+            if response.success and response.HasField("batch"):
+                result["records"] = batch_to_dicts(response.batch)
+            elif response.success:
+                result["records"] = [json.loads(record) for record in response.records]
+
+            return result
+        except Exception as e:
+            logger.error("Failed to list records", table=table_name, error=str(e))
+            return {"success": False, "message": f"Failed to list records: {str(e)}"}
+
+    async def stream_records(self, table_name: str, chunk_size: int = 500, filter_conditions: Optional[str] = None,
+                             after_id: Optional[int] = None, timeout: Optional[float] = None,
+                             typed: bool = False, fields: Optional[List[str]] = None) -> AsyncIterator[Dict[str, Any]]:
+        """Iterate over every matching record as it is streamed from the server"""
+        request = database_service_pb2.ListRecordsStreamRequest(
+            table_name=table_name,
+            filter=filter_conditions or "",
+            chunk_size=chunk_size,
+            after_id=after_id or 0,
+            format=payload_format(typed),
+            fields=fields or []
+        )
+
+        async with self._semaphore:
+            async for chunk in self.get_stub().ListRecordsStream(request, timeout=timeout):
+                if not chunk.success:
+                    logger.error("Failed to stream records", table=table_name, error=chunk.message)
+                    raise RuntimeError(chunk.message)
+                if chunk.HasField("batch"):
+                    for record in batch_to_dicts(chunk.batch):
+                        yield record
+                else:
+                    for record in chunk.records:
+                        yield json.loads(record)
+
+    async def get_many(self, table_name: str, record_ids: List[int], typed: bool = False) -> List[Dict[str, Any]]:
+        """Fetch many records concurrently, returning results in ``record_ids`` order"""
+        return await asyncio.gather(*(self.get_record(table_name, record_id, typed) for record_id in record_ids))
+
+    async def create_many(self, table_name: str, records: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """Create many records with concurrent CreateRecord calls"""
+        return await asyncio.gather(*(self.create_record(table_name, data) for data in records))
+
+    # ================================
+    # Bulk Operations
+    # ================================
+
+    def _row_errors(self, errors) -> List[Dict[str, Any]]:
+        return [{"index": error.index, "message": error.message} for error in errors]
+
+    async def bulk_create_records(self, table_name: str, records: List[Dict[str, Any]]) -> Dict[str, Any]:
+        """Create many records with a single BatchCreateRecords call"""
+        try:
+            request = database_service_pb2.BatchCreateRecordsRequest(
+                table_name=table_name,
+                records=[json.dumps(record) for record in records]
+            )
+
+            response = await self._retry_call("BatchCreateRecords", request, timeout=self.timeout)
+
+            return {
+                "success": response.success,
+                "message": response.message,
+                "record_ids": list(response.record_ids),
+                "errors": self._row_errors(response.errors)
+            }
+        except Exception as e:
+            logger.error("Failed to bulk create records", table=table_name, error=str(e))
+            return {"success": False, "message": f"Failed to bulk create records: {str(e)}"}
+
+    async def bulk_update_records(self, table_name: str, updates: Dict[int, Dict[str, Any]]) -> Dict[str, Any]:
+        """Update many records, given as ``{record_id: data}``, with a single BatchUpdateRecords call"""
+        try:
+            request = database_service_pb2.BatchUpdateRecordsRequest(
+                table_name=table_name,
+                updates=[
+                    database_service_pb2.RecordUpdate(record_id=record_id, data=json.dumps(data))
+                    for record_id, data in updates.items()
+                ]
+            )
+
+            response = await self._retry_call("BatchUpdateRecords", request, timeout=self.timeout)
+
+            return {
+                "success": response.success,
+                "message": response.message,
+                "affected_count": response.affected_count,
+                "errors": self._row_errors(response.errors)
+            }
+        except Exception as e:
+            logger.error("Failed to bulk update records", table=table_name, error=str(e))
+            return {"success": False, "message": f"Failed to bulk update records: {str(e)}"}
+
+    async def bulk_delete_records(self, table_name: str, record_ids: List[int]) -> Dict[str, Any]:
+        """Delete many records with a single BatchDeleteRecords call"""
+        try:
+            request = database_service_pb2.BatchDeleteRecordsRequest(
+                table_name=table_name,
+                record_ids=record_ids
+            )
+
+            response = await self._retry_call("BatchDeleteRecords", request, timeout=self.timeout)
+
+            return {
+                "success": response.success,
+                "message": response.message,
+                "affected_count": response.affected_count,
+                "errors": self._row_errors(response.errors)
+            }
+        except Exception as e:
+            logger.error("Failed to bulk delete records", table=table_name, error=str(e))
+            return {"success": False, "message": f"Failed to bulk delete records: {str(e)}"}
+
+    async def upsert_records(self, table_name: str, records: List[Dict[str, Any]], conflict_columns: List[str],
+                             update_columns: Optional[List[str]] = None) -> Dict[str, Any]:
+        """Insert records, or update the existing rows matching ``conflict_columns``, with a single UpsertRecords call"""
+        try:
+            request = database_service_pb2.UpsertRecordsRequest(
+                table_name=table_name,
+                records=[json.dumps(record) for record in records],
+                conflict_columns=conflict_columns,
+                update_columns=update_columns or []
+            )
+
+            response = await self._retry_call("UpsertRecords", request, timeout=self.timeout)
+
+            return {
+                "success": response.success,
+                "message": response.message,
+                "affected_count": response.affected_count,
+                "errors": self._row_errors(response.errors)
+            }
+        except Exception as e:
+            logger.error("Failed to upsert records", table=table_name, error=str(e))
+            return {"success": False, "message": f"Failed to upsert records: {str(e)}"}
+
+    async def append_records(self, table_name: str, records: Iterable[Dict[str, Any]], batch_size: int = 500,
+                             ack: str = "queued", timeout: Optional[float] = None) -> Dict[str, Any]:
+        """Stream records into an append-only table with a single AppendRecords call"""
+        try:
+            async with self._semaphore:
+                response = await self.get_stub().AppendRecords(
+                    append_requests(table_name, records, batch_size, ack), timeout=timeout
+                )
+
+            return {
+                "success": response.success,
+                "message": response.message,
+                "received_count": response.received_count,
+                "accepted_count": response.accepted_count,
+                "committed_count": response.committed_count,
+                "errors": self._row_errors(response.errors)
+            }
+        except Exception as e:
+            logger.error("Failed to append records", table=table_name, error=str(e))
+            return {"success": False, "message": f"Failed to append records: {str(e)}"}
+
+    # ================================
+    # Migration Operations
+    # ================================
+
+    async def run_migration(self, direction: str = "upgrade", target_revision: Optional[str] = None) -> Dict[str, Any]:
+        """Run database migration"""
+        try:
+            request = database_service_pb2.MigrationRequest(
+                migration_direction=direction,
+                target_revision=target_revision or ""
+            )
+
+            response = await self._retry_call("RunMigration", request, timeout=60)  # Migrations might take longer
+
+            return {
+                "success": response.success,
+                "message": response.message,
+                "current_revision": response.current_revision
+            }
+        except Exception as e:
+            logger.error("Failed to run migration", direction=direction, error=str(e))
+            return {"success": False, "message": f"Failed to run migration: {str(e)}"}
+
+    async def get_migration_status(self) -> Dict[str, Any]:
+        """Get migration status"""
+        try:
+            request = database_service_pb2.MigrationStatusRequest()
+
+            response = await self._retry_call("GetMigrationStatus", request, timeout=self.timeout)
+
+            return {
+                "success": response.success,
+                "current_revision": response.current_revision,
+                "pending_migrations": list(response.pending_migrations)
+            }
+        except Exception as e:
+            logger.error("Failed to get migration status", error=str(e))
+            return {"success": False, "message": f"Failed to get migration status: {str(e)}"}
+
+    # ================================
+    # Schema Operations
+    # ================================
+
+    async def create_table(self, table_name: str, table_schema: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+        """Create a table"""
+        try:
+            request = database_service_pb2.CreateTableRequest(
+                table_name=table_name,
+                table_schema=json.dumps(table_schema) if table_schema else ""
+            )
+
+            response = await self._retry_call("CreateTable", request, timeout=self.timeout)
+
+            return {
+                "success": response.success,
+                "message": response.message
+            }
+        except Exception as e:
+            logger.error("Failed to create table", table=table_name, error=str(e))
+            return {"success": False, "message": f"Failed to create table: {str(e)}"}
+
+    async def add_column(self, table_name: str, column_name: str, column_type: str,
+                         nullable: bool = True, default_value: Optional[str] = None) -> Dict[str, Any]:
+        """Add a column to a table"""
+        try:
+            request = database_service_pb2.AddColumnRequest(
+                table_name=table_name,
+                column_name=column_name,
+                column_type=column_type,
+                nullable=nullable,
+                default_value=default_value or ""
+            )
+
+            response = await self._retry_call("AddColumn", request, timeout=self.timeout)
+
+            return {
+                "success": response.success,
+                "message": response.message
+            }
+        except Exception as e:
+            logger.error("Failed to add column", table=table_name, column=column_name, error=str(e))
+            return {"success": False, "message": f"Failed to add column: {str(e)}"}
+
+    async def drop_column(self, table_name: str, column_name: str) -> Dict[str, Any]:
+        """Drop a column from a table"""
+        try:
+            request = database_service_pb2.DropColumnRequest(
+                table_name=table_name,
+                column_name=column_name
+            )
+
+            response = await self._retry_call("DropColumn", request, timeout=self.timeout)
+
+            return {
+                "success": response.success,
+                "message": response.message
+            }
+        except Exception as e:
+            logger.error("Failed to drop column", table=table_name, column=column_name, error=str(e))
+            return {"success": False, "message": f"Failed to drop column: {str(e)}"}
+
+    # ================================
+    # Health Check
+    # ================================
+
+    async def health_check(self) -> Dict[str, Any]:
+        """Perform health check"""
+        try:
+            request = database_service_pb2.HealthCheckRequest()
+
+            response = await self._retry_call("HealthCheck", request, timeout=5)  # Shorter timeout for health checks
+
+            return {
+                "healthy": response.healthy,
+                "message": response.message,
+                "version": response.version
+            }
+        except Exception as e:
+            logger.error("Health check failed", error=str(e))
+            return {"healthy": False, "message": f"Health check failed: {str(e)}"}
+
+    async def wait_for_server(self, max_wait_time: int = 60) -> bool:
+        """Wait for server to be ready"""
+        loop = asyncio.get_running_loop()
+        start_time = loop.time()
+        while loop.time() - start_time < max_wait_time:
+            result = await self.health_check()
+            if result.get("healthy"):
+                logger.info("Server is ready", server=self.server_address)
+                return True
+
+            logger.info("Waiting for server to be ready", server=self.server_address)
+            await asyncio.sleep(2)
+
+        logger.error("Server not ready after timeout", timeout=max_wait_time)
+        return False
@@ -10,6 +10,12 @@ class ClientConfig:
         self.timeout = int(os.getenv("GRPC_TIMEOUT", "30"))
         self.max_retries = int(os.getenv("GRPC_MAX_RETRIES", "3"))
         self.retry_delay = float(os.getenv("GRPC_RETRY_DELAY", "1.0"))
+        self.channel_pool_size = int(os.getenv("GRPC_CHANNEL_POOL_SIZE", "1"))
+        self.keepalive_time_ms = int(os.getenv("GRPC_KEEPALIVE_TIME_MS", "30000"))
+        self.keepalive_timeout_ms = int(os.getenv("GRPC_KEEPALIVE_TIMEOUT_MS", "10000"))
+        self.max_message_size = int(os.getenv("GRPC_MAX_MESSAGE_SIZE", str(64 * 1024 * 1024)))
+        self.compression = os.getenv("GRPC_COMPRESSION", "none")  # "none", "gzip" or "deflate"
+        self.max_in_flight = int(os.getenv("GRPC_MAX_IN_FLIGHT", "100"))
     
     @property
     def server_address(self) -> str:
@@ -1,10 +1,13 @@
 # ================================
 # client/db_client.py
 import grpc
+import itertools
 import json
+import threading
 import time
 import structlog
-from typing import Dict, Any, List, Optional, Union
+from datetime import datetime, timedelta
+from typing import Dict, Any, Iterable, Iterator, List, Optional, Union
 from contextlib import contextmanager
 
 import sys
@@ -22,31 +25,159 @@ from .config import config
 
 logger = structlog.get_logger()
 
+COMPRESSION_ALGORITHMS = {
+    "none": grpc.Compression.NoCompression,
+    "gzip": grpc.Compression.Gzip,
+    "deflate": grpc.Compression.Deflate,
+}
+
+# RPCs that leave the same result when repeated. Any other call may have
+# reached the server before it failed, so it is never retried.
+IDEMPOTENT_METHODS = frozenset({
+    "GetRecord", "ListRecords", "UpdateRecord", "DeleteRecord",
+    "BatchUpdateRecords", "BatchDeleteRecords", "UpsertRecords",
+    "GetMigrationStatus", "HealthCheck", "GetPoolStats", "GetCacheStats",
+    "GetMeteringRollups", "GetIndexAdvice",
+})
+
+
+def channel_options() -> List[tuple]:
+    """Channel arguments shared by the sync and async clients"""
+    return [
+        ("grpc.keepalive_time_ms", config.keepalive_time_ms),
+        ("grpc.keepalive_timeout_ms", config.keepalive_timeout_ms),
+        ("grpc.keepalive_permit_without_calls", 1),
+        ("grpc.http2.max_pings_without_data", 0),
+        ("grpc.max_send_message_length", config.max_message_size),
+        ("grpc.max_receive_message_length", config.max_message_size),
+        # Give every pooled channel its own connection instead of a shared subchannel
+        ("grpc.use_local_subchannel_pool", 1),
+    ]
+
+
+def channel_compression() -> grpc.Compression:
+    return COMPRESSION_ALGORITHMS.get(config.compression.lower(), grpc.Compression.NoCompression)
+
+
+_EPOCH = datetime(1970, 1, 1)
+
+
+def payload_format(typed: bool) -> int:
+    return database_service_pb2.PAYLOAD_TYPED if typed else database_service_pb2.PAYLOAD_JSON
+
+
+def from_value(value) -> Any:
+    """Decode a typed Value; timestamps come back as naive UTC datetimes"""
+    kind = value.WhichOneof("kind")
+    if kind is None:
+        return None
+    if kind == "timestamp_value":
+        return _EPOCH + timedelta(microseconds=value.timestamp_value)
+    if kind == "json_value":
+        return json.loads(value.json_value)
+    return getattr(value, kind)
+
+
+def record_to_dict(record) -> Dict[str, Any]:
+    return {name: from_value(value) for name, value in record.fields.items()}
+
+
+def batch_to_dicts(batch) -> List[Dict[str, Any]]:
+    """Turn a column-major RecordBatch back into one dict per row"""
+    names = [column.name for column in batch.columns]
+    columns = [[from_value(value) for value in column.values] for column in batch.columns]
+    return [dict(zip(names, row)) for row in zip(*columns)]
+
+def append_requests(table_name: str, records: Iterable[Dict[str, Any]], batch_size: int,
+                    ack: str) -> Iterator[database_service_pb2.AppendRecordsRequest]:
+    """Split records into AppendRecords messages of ``batch_size`` rows, read lazily"""
+    ack_level = database_service_pb2.AckLevel.Value(f"ACK_{ack.upper()}")
+    records = iter(records)
+    while True:
+        batch = [json.dumps(record) for record in itertools.islice(records, batch_size)]
+        if not batch:
+            return
+        yield database_service_pb2.AppendRecordsRequest(table_name=table_name, records=batch, ack=ack_level)
+
 class DatabaseClient:
-    """gRPC client for the database service"""
+    """gRPC client for the database service
+
+    Keeps a small round-robin pool of long-lived channels so RPCs reuse open
+    HTTP/2 connections. Call ``close()`` (or use the client as a context
+    manager) to release them.
+    """
     
-    def __init__(self, server_address: Optional[str] = None, timeout: Optional[int] = None):
+    def __init__(self, server_address: Optional[str] = None, timeout: Optional[int] = None,
+                 pool_size: Optional[int] = None):
         self.server_address = server_address or config.server_address
         self.timeout = timeout or config.timeout
         self.max_retries = config.max_retries
         self.retry_delay = config.retry_delay
+        self.pool_size = max(pool_size or config.channel_pool_size, 1)
         
+        self._channels: List[Optional[grpc.Channel]] = [None] * self.pool_size
+        self._stubs: List[Optional[database_service_pb2_grpc.DatabaseServiceStub]] = [None] * self.pool_size
+        self._next_channel = itertools.count()
+        self._lock = threading.Lock()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    def _create_channel(self) -> grpc.Channel:
+        return grpc.insecure_channel(
+            self.server_address,
+            options=channel_options(),
+            compression=channel_compression()
+        )
+
+    def _pick(self):
+        """Return (pool index, stub) for the next channel in round-robin order"""
+        index = next(self._next_channel) % self.pool_size
+        stub = self._stubs[index]
+        if stub is None:
+            with self._lock:
+                stub = self._stubs[index]
+                if stub is None:
+                    channel = self._create_channel()
+                    stub = database_service_pb2_grpc.DatabaseServiceStub(channel)
+                    self._channels[index] = channel
+                    self._stubs[index] = stub
+        return index, stub
+
+    def get_stub(self) -> database_service_pb2_grpc.DatabaseServiceStub:
+        """Get a stub bound to one of the pooled channels"""
+        return self._pick()[1]
+
     @contextmanager
     def get_channel(self):
-        """Create gRPC channel with proper cleanup"""
-        channel = grpc.insecure_channel(self.server_address)
-        try:
-            yield channel
-        finally:
+        """Borrow one of the pooled channels (it stays open after the block)"""
+        index, _ = self._pick()
+        yield self._channels[index]
+
+    def close(self):
+        """Close every pooled channel"""
+        with self._lock:
+            channels = [channel for channel in self._channels if channel is not None]
+            self._channels = [None] * self.pool_size
+            self._stubs = [None] * self.pool_size
+        for channel in channels:
             channel.close()
     
-    def _retry_call(self, func, *args, **kwargs):
-        """Retry gRPC calls with exponential backoff"""
-        for attempt in range(self.max_retries):
+    def _retry_call(self, method: str, *args, **kwargs):
+        """Retry idempotent gRPC calls with exponential backoff.
+
+        A pooled channel is never closed here: other threads may have calls
+        in flight on it, and gRPC reconnects an unavailable channel itself.
+        """
+        attempts = self.max_retries if method in IDEMPOTENT_METHODS else 1
+        for attempt in range(attempts):
             try:
-                return func(*args, **kwargs)
+                return getattr(self.get_stub(), method)(*args, **kwargs)
             except grpc.RpcError as e:
-                if attempt == self.max_retries - 1:
+                if attempt == attempts - 1:
                     logger.error("gRPC call failed after retries", 
                                error=e.details(), 
                                code=e.code().name,
@@ -69,78 +200,84 @@ class DatabaseClient:
     def create_record(self, table_name: str, data: Dict[str, Any]) -> Dict[str, Any]:
         """Create a new record"""
         try:
-            with self.get_channel() as channel:
-                stub = database_service_pb2_grpc.DatabaseServiceStub(channel)
-                request = database_service_pb2.CreateRecordRequest(
-                    table_name=table_name,
-                    data=json.dumps(data)
-                )
-                
-                response = self._retry_call(
-                    stub.CreateRecord, 
-                    request, 
-                    timeout=self.timeout
-                )
-                
-                return {
-                    "success": response.success,
-                    "message": response.message,
-                    "record_id": response.record_id
-                }
+            request = database_service_pb2.CreateRecordRequest(
+                table_name=table_name,
+                data=json.dumps(data)
+            )
+            
+            response = self._retry_call(
+                "CreateRecord",
+                request, 
+                timeout=self.timeout
+            )
+            
+            return {
+                "success": response.success,
+                "message": response.message,
+                "record_id": response.record_id
+            }
         except Exception as e:
             logger.error("Failed to create record", table=table_name, error=str(e))
             return {"success": False, "message": f"Failed to create record: {str(e)}"}
 
-    def get_record(self, table_name: str, record_id: int) -> Dict[str, Any]:
-        """Get a record by ID"""
+    def get_record(self, table_name: str, record_id: int, typed: bool = False,
+                   fields: Optional[List[str]] = None) -> Dict[str, Any]:
+        """Get a record by ID (``typed`` skips JSON and keeps native value types)
+
+        Pass ``fields`` to fetch only those columns; ``id`` is always included.
+        """
         try:
-            with self.get_channel() as channel:
-                stub = database_service_pb2_grpc.DatabaseServiceStub(channel)
-                request = database_service_pb2.GetRecordRequest(
-                    table_name=table_name,
-                    record_id=record_id
-                )
-                
-                response = self._retry_call(
-                    stub.GetRecord, 
-                    request, 
-                    timeout=self.timeout
-                )
-                
-                result = {
-                    "success": response.success,
-                    "message": response.message
-                }
-                
-                if response.success and response.data:
-                    result["data"] = json.loads(response.data)
-                
-                return result
+            request = database_service_pb2.GetRecordRequest(
+                table_name=table_name,
+                record_id=record_id,
+                format=payload_format(typed),
+                fields=fields or []
+            )
+            
+            response = self._retry_call(
+                "GetRecord",
+                request, 
+                timeout=self.timeout
+            )
+            
+            result = {
+                "success": response.success,
+                "message": response.message
+            }
+            
+            if response.success and response.HasField("record"):
+                result["data"] = record_to_dict(response.record)
+            elif response.success and response.data:
+                result["data"] = json.loads(response.data)
+            
+            return result
         except Exception as e:
             logger.error("Failed to get record", table=table_name, record_id=record_id, error=str(e))
             return {"success": False, "message": f"Failed to get record: {str(e)}"}
 
-    def update_record(self, table_name: str, record_id: int, data: Dict[str, Any]) -> Dict[str, Any]:
-        """Update a record"""
+    def update_record(self, table_name: str, record_id: int, data: Dict[str, Any], return_record: bool = False) -> Dict[str, Any]:
+        """Update a record, optionally getting the updated row back in ``data``"""
         try:
-            with self.get_channel() as channel:
-                stub = database_service_pb2_grpc.DatabaseServiceStub(channel)
-                request = database_service_pb2.UpdateRecordRequest(
-                    table_name=table_name,
-                    record_id=record_id,
-                    data=json.dumps(data)
-                )
-                
-                response = self._retry_call(
-                    stub.UpdateRecord, 
-                    request, 
-                    timeout=self.timeout
-                )
-                
-                return {
-                    "success": response.success,
-                    "message": response.message
-                }
+            request = database_service_pb2.UpdateRecordRequest(
+                table_name=table_name,
+                record_id=record_id,
+                data=json.dumps(data),
+                return_record=return_record
+            )
+            
+            response = self._retry_call(
+                "UpdateRecord",
+                request, 
+                timeout=self.timeout
+            )
+            
+            result = {
+                "success": response.success,
+                "message": response.message
+            }
+            if response.data:
+                result["data"] = json.loads(response.data)
+            return result
         except Exception as e:
             logger.error("Failed to update record", table=table_name, record_id=record_id, error=str(e))
             return {"success": False, "message": f"Failed to update record: {str(e)}"}
@@ -148,59 +285,234 @@ class DatabaseClient:
     def delete_record(self, table_name: str, record_id: int) -> Dict[str, Any]:
         """Delete a record"""
         try:
-            with self.get_channel() as channel:
-                stub = database_service_pb2_grpc.DatabaseServiceStub(channel)
-                request = database_service_pb2.DeleteRecordRequest(
-                    table_name=table_name,
-                    record_id=record_id
-                )
-                
-                response = self._retry_call(
-                    stub.DeleteRecord, 
-                    request, 
-                    timeout=self.timeout
-                )
-                
-                return {
-                    "success": response.success,
-                    "message": response.message
-                }
+            request = database_service_pb2.DeleteRecordRequest(
+                table_name=table_name,
+                record_id=record_id
+            )
+            
+            response = self._retry_call(
+                "DeleteRecord",
+                request, 
+                timeout=self.timeout
+            )
+            
+            return {
+                "success": response.success,
+                "message": response.message
+            }
         except Exception as e:
             logger.error("Failed to delete record", table=table_name, record_id=record_id, error=str(e))
             return {"success": False, "message": f"Failed to delete record: {str(e)}"}
 
-    def list_records(self, table_name: str, page: int = 1, page_size: int = 50, filter_conditions: Optional[str] = None) -> Dict[str, Any]:
-        """List records with pagination"""
+    def list_records(self, table_name: str, page: int = 1, page_size: int = 50, filter_conditions: Optional[str] = None,
+                     after_id: Optional[int] = None, typed: bool = False,
+                     fields: Optional[List[str]] = None, count_mode: str = "exact") -> Dict[str, Any]:
+        """List records with pagination (pass ``after_id`` for keyset paging)
+
+        Large text columns are left out unless named in ``fields``.
+        ``count_mode`` is "exact", "none", "estimate" or "cached".
+        """
         try:
-            with self.get_channel() as channel:
-                stub = database_service_pb2_grpc.DatabaseServiceStub(channel)
-                request = database_service_pb2.ListRecordsRequest(
-                    table_name=table_name,
-                    page=page,
-                    page_size=page_size,
-                    filter=filter_conditions or ""
-                )
-                
-                response = self._retry_call(
-                    stub.ListRecords, 
-                    request, 
-                    timeout=self.timeout
-                )
-                
-                result = {
-                    "success": response.success,
-                    "message": response.message,
-                    "total_count": response.total_count
-                }
-                
-                if response.success:
-                    result["records"] = [json.loads(record) for record in response.records]
-                
-                return result
+            request = database_service_pb2.ListRecordsRequest(
+                table_name=table_name,
+                page=page,
+                page_size=page_size,
+                filter=filter_conditions or "",
+                after_id=after_id or 0,
+                format=payload_format(typed),
+                fields=fields or [],
+                count_mode=database_service_pb2.CountMode.Value(f"COUNT_{count_mode.upper()}")
+            )
+            
+            response = self._retry_call(
+                "ListRecords",
+                request, 
+                timeout=self.timeout
+            )
+            
+            result = {
+                "success": response.success,
+                "message": response.message,
+                "total_count": response.total_count,
+                "count_mode": database_service_pb2.CountMode.Name(response.count_mode)[len("COUNT_"):].lower(),
+                "next_cursor": response.next_cursor,
+                "has_more": response.has_more
+            }
+            
+            if response.success and response.HasField("batch"):
+                result["records"] = batch_to_dicts(response.batch)
+            elif response.success:
+                result["records"] = [json.loads(record) for record in response.records]
+            
+            return result
         except Exception as e:
             logger.error("Failed to list records", table=table_name, error=str(e))
             return {"success": False, "message": f"Failed to list records: {str(e)}"}
 
+    def stream_records(self, table_name: str, chunk_size: int = 500, filter_conditions: Optional[str] = None,
+                       after_id: Optional[int] = None, timeout: Optional[float] = None,
+                       typed: bool = False, fields: Optional[List[str]] = None) -> Iterator[Dict[str, Any]]:
+        """Iterate over every matching record, streamed from the server in chunks.
+
+        Rows are yielded as they arrive so memory use does not grow with the
+        table. Streams are not retried; resume from the last seen ``id`` with
+        ``after_id`` instead.
+        """
+        request = database_service_pb2.ListRecordsStreamRequest(
+            table_name=table_name,
+            filter=filter_conditions or "",
+            chunk_size=chunk_size,
+            after_id=after_id or 0,
+            format=payload_format(typed),
+            fields=fields or []
+        )
+        
+        for chunk in self.get_stub().ListRecordsStream(request, timeout=timeout):
+            if not chunk.success:
+                logger.error("Failed to stream records", table=table_name, error=chunk.message)
+                raise RuntimeError(chunk.message)
+            if chunk.HasField("batch"):
+                yield from batch_to_dicts(chunk.batch)
+            else:
+                for record in chunk.records:
+                    yield json.loads(record)
+
+    # ================================
+    # Bulk Operations
+    # ================================
+    
+    def _row_errors(self, errors) -> List[Dict[str, Any]]:
+        return [{"index": error.index, "message": error.message} for error in errors]
+
+    def bulk_create_records(self, table_name: str, records: List[Dict[str, Any]]) -> Dict[str, Any]:
+        """Create many records with a single BatchCreateRecords call"""
+        try:
+            request = database_service_pb2.BatchCreateRecordsRequest(
+                table_name=table_name,
+                records=[json.dumps(record) for record in records]
+            )
+            
+            response = self._retry_call(
+                "BatchCreateRecords",
+                request, 
+                timeout=self.timeout
+            )
+            
+            return {
+                "success": response.success,
+                "message": response.message,
+                "record_ids": list(response.record_ids),
+                "errors": self._row_errors(response.errors)
+            }
+        except Exception as e:
+            logger.error("Failed to bulk create records", table=table_name, error=str(e))
+            return {"success": False, "message": f"Failed to bulk create records: {str(e)}"}
+
+    def bulk_update_records(self, table_name: str, updates: Dict[int, Dict[str, Any]]) -> Dict[str, Any]:
+        """Update many records, given as ``{record_id: data}``, with a single BatchUpdateRecords call"""
+        try:
+            request = database_service_pb2.BatchUpdateRecordsRequest(
+                table_name=table_name,
+                updates=[
+                    database_service_pb2.RecordUpdate(record_id=record_id, data=json.dumps(data))
+                    for record_id, data in updates.items()
+                ]
+            )
+            
+            response = self._retry_call(
+                "BatchUpdateRecords",
+                request, 
+                timeout=self.timeout
+            )
+            
+            return {
+                "success": response.success,
+                "message": response.message,
+                "affected_count": response.affected_count,
+                "errors": self._row_errors(response.errors)
+            }
+        except Exception as e:
+            logger.error("Failed to bulk update records", table=table_name, error=str(e))
+            return {"success": False, "message": f"Failed to bulk update records: {str(e)}"}
+
+    def bulk_delete_records(self, table_name: str, record_ids: List[int]) -> Dict[str, Any]:
+        """Delete many records with a single BatchDeleteRecords call"""
+        try:
+            request = database_service_pb2.BatchDeleteRecordsRequest(
+                table_name=table_name,
+                record_ids=record_ids
+            )
+            
+            response = self._retry_call(
+                "BatchDeleteRecords",
+                request, 
+                timeout=self.timeout
+            )
+            
+            return {
+                "success": response.success,
+                "message": response.message,
+                "affected_count": response.affected_count,
+                "errors": self._row_errors(response.errors)
+            }
+        except Exception as e:
+            logger.error("Failed to bulk delete records", table=table_name, error=str(e))
+            return {"success": False, "message": f"Failed to bulk delete records: {str(e)}"}
+
+    def upsert_records(self, table_name: str, records: List[Dict[str, Any]], conflict_columns: List[str],
+                       update_columns: Optional[List[str]] = None) -> Dict[str, Any]:
+        """Insert records, or update the existing rows matching ``conflict_columns``, with a single UpsertRecords call"""
+        try:
+            request = database_service_pb2.UpsertRecordsRequest(
+                table_name=table_name,
+                records=[json.dumps(record) for record in records],
+                conflict_columns=conflict_columns,
+                update_columns=update_columns or []
+            )
+            
+            response = self._retry_call(
+                "UpsertRecords",
+                request, 
+                timeout=self.timeout
+            )
+            
+            return {
+                "success": response.success,
+                "message": response.message,
+                "affected_count": response.affected_count,
+                "errors": self._row_errors(response.errors)
+            }
+        except Exception as e:
+            logger.error("Failed to upsert records", table=table_name, error=str(e))
+            return {"success": False, "message": f"Failed to upsert records: {str(e)}"}
+
+    def append_records(self, table_name: str, records: Iterable[Dict[str, Any]], batch_size: int = 500,
+                       ack: str = "queued", timeout: Optional[float] = None) -> Dict[str, Any]:
+        """Stream records into an append-only table with a single AppendRecords call.
+
+        ``records`` can be a generator; it is only read as fast as the server
+        takes the rows. By default the call returns once every row is queued
+        on the server; with ``ack="committed"`` it waits until they are
+        committed. Streams are not retried; after a failure, resend the
+        records from ``received_count`` on.
+        """
+        try:
+            response = self.get_stub().AppendRecords(
+                append_requests(table_name, records, batch_size, ack), timeout=timeout
+            )
+            
+            return {
+                "success": response.success,
+                "message": response.message,
+                "received_count": response.received_count,
+                "accepted_count": response.accepted_count,
+                "committed_count": response.committed_count,
+                "errors": self._row_errors(response.errors)
+            }
+        except Exception as e:
+            logger.error("Failed to append records", table=table_name, error=str(e))
+            return {"success": False, "message": f"Failed to append records: {str(e)}"}
+
     # ================================
     # Migration Operations
     # ================================
@@ -208,24 +520,22 @@ class DatabaseClient:
     def run_migration(self, direction: str = "upgrade", target_revision: Optional[str] = None) -> Dict[str, Any]:
         """Run database migration"""
         try:
-            with self.get_channel() as channel:
-                stub = database_service_pb2_grpc.DatabaseServiceStub(channel)
-                request = database_service_pb2.MigrationRequest(
-                    migration_direction=direction,
-                    target_revision=target_revision or ""
-                )
-                
-                response = self._retry_call(
-                    stub.RunMigration, 
-                    request, 
-                    timeout=60  # Migrations might take longer
-                )
-                
-                return {
-                    "success": response.success,
-                    "message": response.message,
-                    "current_revision": response.current_revision
-                }
+            request = database_service_pb2.MigrationRequest(
+                migration_direction=direction,
+                target_revision=target_revision or ""
+            )
+            
+            response = self._retry_call(
+                "RunMigration",
+                request, 
+                timeout=60  # Migrations might take longer
+            )
+            
+            return {
+                "success": response.success,
+                "message": response.message,
+                "current_revision": response.current_revision
+            }
         except Exception as e:
             logger.error("Failed to run migration", direction=direction, error=str(e))
             return {"success": False, "message": f"Failed to run migration: {str(e)}"}
@@ -233,21 +543,19 @@ class DatabaseClient:
     def get_migration_status(self) -> Dict[str, Any]:
         """Get migration status"""
         try:
-            with self.get_channel() as channel:
-                stub = database_service_pb2_grpc.DatabaseServiceStub(channel)
-                request = database_service_pb2.MigrationStatusRequest()
-                
-                response = self._retry_call(
-                    stub.GetMigrationStatus, 
-                    request, 
-                    timeout=self.timeout
-                )
-                
-                return {
-                    "success": response.success,
-                    "current_revision": response.current_revision,
-                    "pending_migrations": list(response.pending_migrations)
-                }
+            request = database_service_pb2.MigrationStatusRequest()
+            
+            response = self._retry_call(
+                "GetMigrationStatus",
+                request, 
+                timeout=self.timeout
+            )
+            
+            return {
+                "success": response.success,
+                "current_revision": response.current_revision,
+                "pending_migrations": list(response.pending_migrations)
+            }
         except Exception as e:
             logger.error("Failed to get migration status", error=str(e))
             return {"success": False, "message": f"Failed to get migration status: {str(e)}"}
@@ -259,23 +567,21 @@ class DatabaseClient:
     def create_table(self, table_name: str, table_schema: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
         """Create a table"""
         try:
-            with self.get_channel() as channel:
-                stub = database_service_pb2_grpc.DatabaseServiceStub(channel)
-                request = database_service_pb2.CreateTableRequest(
-                    table_name=table_name,
-                    table_schema=json.dumps(table_schema) if table_schema else ""
-                )
-                
-                response = self._retry_call(
-                    stub.CreateTable, 
-                    request, 
-                    timeout=self.timeout
-                )
-                
-                return {
-                    "success": response.success,
-                    "message": response.message
-                }
+            request = database_service_pb2.CreateTableRequest(
+                table_name=table_name,
+                table_schema=json.dumps(table_schema) if table_schema else ""
+            )
+            
+            response = self._retry_call(
+                "CreateTable",
+                request, 
+                timeout=self.timeout
+            )
+            
+            return {
+                "success": response.success,
+                "message": response.message
+            }
         except Exception as e:
             logger.error("Failed to create table", table=table_name, error=str(e))
             return {"success": False, "message": f"Failed to create table: {str(e)}"}
@@ -284,26 +590,24 @@ class DatabaseClient:
                    nullable: bool = True, default_value: Optional[str] = None) -> Dict[str, Any]:
         """Add a column to a table"""
         try:
-            with self.get_channel() as channel:
-                stub = database_service_pb2_grpc.DatabaseServiceStub(channel)
-                request = database_service_pb2.AddColumnRequest(
-                    table_name=table_name,
-                    column_name=column_name,
-                    column_type=column_type,
-                    nullable=nullable,
-                    default_value=default_value or ""
-                )
-                
-                response = self._retry_call(
-                    stub.AddColumn, 
-                    request, 
-                    timeout=self.timeout
-                )
-                
-                return {
-                    "success": response.success,
-                    "message": response.message
-                }
+            request = database_service_pb2.AddColumnRequest(
+                table_name=table_name,
+                column_name=column_name,
+                column_type=column_type,
+                nullable=nullable,
+                default_value=default_value or ""
+            )
+            
+            response = self._retry_call(
+                "AddColumn",
+                request, 
+                timeout=self.timeout
+            )
+            
+            return {
+                "success": response.success,
+                "message": response.message
+            }
         except Exception as e:
             logger.error("Failed to add column", table=table_name, column=column_name, error=str(e))
             return {"success": False, "message": f"Failed to add column: {str(e)}"}
@@ -311,23 +615,21 @@ class DatabaseClient:
     def drop_column(self, table_name: str, column_name: str) -> Dict[str, Any]:
         """Drop a column from a table"""
         try:
-            with self.get_channel() as channel:
-                stub = database_service_pb2_grpc.DatabaseServiceStub(channel)
-                request = database_service_pb2.DropColumnRequest(
-                    table_name=table_name,
-                    column_name=column_name
-                )
-                
-                response = self._retry_call(
-                    stub.DropColumn, 
-                    request, 
-                    timeout=self.timeout
-                )
-                
-                return {
-                    "success": response.success,
-                    "message": response.message
-                }
+            request = database_service_pb2.DropColumnRequest(
+                table_name=table_name,
+                column_name=column_name
+            )
+            
+            response = self._retry_call(
+                "DropColumn",
+                request, 
+                timeout=self.timeout
+            )
+            
+            return {
+                "success": response.success,
+                "message": response.message
+            }
         except Exception as e:
             logger.error("Failed to drop column", table=table_name, column=column_name, error=str(e))
             return {"success": False, "message": f"Failed to drop column: {str(e)}"}
@@ -339,25 +641,163 @@ class DatabaseClient:
     def health_check(self) -> Dict[str, Any]:
         """Perform health check"""
         try:
-            with self.get_channel() as channel:
-                stub = database_service_pb2_grpc.DatabaseServiceStub(channel)
-                request = database_service_pb2.HealthCheckRequest()
-                
-                response = self._retry_call(
-                    stub.HealthCheck, 
-                    request, 
-                    timeout=5  # Shorter timeout for health checks
-                )
-                
-                return {
-                    "healthy": response.healthy,
-                    "message": response.message,
-                    "version": response.version
-                }
+            request = database_service_pb2.HealthCheckRequest()
+            
+            response = self._retry_call(
+                "HealthCheck",
+                request, 
+                timeout=5  # Shorter timeout for health checks
+            )
+            
+            return {
+                "healthy": response.healthy,
+                "message": response.message,
+                "version": response.version
+            }
         except Exception as e:
             logger.error("Health check failed", error=str(e))
             return {"healthy": False, "message": f"Health check failed: {str(e)}"}
 
+    def get_pool_stats(self) -> Dict[str, Any]:
+        """Get the server's database connection pool statistics"""
+        try:
+            request = database_service_pb2.PoolStatsRequest()
+            
+            response = self._retry_call(
+                "GetPoolStats",
+                request, 
+                timeout=self.timeout
+            )
+            
+            return {
+                "success": response.success,
+                "message": response.message,
+                "pools": [
+                    {
+                        "name": pool.name,
+                        "size": pool.size,
+                        "checked_out": pool.checked_out,
+                        "checked_in": pool.checked_in,
+                        "overflow": pool.overflow,
+                        "checkouts": pool.checkouts,
+                        "timeouts": pool.timeouts,
+                        "connects": pool.connects,
+                        "connect_time_avg_ms": pool.connect_time_avg_ms,
+                        "wait_time_sum_ms": pool.wait_time_sum_ms,
+                        "wait_time_ms": [{"le": bucket.le, "count": bucket.count} for bucket in pool.wait_time_ms]
+                    }
+                    for pool in response.pools
+                ]
+            }
+        except Exception as e:
+            logger.error("Failed to get pool stats", error=str(e))
+            return {"success": False, "message": f"Failed to get pool stats: {str(e)}"}
+
+    def get_cache_stats(self) -> Dict[str, Any]:
+        """Get the server's record cache hit/miss counters per table"""
+        try:
+            request = database_service_pb2.CacheStatsRequest()
+
+            response = self._retry_call(
+                "GetCacheStats",
+                request,
+                timeout=self.timeout
+            )
+
+            return {
+                "success": response.success,
+                "message": response.message,
+                "tables": [
+                    {
+                        "table_name": table.table_name,
+                        "hits": table.hits,
+                        "misses": table.misses,
+                        "redis_hits": table.redis_hits,
+                        "invalidations": table.invalidations,
+                        "entries": table.entries
+                    }
+                    for table in response.tables
+                ]
+            }
+        except Exception as e:
+            logger.error("Failed to get cache stats", error=str(e))
+            return {"success": False, "message": f"Failed to get cache stats: {str(e)}"}
+
+    def get_metering_rollups(self, source_table: Optional[str] = None, start_day: Optional[str] = None,
+                             end_day: Optional[str] = None, partition_id: Optional[str] = None) -> Dict[str, Any]:
+        """Get per-day IQ metering totals for days in [start_day, end_day), given as YYYY-MM-DD"""
+        try:
+            request = database_service_pb2.MeteringRollupsRequest(
+                source_table=source_table or "",
+                start_day=start_day or "",
+                end_day=end_day or "",
+                partition_id=partition_id or ""
+            )
+
+            response = self._retry_call(
+                "GetMeteringRollups",
+                request,
+                timeout=self.timeout
+            )
+
+            return {
+                "success": response.success,
+                "message": response.message,
+                "rollups": [
+                    {
+                        "day": rollup.day,
+                        "source_table": rollup.source_table,
+                        "partition_id": rollup.partition_id,
+                        "operation_type": rollup.operation_type,
+                        "status": rollup.status,
+                        "record_count": rollup.record_count,
+                        "data_size_mb": rollup.data_size_mb
+                    }
+                    for rollup in response.rollups
+                ]
+            }
+        except Exception as e:
+            logger.error("Failed to get metering rollups", error=str(e))
+            return {"success": False, "message": f"Failed to get metering rollups: {str(e)}"}
+
+    def get_index_advice(self, table_name: Optional[str] = None) -> Dict[str, Any]:
+        """Get slow ListRecords filter shapes, their plans and suggested indexes"""
+        try:
+            request = database_service_pb2.IndexAdviceRequest(table_name=table_name or "")
+
+            response = self._retry_call(
+                "GetIndexAdvice",
+                request,
+                timeout=self.timeout
+            )
+
+            return {
+                "success": response.success,
+                "message": response.message,
+                "advice": [
+                    {
+                        "table_name": item.table_name,
+                        "equality_columns": list(item.equality_columns),
+                        "range_columns": list(item.range_columns),
+                        "order_columns": list(item.order_columns),
+                        "calls": item.calls,
+                        "slow_calls": item.slow_calls,
+                        "avg_ms": item.avg_ms,
+                        "max_ms": item.max_ms,
+                        "full_scan": item.full_scan,
+                        "plan": item.plan,
+                        "index_used": item.index_used,
+                        "suggested_index": item.suggested_index,
+                        "suggested_columns": list(item.suggested_columns)
+                    }
+                    for item in response.advice
+                ],
+                "migration_stub": response.migration_stub
+            }
+        except Exception as e:
+            logger.error("Failed to get index advice", error=str(e))
+            return {"success": False, "message": f"Failed to get index advice: {str(e)}"}
+
     # ================================
     # Convenience Methods
     # ================================
@@ -46,6 +46,38 @@ def bulk_create_test(client: DatabaseClient, count: int = 100):
     
     return created_ids
 
+def batch_create_test(client: DatabaseClient, count: int = 100):
+    """Test creating records with a single BatchCreateRecords call"""
+    table_name = "rbac_user_info"
+    
+    records = [
+        {
+            "email": f"batch_user_{i}@example.com",
+            "first_name": f"User{i}",
+            "last_name": "BatchTest"
+        }
+        for i in range(count)
+    ]
+    
+    start_time = time.time()
+    result = client.bulk_create_records(table_name, records)
+    duration = time.time() - start_time
+    
+    if not result["success"]:
+        logger.error("Batch create failed", error=result["message"])
+        return []
+    
+    for error in result["errors"]:
+        logger.error("Failed to create record", index=error["index"], error=error["message"])
+    created_ids = [record_id for record_id in result["record_ids"] if record_id]
+    
+    logger.info("Batch create completed",
+               count=len(created_ids),
+               duration=duration,
+               rate=len(created_ids)/duration)
+    
+    return created_ids
+
 def bulk_read_test(client: DatabaseClient, record_ids: list):
     """Test bulk reading of records"""
     table_name = "rbac_user_info"
@@ -78,14 +110,17 @@ def main():
     logger.info("Starting bulk create test")
     created_ids = bulk_create_test(client, 50)
     
+    # Batch create test
+    logger.info("Starting batch create test")
+    created_ids += batch_create_test(client, 50)
+    
     # Bulk read test
     logger.info("Starting bulk read test")
     bulk_read_test(client, created_ids)
     
     # Cleanup - bulk delete
     logger.info("Cleaning up test records")
-    for record_id in created_ids:
-        client.delete_record("rbac_user_info", record_id)
+    client.bulk_delete_records("rbac_user_info", created_ids)
 
 if __name__ == "__main__":
     main()
@@ -0,0 +1,57 @@
+# ================================
+# tests/test_async_client.py
+import asyncio
+import pytest
+import structlog
+from client.client.async_db_client import AsyncDatabaseClient
+
+logger = structlog.get_logger()
+
+class TestAsyncClient:
+    def setup_method(self):
+        """Setup for each test"""
+        self.test_table = "rbac_user_info"
+        self.test_data = {
+            "email": "async@example.com",
+            "first_name": "Async",
+            "last_name": "User"
+        }
+
+    def run(self, coro):
+        return asyncio.run(coro)
+
+    def test_crud_roundtrip(self):
+        """Test create, get and delete through the async client"""
+        async def scenario():
+            async with AsyncDatabaseClient() as client:
+                assert await client.wait_for_server(), "Server not available"
+                
+                create_result = await client.create_record(self.test_table, self.test_data)
+                assert create_result["success"], f"Create failed: {create_result['message']}"
+                record_id = create_result["record_id"]
+                
+                get_result = await client.get_record(self.test_table, record_id)
+                assert get_result["data"]["email"] == self.test_data["email"]
+                
+                delete_result = await client.delete_record(self.test_table, record_id)
+                assert delete_result["success"], f"Delete failed: {delete_result['message']}"
+        
+        self.run(scenario())
+
+    def test_get_many(self):
+        """Test concurrent fetches stay in request order under the in-flight limit"""
+        async def scenario():
+            async with AsyncDatabaseClient(max_in_flight=4) as client:
+                assert await client.wait_for_server(), "Server not available"
+                
+                records = [dict(self.test_data, email=f"async{i}@example.com") for i in range(10)]
+                created = await client.create_many(self.test_table, records)
+                record_ids = [result["record_id"] for result in created]
+                
+                results = await client.get_many(self.test_table, record_ids)
+                assert [result["data"]["id"] for result in results] == record_ids
+                
+                await client.bulk_delete_records(self.test_table, record_ids)
+                logger.info("Fetched records concurrently", count=len(results))
+        
+        self.run(scenario())
@@ -1,9 +1,11 @@
 # ================================
 # tests/test_crud.py
+import json
 import pytest
 import structlog
 #from client.db_client import DatabaseClient
 from client.client.db_client import DatabaseClient
+import database_service_pb2  # on sys.path once db_client is imported
 
 logger = structlog.get_logger()
 
@@ -67,6 +69,23 @@ class TestCRUDOperations:
         
         logger.info("Updated record", record_id=record_id)
 
+    def test_update_returning_record(self):
+        """Test getting the updated row back and updating missing rows"""
+        create_result = self.client.create_record(self.test_table, self.test_data)
+        assert create_result["success"]
+        record_id = create_result["record_id"]
+
+        result = self.client.update_record(self.test_table, record_id, {"last_name": "Echo"}, return_record=True)
+        assert result["success"], f"Update failed: {result['message']}"
+        assert result["data"]["id"] == record_id
+        assert result["data"]["last_name"] == "Echo"
+
+        missing = self.client.update_record(self.test_table, 2**62, {"last_name": "Echo"})
+        assert not missing["success"], "Updating a missing record should fail"
+
+        bad = self.client.update_record(self.test_table, record_id, {"no_such_column": "x"})
+        assert not bad["success"], "Unknown columns should be rejected"
+
     def test_list_records(self):
         """Test listing records"""
         # Create a few records
@@ -84,6 +103,97 @@ class TestCRUDOperations:
         
         logger.info("Listed records", count=len(result["records"]))
 
+    def test_list_records_keyset(self):
+        """Test walking a table with the keyset cursor"""
+        for i in range(3):
+            data = self.test_data.copy()
+            data["email"] = f"keyset{i}@example.com"
+            self.client.create_record(self.test_table, data)
+        
+        first = self.client.list_records(self.test_table, page_size=2)
+        assert first["success"], f"List failed: {first['message']}"
+        assert len(first["records"]) == 2
+        assert first["has_more"], "Should report a next page"
+        assert first["next_cursor"] == first["records"][-1]["id"]
+        
+        second = self.client.list_records(self.test_table, page_size=2, after_id=first["next_cursor"])
+        assert second["success"], f"List failed: {second['message']}"
+        assert all(r["id"] > first["next_cursor"] for r in second["records"])
+        
+        logger.info("Listed keyset page", cursor=first["next_cursor"])
+
+    def test_stream_records(self):
+        """Test streaming a table in chunks"""
+        for i in range(3):
+            data = self.test_data.copy()
+            data["email"] = f"stream{i}@example.com"
+            self.client.create_record(self.test_table, data)
+        
+        records = list(self.client.stream_records(self.test_table, chunk_size=2))
+        ids = [record["id"] for record in records]
+        
+        assert len(records) >= 3, "Should stream at least 3 records"
+        assert ids == sorted(ids), "Records should be streamed in id order"
+        
+        logger.info("Streamed records", count=len(records))
+
+    def test_typed_payloads(self):
+        """Test that typed payloads decode to the same records as JSON"""
+        create_result = self.client.create_record(self.test_table, self.test_data)
+        assert create_result["success"]
+        record_id = create_result["record_id"]
+
+        json_result = self.client.get_record(self.test_table, record_id)
+        typed_result = self.client.get_record(self.test_table, record_id, typed=True)
+        assert typed_result["success"], f"Get failed: {typed_result['message']}"
+        assert typed_result["data"]["email"] == json_result["data"]["email"]
+
+        json_page = self.client.list_records(self.test_table, page_size=5)
+        typed_page = self.client.list_records(self.test_table, page_size=5, typed=True)
+        assert [r["id"] for r in typed_page["records"]] == [r["id"] for r in json_page["records"]]
+
+        logger.info("Compared typed payloads", record_id=record_id)
+
+    def test_field_projection(self):
+        """Test fetching only selected columns"""
+        create_result = self.client.create_record(self.test_table, self.test_data)
+        assert create_result["success"]
+        record_id = create_result["record_id"]
+
+        result = self.client.get_record(self.test_table, record_id, fields=["email"])
+        assert result["success"], f"Get failed: {result['message']}"
+        assert set(result["data"]) == {"id", "email"}
+
+        page = self.client.list_records(self.test_table, page_size=5, fields=["first_name"])
+        assert all(set(record) == {"id", "first_name"} for record in page["records"])
+
+        bad = self.client.get_record(self.test_table, record_id, fields=["no_such_column"])
+        assert not bad["success"], "Unknown columns should be rejected"
+
+    def test_structured_filter(self):
+        """Test listing with a JSON filter instead of raw SQL"""
+        data = self.test_data.copy()
+        data["email"] = "structured_filter@example.com"
+        create_result = self.client.create_record(self.test_table, data)
+        assert create_result["success"]
+
+        result = self.client.list_records(
+            self.test_table,
+            filter_conditions=json.dumps({"email": data["email"], "order_by": ["-id"]})
+        )
+        assert result["success"], f"List failed: {result['message']}"
+        assert result["records"][0]["id"] == create_result["record_id"]
+        assert all(record["email"] == data["email"] for record in result["records"])
+
+        prefixed = self.client.list_records(
+            self.test_table,
+            filter_conditions=json.dumps({"email": {"prefix": "structured_"}, "id": {"gte": create_result["record_id"]}})
+        )
+        assert [record["id"] for record in prefixed["records"]] == [create_result["record_id"]]
+
+        bad = self.client.list_records(self.test_table, filter_conditions=json.dumps({"email": {"regex": "x"}}))
+        assert not bad["success"], "Unknown operators should be rejected"
+
     def test_delete_record(self):
         """Test deleting a record"""
         # Create record
@@ -101,3 +211,108 @@ class TestCRUDOperations:
         assert not get_result["success"], "Record should not exist after deletion"
         
         logger.info("Deleted record", record_id=record_id)
+
+    def test_bulk_operations(self):
+        """Test batch create, update and delete"""
+        records = [dict(self.test_data, email=f"bulk{i}@example.com") for i in range(3)]
+        records.append(dict(self.test_data, no_such_column="x"))
+        
+        create_result = self.client.bulk_create_records(self.test_table, records)
+        assert create_result["success"], f"Bulk create failed: {create_result['message']}"
+        assert [error["index"] for error in create_result["errors"]] == [3]
+        record_ids = create_result["record_ids"][:3]
+        assert all(record_id > 0 for record_id in record_ids)
+        
+        update_result = self.client.bulk_update_records(
+            self.test_table, {record_id: {"last_name": "Bulk"} for record_id in record_ids}
+        )
+        assert update_result["success"], f"Bulk update failed: {update_result['message']}"
+        assert update_result["affected_count"] == 3
+        assert self.client.get_record(self.test_table, record_ids[0])["data"]["last_name"] == "Bulk"
+        
+        delete_result = self.client.bulk_delete_records(self.test_table, record_ids)
+        assert delete_result["success"], f"Bulk delete failed: {delete_result['message']}"
+        assert delete_result["affected_count"] == 3
+        
+        logger.info("Bulk operations", record_ids=record_ids)
+
+    def test_upsert_records(self):
+        """Test inserting and updating by key in one call"""
+        create_result = self.client.create_record(self.test_table, self.test_data)
+        assert create_result["success"]
+        record_id = create_result["record_id"]
+
+        result = self.client.upsert_records(
+            self.test_table,
+            [dict(self.test_data, id=record_id, last_name="Upserted"), dict(self.test_data, no_such_column="x")],
+            conflict_columns=["id"]
+        )
+        assert result["success"], f"Upsert failed: {result['message']}"
+        assert result["affected_count"] == 1
+        assert [error["index"] for error in result["errors"]] == [1]
+        assert self.client.get_record(self.test_table, record_id)["data"]["last_name"] == "Upserted"
+
+    def test_append_records(self):
+        """Test streaming rows into an append-only table"""
+        rows = ({"activity": f"append{i}", "user": "test"} for i in range(10))
+        result = self.client.append_records("settings_user_logging", rows, batch_size=4, ack="committed")
+        assert result["success"], f"Append failed: {result['message']}"
+        assert result["received_count"] == 10
+        assert result["committed_count"] == 10
+
+        rejected = self.client.append_records(self.test_table, [self.test_data])
+        assert not rejected["success"], "Tables outside ingest_tables should be rejected"
+
+    def test_count_modes(self):
+        """Test skipping and caching total_count"""
+        skipped = self.client.list_records(self.test_table, page_size=1, count_mode="none")
+        assert skipped["success"], f"List failed: {skipped['message']}"
+        assert skipped["total_count"] == -1
+
+        exact = self.client.list_records(self.test_table, page_size=1)
+        cached = self.client.list_records(self.test_table, page_size=1, count_mode="cached")
+        assert cached["total_count"] == exact["total_count"]
+
+        # Writes drop the cached total for the table
+        self.client.create_record(self.test_table, self.test_data)
+        refreshed = self.client.list_records(self.test_table, page_size=1, count_mode="cached")
+        assert refreshed["total_count"] == exact["total_count"] + 1
+
+        estimated = self.client.list_records(self.test_table, page_size=1, count_mode="estimate")
+        assert estimated["success"] and estimated["total_count"] >= 0
+
+    def test_cache_stats(self):
+        """Test reading the record cache counters"""
+        result = self.client.get_cache_stats()
+        assert result["success"], f"Cache stats failed: {result['message']}"
+        for table in result["tables"]:
+            assert table["hits"] >= 0 and table["misses"] >= 0
+
+    def test_metering_rollups(self):
+        """Test reading per-day IQ metering totals"""
+        result = self.client.get_metering_rollups("iq_metering_data_processed_records", start_day="2024-01-01")
+        assert result["success"], f"Rollups failed: {result['message']}"
+        assert all(rollup["day"] >= "2024-01-01" for rollup in result["rollups"])
+
+        invalid = self.client.get_metering_rollups(start_day="yesterday")
+        assert not invalid["success"], "Malformed days should be rejected"
+
+    def test_index_advice(self):
+        """Test reading index suggestions for slow list filters"""
+        self.client.list_records(self.test_table, filter_conditions=json.dumps({"email": "test@example.com"}))
+        result = self.client.get_index_advice(self.test_table)
+        assert result["success"], f"Index advice failed: {result['message']}"
+        for item in result["advice"]:
+            assert item["table_name"] == self.test_table
+            if item["suggested_index"]:
+                assert item["suggested_index"] in result["migration_stub"]
+
+    def test_traceparent_propagation(self):
+        """Test that calls carrying a W3C traceparent from the gateway still succeed"""
+        _, stub = self.client._pick()
+        traceparent = "00-4bf92f3577b34da6a3ce929d0e0e4736-00f067aa0ba902b7-01"
+        response = stub.ListRecords(
+            database_service_pb2.ListRecordsRequest(table_name=self.test_table, page=1, page_size=1),
+            metadata=[("traceparent", traceparent)]
+        )
+        assert response.success, f"Traced list failed: {response.message}"
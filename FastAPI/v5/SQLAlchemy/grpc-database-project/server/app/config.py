@@ -24,6 +24,7 @@ settings = Settings()
 
 
 # app/config.py — Using Pydantic
+from typing import Optional
 from pydantic_settings import BaseSettings
 from pydantic import Field
 
@@ -40,6 +41,96 @@ class Settings(BaseSettings):
     grpc_port: int = Field(default=50051)
     log_level: str = Field(default="INFO")
     max_workers: int = Field(default=10)
+    # "thread" runs the classic thread-pool server, "asyncio" runs grpc.aio with an async engine
+    server_mode: str = Field(default="thread")
+    # Optional explicit async URL; otherwise derived from database_url (pymysql -> aiomysql)
+    async_database_url: Optional[str] = Field(default=None)
+    # Cap on concurrently handled RPCs in asyncio mode (0 = unlimited)
+    max_concurrent_rpcs: int = Field(default=0)
+
+    # SQLAlchemy connection pool; 0 / -1 size the pool from the server concurrency
+    db_pool_size: int = Field(default=0)
+    db_max_overflow: int = Field(default=-1)
+    db_pool_timeout: float = Field(default=30.0)
+    db_pool_recycle: int = Field(default=300)
+    db_pool_use_lifo: bool = Field(default=False)
+    # "pessimistic" (pre-ping each checkout) or "optimistic" (invalidate on error)
+    db_disconnect_strategy: str = Field(default="pessimistic")
+    grpc_max_message_size: int = Field(default=64 * 1024 * 1024)
+    grpc_min_ping_interval_ms: int = Field(default=10000)
+    # Streams per client connection; clients open more connections for more concurrency
+    grpc_max_concurrent_streams: int = Field(default=100)
+    # Recycle connections so clients re-resolve DNS and pick up new replicas
+    grpc_max_connection_age_ms: int = Field(default=300000)
+    grpc_max_connection_age_grace_ms: int = Field(default=300000)
+    # Upper bound on rows returned by a single ListRecords page
+    max_page_size: int = Field(default=1000)
+    # Default rows per chunk for ListRecordsStream
+    stream_chunk_size: int = Field(default=500)
+    # Rows per multi-row statement in the Batch* RPCs
+    batch_chunk_size: int = Field(default=1000)
+    # Leave Text/LONGTEXT/binary columns out of ListRecords unless named in fields
+    list_defer_large_columns: bool = Field(default=True)
+    # Accept legacy raw SQL strings in the filter field alongside JSON filters.
+    # Off by default: the string is run as-is. Set ALLOW_SQL_FILTERS=true only
+    # for clients that still send raw SQL.
+    allow_sql_filters: bool = Field(default=False)
+    # Seconds a ListRecords total is reused with count_mode=cached
+    count_cache_ttl: float = Field(default=30.0)
+    # Comma-separated tables whose get/list results are cached (empty disables the cache)
+    record_cache_tables: str = Field(default="")
+    record_cache_ttl: float = Field(default=30.0)
+    record_cache_max_entries: int = Field(default=10000)
+    # Optional shared cache and cross-replica invalidation, e.g. redis://redis:6379/0
+    record_cache_redis_url: Optional[str] = Field(default=None)
+    # Comma-separated table.column pairs whose UpdateRecord calls are buffered and
+    # written in batches, e.g. "segy_to_vds_status.progress,segy_to_vds_status.status"
+    coalesce_columns: str = Field(default="")
+    coalesce_window_ms: int = Field(default=500)
+    # Failed flushes a buffered row survives before its values are dropped
+    coalesce_max_requeues: int = Field(default=20)
+    # Status values that are written through immediately instead of buffered
+    coalesce_terminal_statuses: str = Field(default="COMPLETED,SUCCEEDED,SUCCESS,FAILED,ERROR,CANCELLED,ABORTED")
+    # Append-only tables accepted by the AppendRecords ingestion stream
+    ingest_tables: str = Field(
+        default="settings_user_logging,iq_metering_object_records,iq_metering_data_processed_records,osdu_usage_statistics"
+    )
+    # Rows buffered in the server before AppendRecords streams are slowed down
+    ingest_queue_rows: int = Field(default=100000)
+    # Rows per ingest transaction, and how long the writer waits for a batch to fill
+    ingest_batch_rows: int = Field(default=5000)
+    ingest_max_latency_ms: int = Field(default=50)
+    # Seconds a stream may wait for queue space before the RPC gives up
+    ingest_enqueue_timeout: float = Field(default=5.0)
+    # Seconds between iq_metering_daily_rollup refreshes and partition rotations (0 disables the job)
+    metering_rollup_interval: int = Field(default=0)
+    # Days before the newest rollup day that are re-aggregated to pick up late rows
+    metering_rollup_lookback_days: int = Field(default=2)
+    # Future partitions kept on the partitioned metering tables
+    metering_partitions_ahead: int = Field(default=3)
+    # Past partitions kept before they are dropped (0 keeps everything)
+    metering_partition_retention: int = Field(default=0)
+    # ListRecords calls slower than this are explained by the index advisor (0 disables it)
+    index_advisor_slow_ms: float = Field(default=100.0)
+    # Distinct filter shapes tracked per table
+    index_advisor_max_shapes: int = Field(default=64)
+    # Prometheus /metrics HTTP port (0 disables it) and the address it binds to
+    metrics_port: int = Field(default=9100)
+    metrics_addr: str = Field(default="0.0.0.0")
+    tracing_enabled: bool = Field(default=False)
+    # Share of traces started here that are recorded; calls carrying a
+    # traceparent follow the caller's sampling decision instead
+    tracing_sample_ratio: float = Field(default=0.0)
+    # "file" (JSON lines at tracing_file) or "otlp" (gRPC to tracing_otlp_endpoint)
+    tracing_exporter: str = Field(default="file")
+    tracing_file: str = Field(default="/tmp/db-grpc-server-spans.jsonl")
+    tracing_otlp_endpoint: str = Field(default="http://localhost:4317")
+    # Spans buffered before new ones are dropped, and how they are batched for export
+    tracing_max_queue_size: int = Field(default=2048)
+    tracing_export_batch_size: int = Field(default=512)
+    tracing_export_delay_ms: int = Field(default=5000)
+    # Characters of SQL kept on db spans (0 leaves the statement out)
+    tracing_statement_max_length: int = Field(default=1000)
 
     class Config:
         env_file = ".env"
@@ -2,25 +2,85 @@
 # app/database.py
 from sqlalchemy import Column, Integer, BigInteger, String, Text, DateTime, Float, JSON, ForeignKey,text,CheckConstraint
 from sqlalchemy import create_engine, MetaData
+from sqlalchemy.engine import make_url
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker, Session
-from contextlib import contextmanager
+from contextlib import asynccontextmanager, contextmanager
 import structlog
 from .config import settings
+from .metrics import instrument_queries
+from .tracing import trace_queries
+from .pool_stats import (
+    InstrumentedAsyncQueuePool, InstrumentedQueuePool, async_pool_stats, instrument_engine, sync_pool_stats
+)
 
 logger = structlog.get_logger()
 
-# Create SQLAlchemy engine
+def pool_options(concurrency: int) -> dict:
+    """Connection pool arguments sized to the server's request concurrency"""
+    pool_size = settings.db_pool_size or concurrency
+    max_overflow = settings.db_max_overflow if settings.db_max_overflow >= 0 else max(2, pool_size // 4)
+    return {
+        "pool_size": pool_size,
+        "max_overflow": max_overflow,
+        "pool_timeout": settings.db_pool_timeout,
+        "pool_recycle": settings.db_pool_recycle,
+        "pool_use_lifo": settings.db_pool_use_lifo,
+        # "pessimistic" pings on every checkout; "optimistic" skips the round
+        # trip and relies on pool_recycle plus SQLAlchemy invalidating the
+        # whole pool the first time a disconnect error is seen
+        "pool_pre_ping": settings.db_disconnect_strategy == "pessimistic",
+    }
+
+# Create SQLAlchemy engine; each worker thread holds at most one connection
 engine = create_engine(
     settings.database_url,
-    pool_pre_ping=True,
-    pool_recycle=300,
-    echo=False
+    poolclass=InstrumentedQueuePool,
+    echo=False,
+    **pool_options(settings.max_workers)
 )
+instrument_engine(engine, sync_pool_stats)
+instrument_queries(engine)
+trace_queries(engine)
 
 # Create SessionLocal class
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
+# asyncio drivers matching the sync ones we ship with
+ASYNC_DRIVERS = {
+    "mysql": "mysql+aiomysql",
+    "sqlite": "sqlite+aiosqlite",
+    "postgresql": "postgresql+asyncpg",
+}
+
+# Async engine for the grpc.aio server mode, created on first use so the
+# thread-pool server does not need an asyncio driver installed
+_async_engine = None
+_AsyncSessionLocal = None
+
+def get_async_database_url() -> str:
+    """Async database URL from settings, or derived from the sync one"""
+    if settings.async_database_url:
+        return settings.async_database_url
+    url = make_url(settings.database_url)
+    return url.set(drivername=ASYNC_DRIVERS.get(url.get_backend_name(), url.drivername)).render_as_string(hide_password=False)
+
+def get_async_engine():
+    global _async_engine, _AsyncSessionLocal
+    if _async_engine is None:
+        _async_engine = create_async_engine(
+            get_async_database_url(),
+            poolclass=InstrumentedAsyncQueuePool,
+            echo=False,
+            **pool_options(settings.max_concurrent_rpcs or 4 * settings.max_workers)
+        )
+        instrument_engine(_async_engine, async_pool_stats)
+        instrument_queries(_async_engine)
+        trace_queries(_async_engine)
+        _AsyncSessionLocal = async_sessionmaker(_async_engine, autoflush=False, class_=AsyncSession)
+    return _async_engine
+
 # Create Base class
 Base = declarative_base()
 
@@ -53,6 +113,21 @@ def get_db_session() -> Session:
     finally:
         session.close()
 
+@asynccontextmanager
+async def get_async_db_session() -> AsyncSession:
+    """Async context manager for database sessions"""
+    get_async_engine()
+    session = _AsyncSessionLocal()
+    try:
+        yield session
+        await session.commit()
+    except Exception as e:
+        await session.rollback()
+        logger.error("Database session error", error=str(e))
+        raise
+    finally:
+        await session.close()
+
 def get_db():
     """Dependency for getting database session"""
     db = SessionLocal()
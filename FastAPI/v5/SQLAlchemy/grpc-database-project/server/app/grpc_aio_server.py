@@ -0,0 +1,329 @@
+# ================================
+# app/grpc_aio_server.py
+import grpc
+import json
+import structlog
+from concurrent import futures
+
+from app.services.async_db_service import AsyncDatabaseService
+from .grpc_server import (
+    DatabaseServicer, count_mode_name, count_mode_value, database_service_pb2, database_service_pb2_grpc,
+    enable_reflection, records_payload, server_options, to_record
+)
+from .config import settings
+from .metrics import AsyncMetricsInterceptor, start_metrics_server
+from .tracing import AsyncTracingInterceptor, setup_tracing
+from .services.metering import MeteringRollupJob
+
+logger = structlog.get_logger()
+
+class AsyncDatabaseServicer(DatabaseServicer):
+    """Servicer for the grpc.aio server.
+
+    Record RPCs are coroutines backed by AsyncDatabaseService. Migration,
+    schema and health RPCs are inherited as plain methods, which grpc.aio
+    runs on its migration thread pool.
+    """
+
+    def __init__(self):
+        self.db_service = AsyncDatabaseService()
+
+    async def CreateRecord(self, request, context):
+        """Create a new record"""
+        try:
+            data = json.loads(request.data)
+            result = await self.db_service.create_record(request.table_name, data)
+
+            return database_service_pb2.CreateRecordResponse(
+                success=result["success"],
+                message=result["message"],
+                record_id=result.get("record_id", 0)
+            )
+        except Exception as e:
+            logger.error("CreateRecord failed", error=str(e))
+            return database_service_pb2.CreateRecordResponse(
+                success=False,
+                message=f"CreateRecord failed: {str(e)}",
+                record_id=0
+            )
+
+    async def GetRecord(self, request, context):
+        """Get a record by ID"""
+        try:
+            typed = request.format == database_service_pb2.PAYLOAD_TYPED
+            result = await self.db_service.get_record(
+                request.table_name, request.record_id, typed, list(request.fields) or None
+            )
+
+            return database_service_pb2.GetRecordResponse(
+                success=result["success"],
+                message=result["message"],
+                data=result.get("data", ""),
+                record=to_record(result["row"]) if "row" in result else None
+            )
+        except Exception as e:
+            logger.error("GetRecord failed", error=str(e))
+            return database_service_pb2.GetRecordResponse(
+                success=False,
+                message=f"GetRecord failed: {str(e)}",
+                data=""
+            )
+
+    async def UpdateRecord(self, request, context):
+        """Update a record"""
+        try:
+            data = json.loads(request.data)
+            result = await self.db_service.update_record(
+                request.table_name, request.record_id, data, return_record=request.return_record
+            )
+
+            return database_service_pb2.UpdateRecordResponse(
+                success=result["success"],
+                message=result["message"],
+                data=result.get("data", "")
+            )
+        except Exception as e:
+            logger.error("UpdateRecord failed", error=str(e))
+            return database_service_pb2.UpdateRecordResponse(
+                success=False,
+                message=f"UpdateRecord failed: {str(e)}"
+            )
+
+    async def DeleteRecord(self, request, context):
+        """Delete a record"""
+        try:
+            result = await self.db_service.delete_record(request.table_name, request.record_id)
+
+            return database_service_pb2.DeleteRecordResponse(
+                success=result["success"],
+                message=result["message"]
+            )
+        except Exception as e:
+            logger.error("DeleteRecord failed", error=str(e))
+            return database_service_pb2.DeleteRecordResponse(
+                success=False,
+                message=f"DeleteRecord failed: {str(e)}"
+            )
+
+    async def ListRecords(self, request, context):
+        """List records with pagination"""
+        try:
+            result = await self.db_service.list_records(
+                request.table_name,
+                request.page,
+                request.page_size,
+                request.filter if request.filter else None,
+                request.after_id if request.after_id else None,
+                request.format == database_service_pb2.PAYLOAD_TYPED,
+                list(request.fields) or None,
+                count_mode_name(request.count_mode)
+            )
+
+            return database_service_pb2.ListRecordsResponse(
+                success=result["success"],
+                message=result["message"],
+                total_count=result.get("total_count", 0),
+                next_cursor=result.get("next_cursor", 0),
+                has_more=result.get("has_more", False),
+                count_mode=count_mode_value(result.get("count_mode", "exact")),
+                **records_payload(result)
+            )
+        except Exception as e:
+            logger.error("ListRecords failed", error=str(e))
+            return database_service_pb2.ListRecordsResponse(
+                success=False,
+                message=f"ListRecords failed: {str(e)}",
+                records=[],
+                total_count=0
+            )
+
+    async def ListRecordsStream(self, request, context):
+        """Stream records in chunks for large exports"""
+        try:
+            async for chunk in self.db_service.stream_records(
+                request.table_name,
+                request.chunk_size if request.chunk_size else None,
+                request.filter if request.filter else None,
+                request.after_id if request.after_id else None,
+                request.format == database_service_pb2.PAYLOAD_TYPED,
+                list(request.fields) or None
+            ):
+                yield database_service_pb2.RecordChunk(
+                    success=chunk["success"],
+                    message=chunk.get("message", ""),
+                    last_id=chunk.get("last_id", 0),
+                    **records_payload(chunk)
+                )
+        except Exception as e:
+            logger.error("ListRecordsStream failed", error=str(e))
+            yield database_service_pb2.RecordChunk(
+                success=False,
+                message=f"ListRecordsStream failed: {str(e)}"
+            )
+
+    async def BatchCreateRecords(self, request, context):
+        """Create many records in one transaction"""
+        try:
+            rows = [json.loads(record) for record in request.records]
+            result = await self.db_service.batch_create_records(request.table_name, rows)
+
+            return database_service_pb2.BatchCreateRecordsResponse(
+                success=result["success"],
+                message=result["message"],
+                record_ids=result.get("record_ids", []),
+                errors=self._row_errors(result.get("errors", []))
+            )
+        except Exception as e:
+            logger.error("BatchCreateRecords failed", error=str(e))
+            return database_service_pb2.BatchCreateRecordsResponse(
+                success=False,
+                message=f"BatchCreateRecords failed: {str(e)}"
+            )
+
+    async def BatchUpdateRecords(self, request, context):
+        """Update many records in one transaction"""
+        try:
+            updates = [dict(json.loads(update.data), id=update.record_id) for update in request.updates]
+            result = await self.db_service.batch_update_records(request.table_name, updates)
+
+            return database_service_pb2.BatchUpdateRecordsResponse(
+                success=result["success"],
+                message=result["message"],
+                affected_count=result.get("affected_count", 0),
+                errors=self._row_errors(result.get("errors", []))
+            )
+        except Exception as e:
+            logger.error("BatchUpdateRecords failed", error=str(e))
+            return database_service_pb2.BatchUpdateRecordsResponse(
+                success=False,
+                message=f"BatchUpdateRecords failed: {str(e)}"
+            )
+
+    async def BatchDeleteRecords(self, request, context):
+        """Delete many records in one transaction"""
+        try:
+            result = await self.db_service.batch_delete_records(request.table_name, list(request.record_ids))
+
+            return database_service_pb2.BatchDeleteRecordsResponse(
+                success=result["success"],
+                message=result["message"],
+                affected_count=result.get("affected_count", 0),
+                errors=self._row_errors(result.get("errors", []))
+            )
+        except Exception as e:
+            logger.error("BatchDeleteRecords failed", error=str(e))
+            return database_service_pb2.BatchDeleteRecordsResponse(
+                success=False,
+                message=f"BatchDeleteRecords failed: {str(e)}"
+            )
+
+    async def UpsertRecords(self, request, context):
+        """Insert or update many records by a unique key in one transaction"""
+        try:
+            rows = [json.loads(record) for record in request.records]
+            result = await self.db_service.upsert_records(
+                request.table_name, rows, list(request.conflict_columns), list(request.update_columns) or None
+            )
+
+            return database_service_pb2.UpsertRecordsResponse(
+                success=result["success"],
+                message=result["message"],
+                affected_count=result.get("affected_count", 0),
+                errors=self._row_errors(result.get("errors", []))
+            )
+        except Exception as e:
+            logger.error("UpsertRecords failed", error=str(e))
+            return database_service_pb2.UpsertRecordsResponse(
+                success=False,
+                message=f"UpsertRecords failed: {str(e)}"
+            )
+
+    async def AppendRecords(self, request_iterator, context):
+        """Queue rows from a client stream for the background ingest writer"""
+        try:
+            requests = request_iterator.__aiter__()
+            first = await anext(requests, None)
+            if first is None:
+                return database_service_pb2.AppendRecordsResponse(success=True, message="No records received")
+
+            async def batches():
+                yield first.table_name, [json.loads(record) for record in first.records]
+                async for request in requests:
+                    yield request.table_name, [json.loads(record) for record in request.records]
+
+            result = await self.db_service.append_records(batches(), first.ack == database_service_pb2.ACK_COMMITTED)
+            return self._append_response(result)
+        except Exception as e:
+            logger.error("AppendRecords failed", error=str(e))
+            return database_service_pb2.AppendRecordsResponse(
+                success=False,
+                message=f"AppendRecords failed: {str(e)}"
+            )
+
+    async def GetIndexAdvice(self, request, context):
+        """Slow ListRecords filter shapes and the indexes they are missing"""
+        try:
+            result = await self.db_service.get_index_advice(request.table_name or None)
+            return self._index_advice_response(result)
+        except Exception as e:
+            logger.error("GetIndexAdvice failed", error=str(e))
+            return database_service_pb2.IndexAdviceResponse(
+                success=False,
+                message=f"GetIndexAdvice failed: {str(e)}"
+            )
+
+    async def GetMeteringRollups(self, request, context):
+        """Per-day IQ metering totals"""
+        try:
+            result = await self.db_service.get_metering_rollups(
+                request.source_table or None, request.start_day or None,
+                request.end_day or None, request.partition_id or None
+            )
+            return database_service_pb2.MeteringRollupsResponse(
+                success=result["success"],
+                message=result["message"],
+                rollups=[
+                    database_service_pb2.MeteringRollup(
+                        **{key: value for key, value in row.items() if key != "id"}
+                    )
+                    for row in result.get("rows", [])
+                ]
+            )
+        except Exception as e:
+            logger.error("GetMeteringRollups failed", error=str(e))
+            return database_service_pb2.MeteringRollupsResponse(
+                success=False,
+                message=f"GetMeteringRollups failed: {str(e)}"
+            )
+
+
+async def serve_async():
+    """Run the grpc.aio server; blocking RPCs use the migration thread pool"""
+    interceptors = [AsyncTracingInterceptor()] if setup_tracing("db-grpc-server") else []
+    executor = futures.ThreadPoolExecutor(max_workers=settings.max_workers)
+    server = grpc.aio.server(
+        migration_thread_pool=executor,
+        options=server_options(),
+        interceptors=interceptors + [AsyncMetricsInterceptor()],
+        maximum_concurrent_rpcs=settings.max_concurrent_rpcs or None
+    )
+
+    servicer = AsyncDatabaseServicer()
+    database_service_pb2_grpc.add_DatabaseServiceServicer_to_server(
+        servicer, server
+    )
+    enable_reflection(server)
+
+    listen_addr = f'[::]:{settings.grpc_port}'
+    server.add_insecure_port(listen_addr)
+
+    logger.info("Starting asyncio gRPC server", address=listen_addr)
+    await server.start()
+    start_metrics_server(executor, servicer.db_service.record_cache)
+    MeteringRollupJob.from_settings().start()
+
+    try:
+        await server.wait_for_termination()
+    finally:
+        logger.info("Shutting down gRPC server")
+        await server.stop(0)
@@ -1,9 +1,12 @@
 # ================================
 # app/grpc_server.py
 import grpc
+import itertools
 import json
 import structlog
 from concurrent import futures
+from datetime import datetime, timedelta, timezone
+from decimal import Decimal
 import sys
 import os
 sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'proto'))
@@ -19,9 +22,79 @@ import database_service_pb2
 
 
 from .config import settings
+from .metrics import MetricsInterceptor, start_metrics_server
+from .tracing import TracingInterceptor, setup_tracing
+from .pool_stats import all_pool_stats
+from .services.metering import MeteringRollupJob
+from .services.serializers import dumps
 
 logger = structlog.get_logger()
 
+_EPOCH = datetime(1970, 1, 1)
+_MICROSECOND = timedelta(microseconds=1)
+
+
+def _timestamp_value(value: datetime):
+    if value.tzinfo is not None:
+        value = value.astimezone(timezone.utc).replace(tzinfo=None)
+    return database_service_pb2.Value(timestamp_value=(value - _EPOCH) // _MICROSECOND)
+
+
+# Exact-type dispatch; anything not listed (dates, times) falls back to str()
+_VALUE_BUILDERS = {
+    int: lambda value: database_service_pb2.Value(int_value=value),
+    bool: lambda value: database_service_pb2.Value(bool_value=value),
+    float: lambda value: database_service_pb2.Value(double_value=value),
+    Decimal: lambda value: database_service_pb2.Value(double_value=float(value)),
+    str: lambda value: database_service_pb2.Value(string_value=value),
+    bytes: lambda value: database_service_pb2.Value(bytes_value=value),
+    datetime: _timestamp_value,
+    dict: lambda value: database_service_pb2.Value(json_value=dumps(value)),
+    list: lambda value: database_service_pb2.Value(json_value=dumps(value)),
+}
+
+
+def to_value(value):
+    """Encode one column value as a typed Value message (None stays unset)"""
+    if value is None:
+        return database_service_pb2.Value()
+    builder = _VALUE_BUILDERS.get(type(value))
+    if builder is None:
+        return database_service_pb2.Value(string_value=str(value))
+    return builder(value)
+
+
+def to_record(row):
+    return database_service_pb2.Record(fields={name: to_value(value) for name, value in row.items()})
+
+
+def to_record_batch(columns, rows):
+    """Pivot result rows into a column-major RecordBatch"""
+    values_by_column = zip(*rows) if rows else [()] * len(columns)
+    return database_service_pb2.RecordBatch(
+        columns=[
+            database_service_pb2.Column(name=name, values=[to_value(value) for value in values])
+            for name, values in zip(columns, values_by_column)
+        ],
+        row_count=len(rows)
+    )
+
+
+def count_mode_name(count_mode: int) -> str:
+    """CountMode enum value -> DatabaseService count mode ("exact", "none", ...)"""
+    return database_service_pb2.CountMode.Name(count_mode)[len("COUNT_"):].lower()
+
+
+def count_mode_value(count_mode: str) -> int:
+    return database_service_pb2.CountMode.Value(f"COUNT_{count_mode.upper()}")
+
+
+def records_payload(result):
+    """Response fields for a list result: a typed batch or the JSON strings"""
+    if "rows" in result:
+        return {"batch": to_record_batch(result["columns"], result["rows"])}
+    return {"records": result.get("records", [])}
+
 class DatabaseServicer(database_service_pb2_grpc.DatabaseServiceServicer):
     def __init__(self):
         self.db_service = DatabaseService()
@@ -49,12 +122,16 @@ class DatabaseServicer(database_service_pb2_grpc.DatabaseServiceServicer):
     def GetRecord(self, request, context):
         """Get a record by ID"""
         try:
-            result = self.db_service.get_record(request.table_name, request.record_id)
+            typed = request.format == database_service_pb2.PAYLOAD_TYPED
+            result = self.db_service.get_record(
+                request.table_name, request.record_id, typed, list(request.fields) or None
+            )
             
             return database_service_pb2.GetRecordResponse(
                 success=result["success"],
                 message=result["message"],
-                data=result.get("data", "")
+                data=result.get("data", ""),
+                record=to_record(result["row"]) if "row" in result else None
             )
         except Exception as e:
             logger.error("GetRecord failed", error=str(e))
@@ -69,11 +146,14 @@ class DatabaseServicer(database_service_pb2_grpc.DatabaseServiceServicer):
         """Update a record"""
         try:
             data = json.loads(request.data)
-            result = self.db_service.update_record(request.table_name, request.record_id, data)
+            result = self.db_service.update_record(
+                request.table_name, request.record_id, data, return_record=request.return_record
+            )
             
             return database_service_pb2.UpdateRecordResponse(
                 success=result["success"],
-                message=result["message"]
+                message=result["message"],
+                data=result.get("data", "")
             )
         except Exception as e:
             logger.error("UpdateRecord failed", error=str(e))
@@ -107,14 +187,21 @@ class DatabaseServicer(database_service_pb2_grpc.DatabaseServiceServicer):
                 request.table_name, 
                 request.page, 
                 request.page_size,
-                request.filter if request.filter else None
+                request.filter if request.filter else None,
+                request.after_id if request.after_id else None,
+                request.format == database_service_pb2.PAYLOAD_TYPED,
+                list(request.fields) or None,
+                count_mode_name(request.count_mode)
             )
             
             return database_service_pb2.ListRecordsResponse(
                 success=result["success"],
                 message=result["message"],
-                records=result.get("records", []),
-                total_count=result.get("total_count", 0)
+                total_count=result.get("total_count", 0),
+                next_cursor=result.get("next_cursor", 0),
+                has_more=result.get("has_more", False),
+                count_mode=count_mode_value(result.get("count_mode", "exact")),
+                **records_payload(result)
             )
         except Exception as e:
             logger.error("ListRecords failed", error=str(e))
@@ -126,6 +213,146 @@ class DatabaseServicer(database_service_pb2_grpc.DatabaseServiceServicer):
             )
 
 
+    def ListRecordsStream(self, request, context):
+        """Stream records in chunks for large exports"""
+        try:
+            for chunk in self.db_service.stream_records(
+                request.table_name,
+                request.chunk_size if request.chunk_size else None,
+                request.filter if request.filter else None,
+                request.after_id if request.after_id else None,
+                request.format == database_service_pb2.PAYLOAD_TYPED,
+                list(request.fields) or None
+            ):
+                yield database_service_pb2.RecordChunk(
+                    success=chunk["success"],
+                    message=chunk.get("message", ""),
+                    last_id=chunk.get("last_id", 0),
+                    **records_payload(chunk)
+                )
+        except Exception as e:
+            logger.error("ListRecordsStream failed", error=str(e))
+            yield database_service_pb2.RecordChunk(
+                success=False,
+                message=f"ListRecordsStream failed: {str(e)}"
+            )
+
+
+    def _row_errors(self, errors):
+        return [database_service_pb2.RowError(index=error["index"], message=error["message"]) for error in errors]
+
+    def _append_response(self, result):
+        return database_service_pb2.AppendRecordsResponse(
+            success=result["success"],
+            message=result["message"],
+            received_count=result.get("received_count", 0),
+            accepted_count=result.get("accepted_count", 0),
+            committed_count=result.get("committed_count", 0),
+            errors=self._row_errors(result.get("errors", []))
+        )
+
+    def BatchCreateRecords(self, request, context):
+        """Create many records in one transaction"""
+        try:
+            rows = [json.loads(record) for record in request.records]
+            result = self.db_service.batch_create_records(request.table_name, rows)
+            
+            return database_service_pb2.BatchCreateRecordsResponse(
+                success=result["success"],
+                message=result["message"],
+                record_ids=result.get("record_ids", []),
+                errors=self._row_errors(result.get("errors", []))
+            )
+        except Exception as e:
+            logger.error("BatchCreateRecords failed", error=str(e))
+            return database_service_pb2.BatchCreateRecordsResponse(
+                success=False,
+                message=f"BatchCreateRecords failed: {str(e)}"
+            )
+
+
+    def BatchUpdateRecords(self, request, context):
+        """Update many records in one transaction"""
+        try:
+            updates = [dict(json.loads(update.data), id=update.record_id) for update in request.updates]
+            result = self.db_service.batch_update_records(request.table_name, updates)
+            
+            return database_service_pb2.BatchUpdateRecordsResponse(
+                success=result["success"],
+                message=result["message"],
+                affected_count=result.get("affected_count", 0),
+                errors=self._row_errors(result.get("errors", []))
+            )
+        except Exception as e:
+            logger.error("BatchUpdateRecords failed", error=str(e))
+            return database_service_pb2.BatchUpdateRecordsResponse(
+                success=False,
+                message=f"BatchUpdateRecords failed: {str(e)}"
+            )
+
+
+    def BatchDeleteRecords(self, request, context):
+        """Delete many records in one transaction"""
+        try:
+            result = self.db_service.batch_delete_records(request.table_name, list(request.record_ids))
+            
+            return database_service_pb2.BatchDeleteRecordsResponse(
+                success=result["success"],
+                message=result["message"],
+                affected_count=result.get("affected_count", 0),
+                errors=self._row_errors(result.get("errors", []))
+            )
+        except Exception as e:
+            logger.error("BatchDeleteRecords failed", error=str(e))
+            return database_service_pb2.BatchDeleteRecordsResponse(
+                success=False,
+                message=f"BatchDeleteRecords failed: {str(e)}"
+            )
+
+
+    def UpsertRecords(self, request, context):
+        """Insert or update many records by a unique key in one transaction"""
+        try:
+            rows = [json.loads(record) for record in request.records]
+            result = self.db_service.upsert_records(
+                request.table_name, rows, list(request.conflict_columns), list(request.update_columns) or None
+            )
+            
+            return database_service_pb2.UpsertRecordsResponse(
+                success=result["success"],
+                message=result["message"],
+                affected_count=result.get("affected_count", 0),
+                errors=self._row_errors(result.get("errors", []))
+            )
+        except Exception as e:
+            logger.error("UpsertRecords failed", error=str(e))
+            return database_service_pb2.UpsertRecordsResponse(
+                success=False,
+                message=f"UpsertRecords failed: {str(e)}"
+            )
+
+
+    def AppendRecords(self, request_iterator, context):
+        """Queue rows from a client stream for the background ingest writer"""
+        try:
+            first = next(request_iterator, None)
+            if first is None:
+                return database_service_pb2.AppendRecordsResponse(success=True, message="No records received")
+
+            batches = (
+                (request.table_name, [json.loads(record) for record in request.records])
+                for request in itertools.chain([first], request_iterator)
+            )
+            result = self.db_service.append_records(batches, first.ack == database_service_pb2.ACK_COMMITTED)
+            return self._append_response(result)
+        except Exception as e:
+            logger.error("AppendRecords failed", error=str(e))
+            return database_service_pb2.AppendRecordsResponse(
+                success=False,
+                message=f"AppendRecords failed: {str(e)}"
+            )
+
+
     def RunMigration(self, request, context):
         """Run database migration"""
         try:
@@ -244,6 +471,87 @@ class DatabaseServicer(database_service_pb2_grpc.DatabaseServiceServicer):
                 version="1.0.0"
             )
 
+    def GetPoolStats(self, request, context):
+        """Connection pool statistics"""
+        try:
+            pools = [
+                database_service_pb2.PoolStats(
+                    **{key: value for key, value in stats.items() if key != "wait_time_ms"},
+                    wait_time_ms=[database_service_pb2.HistogramBucket(**bucket) for bucket in stats["wait_time_ms"]]
+                )
+                for stats in all_pool_stats()
+            ]
+            return database_service_pb2.PoolStatsResponse(
+                success=True,
+                message="Pool statistics retrieved successfully",
+                pools=pools
+            )
+        except Exception as e:
+            logger.error("GetPoolStats failed", error=str(e))
+            return database_service_pb2.PoolStatsResponse(
+                success=False,
+                message=f"GetPoolStats failed: {str(e)}"
+            )
+
+    def GetCacheStats(self, request, context):
+        """Record cache hit/miss counters per cached table"""
+        try:
+            return database_service_pb2.CacheStatsResponse(
+                success=True,
+                message="Cache statistics retrieved successfully",
+                tables=[database_service_pb2.TableCacheStats(**stats) for stats in self.db_service.record_cache.stats()]
+            )
+        except Exception as e:
+            logger.error("GetCacheStats failed", error=str(e))
+            return database_service_pb2.CacheStatsResponse(
+                success=False,
+                message=f"GetCacheStats failed: {str(e)}"
+            )
+
+    def GetIndexAdvice(self, request, context):
+        """Slow ListRecords filter shapes and the indexes they are missing"""
+        try:
+            result = self.db_service.get_index_advice(request.table_name or None)
+            return self._index_advice_response(result)
+        except Exception as e:
+            logger.error("GetIndexAdvice failed", error=str(e))
+            return database_service_pb2.IndexAdviceResponse(
+                success=False,
+                message=f"GetIndexAdvice failed: {str(e)}"
+            )
+
+    def _index_advice_response(self, result):
+        return database_service_pb2.IndexAdviceResponse(
+            success=result["success"],
+            message=result["message"],
+            advice=[database_service_pb2.IndexAdvice(**item) for item in result.get("advice", [])],
+            migration_stub=result.get("migration_stub", "")
+        )
+
+    def GetMeteringRollups(self, request, context):
+        """Per-day IQ metering totals"""
+        try:
+            result = self.db_service.get_metering_rollups(
+                request.source_table or None, request.start_day or None,
+                request.end_day or None, request.partition_id or None
+            )
+            return database_service_pb2.MeteringRollupsResponse(
+                success=result["success"],
+                message=result["message"],
+                rollups=[
+                    database_service_pb2.MeteringRollup(
+                        **{key: value for key, value in row.items() if key != "id"}
+                    )
+                    for row in result.get("rows", [])
+                ]
+            )
+        except Exception as e:
+            logger.error("GetMeteringRollups failed", error=str(e))
+            return database_service_pb2.MeteringRollupsResponse(
+                success=False,
+                message=f"GetMeteringRollups failed: {str(e)}"
+            )
+
 from app.services.db_service import DatabaseService
 from proto import database_service_pb2_grpc
 from grpc_reflection.v1alpha import reflection
@@ -251,33 +559,62 @@ import database_service_pb2
 
 from grpc_reflection.v1alpha import reflection
 
+def server_options():
+    """gRPC server channel options shared by the thread-pool and asyncio servers"""
+    return [
+        ("grpc.max_send_message_length", settings.grpc_max_message_size),
+        ("grpc.max_receive_message_length", settings.grpc_max_message_size),
+        # Accept the keepalive pings that long-lived client channels send
+        ("grpc.keepalive_permit_without_calls", 1),
+        ("grpc.http2.min_recv_ping_interval_without_data_ms", settings.grpc_min_ping_interval_ms),
+        ("grpc.max_concurrent_streams", settings.grpc_max_concurrent_streams),
+        ("grpc.max_connection_age_ms", settings.grpc_max_connection_age_ms),
+        ("grpc.max_connection_age_grace_ms", settings.grpc_max_connection_age_grace_ms),
+    ]
+
+def enable_reflection(server):
+    SERVICE_NAMES = (
+        database_service_pb2.DESCRIPTOR.services_by_name['DatabaseService'].full_name,
+        reflection.SERVICE_NAME,
+    )
+    reflection.enable_server_reflection(SERVICE_NAMES, server)
+
 def serve():
     print("🔥 Inside serve()")
-    server = grpc.server(futures.ThreadPoolExecutor(max_workers=settings.max_workers))
+    if settings.server_mode == "asyncio":
+        import asyncio
+        from .grpc_aio_server import serve_async
+        asyncio.run(serve_async())
+        return
+
+    # Tracing goes first so SQL spans and metrics run inside the RPC span
+    interceptors = [TracingInterceptor()] if setup_tracing("db-grpc-server") else []
+    executor = futures.ThreadPoolExecutor(max_workers=settings.max_workers)
+    server = grpc.server(
+        executor,
+        options=server_options(),
+        interceptors=interceptors + [MetricsInterceptor()]
+    )
 
     # Register your service implementation
+    servicer = DatabaseServicer()
     database_service_pb2_grpc.add_DatabaseServiceServicer_to_server(
-        DatabaseServicer(), server
+        servicer, server
     )
 
     # Enable reflection
-    SERVICE_NAMES = (
-        database_service_pb2.DESCRIPTOR.services_by_name['DatabaseService'].full_name,
-        reflection.SERVICE_NAME,
-    )
-    reflection.enable_server_reflection(SERVICE_NAMES, server)
+    enable_reflection(server)
 
     listen_addr = f'[::]:{settings.grpc_port}'
     server.add_insecure_port(listen_addr)
 
     logger.info("Starting gRPC server", address=listen_addr)
     server.start()
+    start_metrics_server(executor, servicer.db_service.record_cache)
+    MeteringRollupJob.from_settings().start()
 
     try:
         server.wait_for_termination()
     except KeyboardInterrupt:
         logger.info("Shutting down gRPC server")
         server.stop(0)
-
-
- 
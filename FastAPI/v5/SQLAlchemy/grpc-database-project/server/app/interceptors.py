@@ -0,0 +1,171 @@
+# ================================
+# app/interceptors.py
+import inspect
+from typing import Optional, Type
+
+import grpc
+
+
+class CallObserver:
+    """Watches one RPC from the first request to the last response.
+
+    An observer is created in the thread or task that runs the handler,
+    right before it starts, so it can set context variables the handler
+    will see. Subclasses override whichever hooks they need.
+    """
+
+    def __init__(self, method: str, context):
+        self.method = method
+
+    def request(self, request):
+        """Called for the request, or for each message of a request stream as it is read"""
+
+    def response(self, response):
+        """Called for the response, or for each message of a response stream"""
+
+    def finish(self, context, error: Optional[BaseException] = None):
+        """Called once the handler has returned, raised or finished streaming"""
+
+
+def method_name(handler_call_details) -> str:
+    return handler_call_details.method.rsplit("/", 1)[-1]
+
+
+def status_code(context, error: Optional[BaseException]) -> grpc.StatusCode:
+    code = context.code() if hasattr(context, "code") else None
+    if code is None:
+        return grpc.StatusCode.UNKNOWN if error is not None else grpc.StatusCode.OK
+    return code
+
+
+def _observe_stream(observer: CallObserver, requests):
+    for request in requests:
+        observer.request(request)
+        yield request
+
+
+async def _observe_stream_async(observer: CallObserver, requests):
+    async for request in requests:
+        observer.request(request)
+        yield request
+
+
+def _observe_requests(observer: CallObserver, handler, request):
+    if not handler.request_streaming:
+        observer.request(request)
+        return request
+    if hasattr(request, "__aiter__"):
+        return _observe_stream_async(observer, request)
+    return _observe_stream(observer, request)
+
+
+def _wrap_unary(observer_class, method, handler, behavior):
+    def wrapped(request, context):
+        observer = observer_class(method, context)
+        error = None
+        try:
+            response = behavior(_observe_requests(observer, handler, request), context)
+            observer.response(response)
+            return response
+        except BaseException as e:
+            error = e
+            raise
+        finally:
+            observer.finish(context, error)
+    return wrapped
+
+
+def _wrap_streaming(observer_class, method, handler, behavior):
+    def wrapped(request, context):
+        observer = observer_class(method, context)
+        error = None
+        try:
+            for response in behavior(_observe_requests(observer, handler, request), context):
+                observer.response(response)
+                yield response
+        except BaseException as e:
+            error = e
+            raise
+        finally:
+            observer.finish(context, error)
+    return wrapped
+
+
+def _wrap_unary_async(observer_class, method, handler, behavior):
+    async def wrapped(request, context):
+        observer = observer_class(method, context)
+        error = None
+        try:
+            response = await behavior(_observe_requests(observer, handler, request), context)
+            observer.response(response)
+            return response
+        except BaseException as e:
+            error = e
+            raise
+        finally:
+            observer.finish(context, error)
+    return wrapped
+
+
+def _wrap_streaming_async(observer_class, method, handler, behavior):
+    async def wrapped(request, context):
+        observer = observer_class(method, context)
+        error = None
+        try:
+            async for response in behavior(_observe_requests(observer, handler, request), context):
+                observer.response(response)
+                yield response
+        except BaseException as e:
+            error = e
+            raise
+        finally:
+            observer.finish(context, error)
+    return wrapped
+
+
+_HANDLER_KINDS = (
+    ("unary_unary", grpc.unary_unary_rpc_method_handler, _wrap_unary, _wrap_unary_async),
+    ("unary_stream", grpc.unary_stream_rpc_method_handler, _wrap_streaming, _wrap_streaming_async),
+    ("stream_unary", grpc.stream_unary_rpc_method_handler, _wrap_unary, _wrap_unary_async),
+    ("stream_stream", grpc.stream_stream_rpc_method_handler, _wrap_streaming, _wrap_streaming_async),
+)
+
+
+def observe_handler(handler, handler_call_details, observer_class: Type[CallObserver]):
+    """Copy a method handler with its behaviour wrapped in ``observer_class``.
+
+    Coroutine handlers get async wrappers; plain ones stay plain so the
+    grpc.aio server still runs them on its migration thread pool.
+    """
+    if handler is None:
+        return None
+    method = method_name(handler_call_details)
+    for kind, factory, wrap, wrap_async in _HANDLER_KINDS:
+        behavior = getattr(handler, kind)
+        if behavior is None:
+            continue
+        is_async = inspect.iscoroutinefunction(behavior) or inspect.isasyncgenfunction(behavior)
+        return factory(
+            (wrap_async if is_async else wrap)(observer_class, method, handler, behavior),
+            request_deserializer=handler.request_deserializer,
+            response_serializer=handler.response_serializer
+        )
+    return handler
+
+
+class ObserverInterceptor(grpc.ServerInterceptor):
+    """Runs ``observer_class`` around every RPC of the thread-pool server"""
+
+    observer_class: Type[CallObserver] = CallObserver
+
+    def intercept_service(self, continuation, handler_call_details):
+        return observe_handler(continuation(handler_call_details), handler_call_details, self.observer_class)
+
+
+class AsyncObserverInterceptor(grpc.aio.ServerInterceptor):
+    """Runs ``observer_class`` around every RPC of the grpc.aio server"""
+
+    observer_class: Type[CallObserver] = CallObserver
+
+    async def intercept_service(self, continuation, handler_call_details):
+        return observe_handler(await continuation(handler_call_details), handler_call_details, self.observer_class)
@@ -0,0 +1,245 @@
+# ================================
+# app/metrics.py
+"""Prometheus metrics for the gRPC server.
+
+``MetricsInterceptor`` / ``AsyncMetricsInterceptor`` time every RPC and
+split its time into database time (summed from the cursor-execute hooks
+installed by ``instrument_queries``) and everything else, which is mostly
+serialization. Pool and record cache counters already kept in
+``pool_stats`` and ``RecordCache`` are exported as they are, and
+``start_metrics_server`` serves the lot on ``metrics_port``.
+"""
+import time
+from contextvars import ContextVar
+from typing import List, Optional
+
+import structlog
+from prometheus_client import REGISTRY, Counter, Gauge, Histogram, start_http_server
+from prometheus_client.core import CounterMetricFamily, GaugeMetricFamily, HistogramMetricFamily
+from sqlalchemy import event
+
+from .config import settings
+from .interceptors import AsyncObserverInterceptor, CallObserver, ObserverInterceptor, status_code
+from .pool_stats import all_pool_stats
+
+logger = structlog.get_logger()
+
+LATENCY_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30)
+ROW_BUCKETS = (0, 1, 10, 50, 100, 500, 1000, 5000, 10000, 50000)
+BYTE_BUCKETS = (100, 1000, 10000, 100000, 1000000, 10000000, 64000000)
+
+RPC_LATENCY = Histogram(
+    "grpc_server_handling_seconds", "Time to handle an RPC, including streaming all responses",
+    ["method"], buckets=LATENCY_BUCKETS
+)
+RPC_DB_TIME = Histogram(
+    "grpc_server_db_seconds", "Time an RPC spent executing SQL", ["method"], buckets=LATENCY_BUCKETS
+)
+RPC_OTHER_TIME = Histogram(
+    "grpc_server_non_db_seconds", "Time an RPC spent outside SQL, mostly serialization",
+    ["method"], buckets=LATENCY_BUCKETS
+)
+RPC_HANDLED = Counter("grpc_server_handled_total", "RPCs completed, by status code", ["method", "code"])
+RPC_FAILED = Counter(
+    "grpc_server_failed_responses_total", "Responses returned with success=false", ["method"]
+)
+RPC_IN_FLIGHT = Gauge("grpc_server_in_flight", "RPCs currently being handled", ["method"])
+RPC_REQUEST_BYTES = Histogram(
+    "grpc_server_request_bytes", "Serialized request size per RPC", ["method"], buckets=BYTE_BUCKETS
+)
+RPC_RESPONSE_BYTES = Histogram(
+    "grpc_server_response_bytes", "Serialized response size per RPC", ["method"], buckets=BYTE_BUCKETS
+)
+RPC_ROWS = Histogram(
+    "grpc_server_response_rows", "Records returned per read RPC", ["method"], buckets=ROW_BUCKETS
+)
+QUERY_LATENCY = Histogram(
+    "db_query_seconds", "SQL statement execution time", ["table", "operation"], buckets=LATENCY_BUCKETS
+)
+
+# Seconds of SQL run by the current RPC, added to by the cursor-execute hooks
+_rpc_db_time: ContextVar[Optional[List[float]]] = ContextVar("rpc_db_time", default=None)
+
+
+# ================================
+# SQLAlchemy hooks
+# ================================
+
+def statement_table(context) -> str:
+    statement = getattr(getattr(context, "compiled", None), "statement", None)
+    table = getattr(statement, "table", None)
+    if table is None and hasattr(statement, "get_final_froms"):
+        froms = statement.get_final_froms()
+        table = froms[0] if froms else None
+    return getattr(table, "name", None) or "other"
+
+
+def statement_operation(context, statement: str) -> str:
+    if context is not None and context.isinsert:
+        return "insert"
+    if context is not None and context.isupdate:
+        return "update"
+    if context is not None and context.isdelete:
+        return "delete"
+    keyword = statement.lstrip().split(None, 1)[0].lower() if statement.strip() else ""
+    return keyword if keyword in ("select", "insert", "update", "delete") else "other"
+
+
+def instrument_queries(engine):
+    """Time every statement the engine runs, per table and operation"""
+    sync_engine = getattr(engine, "sync_engine", engine)
+
+    @event.listens_for(sync_engine, "before_cursor_execute")
+    def _before_execute(conn, cursor, statement, parameters, context, executemany):
+        if context is not None:
+            context._metrics_start = time.perf_counter()
+
+    @event.listens_for(sync_engine, "after_cursor_execute")
+    def _after_execute(conn, cursor, statement, parameters, context, executemany):
+        start = getattr(context, "_metrics_start", None)
+        if start is None:
+            return
+        elapsed = time.perf_counter() - start
+        QUERY_LATENCY.labels(statement_table(context), statement_operation(context, statement)).observe(elapsed)
+        db_time = _rpc_db_time.get()
+        if db_time is not None:
+            db_time[0] += elapsed
+
+
+# ================================
+# Collectors for existing counters
+# ================================
+
+class ServerStatsCollector:
+    """Exports pool_stats, the record cache counters and the worker pool queue"""
+
+    def __init__(self):
+        self.record_cache = None
+        self.executor = None
+
+    def collect(self):
+        pools = all_pool_stats()
+        checked_out = GaugeMetricFamily("db_pool_checked_out", "Connections in use", labels=["pool"])
+        size = GaugeMetricFamily("db_pool_size", "Configured pool size", labels=["pool"])
+        overflow = GaugeMetricFamily("db_pool_overflow", "Connections open beyond pool_size", labels=["pool"])
+        timeouts = CounterMetricFamily("db_pool_timeouts", "Checkouts that hit pool_timeout", labels=["pool"])
+        connects = CounterMetricFamily("db_pool_connects", "New DBAPI connections opened", labels=["pool"])
+        wait = HistogramMetricFamily("db_pool_wait_seconds", "Time waiting for a pooled connection", labels=["pool"])
+        for stats in pools:
+            labels = [stats["name"]]
+            checked_out.add_metric(labels, stats["checked_out"])
+            size.add_metric(labels, stats["size"])
+            overflow.add_metric(labels, stats["overflow"])
+            timeouts.add_metric(labels, stats["timeouts"])
+            connects.add_metric(labels, stats["connects"])
+            buckets = [
+                ("+Inf" if bucket["le"] == float("inf") else str(bucket["le"] / 1000), bucket["count"])
+                for bucket in stats["wait_time_ms"]
+            ]
+            wait.add_metric(labels, buckets, stats["wait_time_sum_ms"] / 1000)
+        yield from (checked_out, size, overflow, timeouts, connects, wait)
+
+        if self.record_cache is not None:
+            cache_stats = self.record_cache.stats()
+            lookups = CounterMetricFamily(
+                "record_cache_lookups", "Record cache lookups by result", labels=["table", "result"]
+            )
+            invalidations = CounterMetricFamily(
+                "record_cache_invalidations", "Record cache invalidations", labels=["table"]
+            )
+            entries = GaugeMetricFamily("record_cache_entries", "Live in-process entries", labels=["table"])
+            for stats in cache_stats:
+                table = stats["table_name"]
+                lookups.add_metric([table, "hit"], stats["hits"])
+                lookups.add_metric([table, "redis_hit"], stats["redis_hits"])
+                lookups.add_metric([table, "miss"], stats["misses"])
+                invalidations.add_metric([table], stats["invalidations"])
+                entries.add_metric([table], stats["entries"])
+            yield from (lookups, invalidations, entries)
+
+        if self.executor is not None:
+            # RPCs accepted by gRPC but still waiting for a free worker thread
+            yield GaugeMetricFamily(
+                "grpc_server_thread_pool_queue_depth", "Calls queued for a worker thread",
+                value=self.executor._work_queue.qsize()
+            )
+            yield GaugeMetricFamily(
+                "grpc_server_thread_pool_threads", "Worker threads started", value=len(self.executor._threads)
+            )
+            yield GaugeMetricFamily(
+                "grpc_server_thread_pool_max_workers", "Worker thread limit", value=self.executor._max_workers
+            )
+
+
+server_stats = ServerStatsCollector()
+REGISTRY.register(server_stats)
+
+
+def start_metrics_server(executor=None, record_cache=None):
+    """Serve /metrics on ``metrics_port``; 0 leaves metrics unexposed"""
+    server_stats.executor = executor
+    server_stats.record_cache = record_cache
+    if settings.metrics_port <= 0:
+        return
+    start_http_server(settings.metrics_port, addr=settings.metrics_addr)
+    logger.info("Metrics server started", port=settings.metrics_port)
+
+
+# ================================
+# Interceptors
+# ================================
+
+class RpcMetrics(CallObserver):
+    """Bookkeeping for one RPC from the first request to the last response"""
+
+    def __init__(self, method: str, context):
+        super().__init__(method, context)
+        self.rows: List[int] = []
+        self.db_time = [0.0]
+        self.start = time.perf_counter()
+        self._token = _rpc_db_time.set(self.db_time)
+        RPC_IN_FLIGHT.labels(method).inc()
+
+    def request(self, request):
+        RPC_REQUEST_BYTES.labels(self.method).observe(request.ByteSize())
+
+    def response(self, response):
+        if response is None:
+            return
+        RPC_RESPONSE_BYTES.labels(self.method).observe(response.ByteSize())
+        fields = response.DESCRIPTOR.fields_by_name
+        if "success" in fields and not response.success:
+            RPC_FAILED.labels(self.method).inc()
+        if "batch" in fields and response.HasField("batch"):
+            self.rows.append(response.batch.row_count)
+        elif "records" in fields:
+            self.rows.append(len(response.records))
+        elif "record" in fields:
+            self.rows.append(1 if response.HasField("record") or response.data else 0)
+
+    def finish(self, context, error: Optional[BaseException] = None):
+        elapsed = time.perf_counter() - self.start
+        try:
+            _rpc_db_time.reset(self._token)
+        except ValueError:
+            # A response stream closed from another context, e.g. on cancellation
+            pass
+        RPC_IN_FLIGHT.labels(self.method).dec()
+        RPC_LATENCY.labels(self.method).observe(elapsed)
+        RPC_DB_TIME.labels(self.method).observe(self.db_time[0])
+        RPC_OTHER_TIME.labels(self.method).observe(max(elapsed - self.db_time[0], 0.0))
+        if self.rows:
+            RPC_ROWS.labels(self.method).observe(sum(self.rows))
+        RPC_HANDLED.labels(self.method, status_code(context, error).name).inc()
+
+
+class MetricsInterceptor(ObserverInterceptor):
+    """Per-RPC metrics for the thread-pool server"""
+
+    observer_class = RpcMetrics
+
+
+class AsyncMetricsInterceptor(AsyncObserverInterceptor):
+    """Per-RPC metrics for the grpc.aio server"""
+
+    observer_class = RpcMetrics
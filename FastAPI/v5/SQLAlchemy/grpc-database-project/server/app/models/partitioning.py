@@ -0,0 +1,117 @@
+# ================================
+# app/models/partitioning.py
+"""Time-based RANGE partitioning for append-only tables (MySQL only).
+
+Models opt in through their table info::
+
+    __table_args__ = {"info": {"partitioning": TimePartitioning("timestamp")}}
+
+MySQL needs the partitioning column in every unique key, so in the
+database a partitioned table has PRIMARY KEY (id, <column>) and the column
+is NOT NULL. The ORM keeps mapping ``id`` alone as the primary key, which
+is still unique. The one-off conversion is an Alembic migration, and
+``rotate_partitions`` then adds future partitions and drops expired ones,
+so old data goes away with a metadata-only DROP PARTITION instead of
+row-by-row deletes.
+"""
+from datetime import datetime
+from typing import Dict, List, NamedTuple, Optional, Tuple
+
+from sqlalchemy import text
+
+MAX_PARTITION = "pmax"
+
+
+class TimePartitioning(NamedTuple):
+    column: str
+    interval: str = "month"  # "month" or "day"
+
+
+def partitioning_of(table) -> Optional[TimePartitioning]:
+    return table.info.get("partitioning")
+
+
+def partition_start(value: datetime, interval: str) -> datetime:
+    """Start of the partition that holds ``value``"""
+    if interval == "day":
+        return datetime(value.year, value.month, value.day)
+    return datetime(value.year, value.month, 1)
+
+
+def next_start(start: datetime, interval: str) -> datetime:
+    if interval == "day":
+        return datetime.fromordinal(start.toordinal() + 1)
+    if start.month == 12:
+        return datetime(start.year + 1, 1, 1)
+    return datetime(start.year, start.month + 1, 1)
+
+
+def partition_clause(start: datetime, interval: str) -> str:
+    name = f"p{start:%Y%m%d}" if interval == "day" else f"p{start:%Y%m}"
+    return f"PARTITION {name} VALUES LESS THAN ('{next_start(start, interval):%Y-%m-%d %H:%M:%S}')"
+
+
+def _clauses(start: datetime, until: datetime, interval: str) -> List[str]:
+    """Partitions from the one starting at ``start`` up to the one holding ``until``"""
+    clauses = []
+    while start <= until:
+        clauses.append(partition_clause(start, interval))
+        start = next_start(start, interval)
+    return clauses
+
+
+def partition_by_sql(table_name: str, partitioning: TimePartitioning, first: datetime, until: datetime) -> str:
+    """ALTER TABLE that partitions ``table_name`` from ``first`` through ``until`` plus a catch-all"""
+    interval = partitioning.interval
+    clauses = _clauses(partition_start(first, interval), until, interval)
+    clauses.append(f"PARTITION {MAX_PARTITION} VALUES LESS THAN (MAXVALUE)")
+    return (
+        f"ALTER TABLE `{table_name}` PARTITION BY RANGE COLUMNS(`{partitioning.column}`) "
+        f"({', '.join(clauses)})"
+    )
+
+
+def existing_partitions(connection, table_name: str) -> List[Tuple[str, Optional[datetime]]]:
+    """(name, upper bound) of each partition in order; the catch-all has no bound"""
+    rows = connection.execute(
+        text(
+            "SELECT PARTITION_NAME, PARTITION_DESCRIPTION FROM information_schema.PARTITIONS "
+            "WHERE TABLE_SCHEMA = DATABASE() AND TABLE_NAME = :table AND PARTITION_NAME IS NOT NULL "
+            "ORDER BY PARTITION_ORDINAL_POSITION"
+        ),
+        {"table": table_name}
+    ).all()
+    partitions = []
+    for name, description in rows:
+        bound = None if description == "MAXVALUE" else datetime.fromisoformat(description.strip("'"))
+        partitions.append((name, bound))
+    return partitions
+
+
+def rotate_partitions(connection, table_name: str, partitioning: TimePartitioning, now: datetime,
+                      ahead: int, drop_before: Optional[datetime] = None) -> Dict[str, List[str]]:
+    """Keep ``ahead`` future partitions and drop those entirely older than ``drop_before``
+
+    Tables that are not partitioned yet are left alone.
+    """
+    interval = partitioning.interval
+    partitions = existing_partitions(connection, table_name)
+    bounded = [(name, bound) for name, bound in partitions if bound is not None]
+    if not bounded:
+        return {"created": [], "dropped": []}
+
+    until = partition_start(now, interval)
+    for _ in range(ahead):
+        until = next_start(until, interval)
+    created = _clauses(bounded[-1][1], until, interval)
+    if created:
+        connection.execute(text(
+            f"ALTER TABLE `{table_name}` REORGANIZE PARTITION {MAX_PARTITION} INTO "
+            f"({', '.join(created)}, PARTITION {MAX_PARTITION} VALUES LESS THAN (MAXVALUE))"
+        ))
+
+    # Always keep at least one bounded partition so the table stays partitioned
+    dropped = [name for name, bound in bounded[:-1] if drop_before is not None and bound <= drop_before]
+    if dropped:
+        connection.execute(text(f"ALTER TABLE `{table_name}` DROP PARTITION {', '.join(dropped)}"))
+    return {"created": [clause.split()[1] for clause in created], "dropped": dropped}
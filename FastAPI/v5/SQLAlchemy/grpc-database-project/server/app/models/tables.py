@@ -1,12 +1,14 @@
 # ================================
 # app/models/tables.py
-from sqlalchemy import Column, Integer, BigInteger, String, Text, DateTime, Float, JSON, ForeignKey
+from sqlalchemy import Column, Integer, BigInteger, String, Text, Date, DateTime, Float, JSON, ForeignKey, Index, UniqueConstraint
 from sqlalchemy.dialects.mysql import LONGTEXT
 from sqlalchemy.dialects.mysql import TINYINT
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import relationship
 from datetime import datetime
 
+from .partitioning import TimePartitioning
+
 Base = declarative_base()
 
 class EMRClusterConfiguration(Base):
@@ -28,6 +30,10 @@ class EMRClusterConfiguration(Base):
 
 class EMRJobRunsStatus(Base):
     __tablename__ = 'emr_job_runs_status'
+    __table_args__ = (
+        Index('ix_emr_job_runs_status_job_id', 'job_id'),
+        Index('ix_emr_job_runs_status_run_id', 'run_id'),
+    )
     
     id = Column(BigInteger, primary_key=True)
     duration = Column(String(255), nullable=True)
@@ -53,6 +59,12 @@ class EMRJobSettings(Base):
 
 class IQMeteringDataProcessedRecords(Base):
     __tablename__ = 'iq_metering_data_processed_records'
+    __table_args__ = (
+        Index('ix_iqm_data_processed_timestamp', 'timestamp'),
+        Index('ix_iqm_data_processed_metering_event_id', 'metering_event_id'),
+        Index('ix_iqm_data_processed_partition_id_timestamp', 'partition_id', 'timestamp'),
+        {"info": {"partitioning": TimePartitioning("timestamp")}},
+    )
     
     id = Column(BigInteger, primary_key=True)
     data_size_mb = Column(Float, nullable=True)
@@ -68,21 +80,32 @@ class IQMeteringDataProcessedRecords(Base):
     process_step = Column(String(255), nullable=True)
     repository_url = Column(String(1000), nullable=True)
     status = Column(String(255), nullable=True)
-    timestamp = Column(DateTime(6), nullable=True)
+    timestamp = Column(DateTime(6), nullable=False, default=datetime.utcnow)
     user = Column(String(255), nullable=True)
 
 class IQMeteringEventSummaryRecords(Base):
     __tablename__ = 'iq_metering_event_summary_records'
+    __table_args__ = (
+        Index('ix_iqm_event_summary_timestamp', 'timestamp'),
+        Index('ix_iqm_event_summary_metering_event_id', 'metering_event_id'),
+        {"info": {"partitioning": TimePartitioning("timestamp")}},
+    )
     
     id = Column(BigInteger, primary_key=True)
     dimension = Column(String(255), nullable=True)
     metering_event_id = Column(String(255), nullable=True)
     metering_event_summary = Column(LONGTEXT, nullable=True)
     provider_account_id = Column(String(255), nullable=True)
-    timestamp = Column(DateTime(6), nullable=True)
+    timestamp = Column(DateTime(6), nullable=False, default=datetime.utcnow)
 
 class IQMeteringObjectRecords(Base):
     __tablename__ = 'iq_metering_object_records'
+    __table_args__ = (
+        Index('ix_iqm_object_timestamp', 'timestamp'),
+        Index('ix_iqm_object_metering_event_id', 'metering_event_id'),
+        Index('ix_iqm_object_partition_id_timestamp', 'partition_id', 'timestamp'),
+        {"info": {"partitioning": TimePartitioning("timestamp")}},
+    )
     
     id = Column(BigInteger, primary_key=True)
     data_type = Column(String(255), nullable=True)
@@ -96,9 +119,27 @@ class IQMeteringObjectRecords(Base):
     process_step = Column(String(255), nullable=True)
     repository_url = Column(String(1000), nullable=True)
     status = Column(String(255), nullable=True)
-    timestamp = Column(DateTime(6), nullable=True)
+    timestamp = Column(DateTime(6), nullable=False, default=datetime.utcnow)
     user = Column(String(255), nullable=True)
 
+class IQMeteringDailyRollup(Base):
+    """Per-day totals of the IQ metering record tables, refreshed by the metering rollup job"""
+    __tablename__ = 'iq_metering_daily_rollup'
+    __table_args__ = (
+        UniqueConstraint('source_table', 'day', 'partition_id', 'operation_type', 'status',
+                         name='uq_iq_metering_daily_rollup'),
+    )
+    
+    id = Column(BigInteger, primary_key=True, autoincrement=True)
+    source_table = Column(String(64), nullable=False)
+    day = Column(Date, nullable=False)
+    # Grouping columns hold '' rather than NULL so the unique key covers them
+    partition_id = Column(String(255), nullable=False, default='')
+    operation_type = Column(String(191), nullable=False, default='')
+    status = Column(String(191), nullable=False, default='')
+    record_count = Column(BigInteger, nullable=False, default=0)
+    data_size_mb = Column(Float, nullable=False, default=0)
+
 class JobDataSelection(Base):
     __tablename__ = 'job_data_selection'
     
@@ -153,6 +194,9 @@ class OSDUUsageStatistics(Base):
 
 class OSDUUserToken(Base):
     __tablename__ = 'osdu_user_token'
+    __table_args__ = (
+        Index('ix_osdu_user_token_user_id', 'user_id'),
+    )
     
     id = Column(BigInteger, primary_key=True)
     access_token = Column(LONGTEXT, nullable=False)
@@ -233,6 +277,9 @@ class RBACRoleSettings(Base):
 
 class RBACUserInfo(Base):
     __tablename__ = 'rbac_user_info'
+    __table_args__ = (
+        Index('ix_rbac_user_info_email', 'email'),
+    )
     
     id = Column(BigInteger, primary_key=True)
     created_at = Column(DateTime(6), nullable=True)
@@ -284,6 +331,10 @@ class SegyToVdsInfo(Base):
 
 class SegyToVdsStatus(Base):
     __tablename__ = 'segy_to_vds_status'
+    __table_args__ = (
+        Index('ix_segy_to_vds_status_pod_uid', 'pod_uid'),
+        Index('ix_segy_to_vds_status_status', 'status'),
+    )
     
     id = Column(BigInteger, primary_key=True)
     end_time = Column(DateTime(6), nullable=True)
@@ -329,6 +380,9 @@ class SettingsUserLogging(Base):
 
 class UserSettings(Base):
     __tablename__ = 'user_settings'
+    __table_args__ = (
+        Index('ix_user_settings_username', 'username'),
+    )
     
     id = Column(BigInteger, primary_key=True)
     settings = Column(LONGTEXT, nullable=True)
@@ -0,0 +1,112 @@
+# ================================
+# app/pool_stats.py
+import bisect
+import threading
+import time
+from typing import Any, Dict, List
+
+from sqlalchemy import event
+from sqlalchemy.exc import TimeoutError as PoolTimeoutError
+from sqlalchemy.pool import AsyncAdaptedQueuePool, QueuePool
+
+# Upper bounds (ms) of the checkout wait histogram buckets
+WAIT_BUCKETS_MS = [1, 5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000, 10000]
+
+class PoolStats:
+    """Counters and a checkout-wait histogram for one connection pool"""
+
+    def __init__(self, name: str):
+        self.name = name
+        self.pool = None
+        self._lock = threading.Lock()
+        self.checkouts = 0
+        self.timeouts = 0
+        self.connects = 0
+        self.connect_time_ms = 0.0
+        self.wait_time_ms = 0.0
+        self.wait_buckets = [0] * (len(WAIT_BUCKETS_MS) + 1)
+
+    def observe_wait(self, elapsed_ms: float):
+        with self._lock:
+            self.checkouts += 1
+            self.wait_time_ms += elapsed_ms
+            self.wait_buckets[bisect.bisect_left(WAIT_BUCKETS_MS, elapsed_ms)] += 1
+
+    def observe_timeout(self):
+        with self._lock:
+            self.timeouts += 1
+
+    def observe_connect(self, elapsed_ms: float):
+        with self._lock:
+            self.connects += 1
+            self.connect_time_ms += elapsed_ms
+
+    def snapshot(self) -> Dict[str, Any]:
+        pool = self.pool
+        with self._lock:
+            cumulative, buckets = 0, []
+            for bound, count in zip(WAIT_BUCKETS_MS + [float("inf")], self.wait_buckets):
+                cumulative += count
+                buckets.append({"le": bound, "count": cumulative})
+            return {
+                "name": self.name,
+                "size": pool.size() if pool else 0,
+                "checked_out": pool.checkedout() if pool else 0,
+                "checked_in": pool.checkedin() if pool else 0,
+                "overflow": max(pool.overflow(), 0) if pool else 0,
+                "checkouts": self.checkouts,
+                "timeouts": self.timeouts,
+                "connects": self.connects,
+                "connect_time_avg_ms": self.connect_time_ms / self.connects if self.connects else 0.0,
+                "wait_time_sum_ms": self.wait_time_ms,
+                "wait_time_ms": buckets,
+            }
+
+
+sync_pool_stats = PoolStats("sync")
+async_pool_stats = PoolStats("async")
+
+
+class _TimedCheckoutMixin:
+    """Times how long callers wait in ``_do_get`` for a pooled connection"""
+
+    stats: PoolStats
+
+    def _do_get(self):
+        start = time.perf_counter()
+        try:
+            connection = super()._do_get()
+        except PoolTimeoutError:
+            self.stats.observe_timeout()
+            raise
+        self.stats.pool = self
+        self.stats.observe_wait((time.perf_counter() - start) * 1000)
+        return connection
+
+
+class InstrumentedQueuePool(_TimedCheckoutMixin, QueuePool):
+    stats = sync_pool_stats
+
+
+class InstrumentedAsyncQueuePool(_TimedCheckoutMixin, AsyncAdaptedQueuePool):
+    stats = async_pool_stats
+
+
+def instrument_engine(engine, stats: PoolStats):
+    """Record DBAPI connect time for every new connection the engine opens"""
+    sync_engine = getattr(engine, "sync_engine", engine)
+    stats.pool = sync_engine.pool
+
+    @event.listens_for(sync_engine, "do_connect")
+    def _before_connect(dialect, conn_rec, cargs, cparams):
+        conn_rec.info["connect_start"] = time.perf_counter()
+
+    @event.listens_for(sync_engine, "connect")
+    def _after_connect(dbapi_connection, connection_record):
+        start = connection_record.info.pop("connect_start", None)
+        if start is not None:
+            stats.observe_connect((time.perf_counter() - start) * 1000)
+
+
+def all_pool_stats() -> List[Dict[str, Any]]:
+    return [stats.snapshot() for stats in (sync_pool_stats, async_pool_stats) if stats.pool is not None]
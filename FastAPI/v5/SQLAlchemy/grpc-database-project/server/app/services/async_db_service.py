@@ -0,0 +1,196 @@
+# ================================
+# app/services/async_db_service.py
+import asyncio
+import structlog
+from contextvars import ContextVar
+from typing import Dict, Any, AsyncIterable, AsyncIterator, List, Optional, Tuple
+from sqlalchemy import select
+
+from ..config import settings
+from ..database import get_async_db_session
+from .db_service import DatabaseService, _bound_session
+from .filters import compile_filter
+from .ingest_writer import IngestQueueFull
+from .serializers import get_serializer
+
+logger = structlog.get_logger()
+
+# Tables whose shared record cache entries the current _run call has to drop
+_pending_broadcasts: ContextVar[Optional[List[str]]] = ContextVar("pending_cache_broadcasts", default=None)
+
+class AsyncDatabaseService(DatabaseService):
+    """DatabaseService for the grpc.aio server.
+
+    The record operations run the same code as ``DatabaseService`` through
+    ``AsyncSession.run_sync``, so queries go over the async driver without
+    tying up a worker thread. Migration and schema operations are inherited
+    unchanged and stay synchronous.
+
+    Only the in-process record cache is touched on the event loop. Redis
+    lookups, puts and invalidation broadcasts run on worker threads, so a
+    slow Redis delays only the calls that need it. Buffered coalesced values
+    are drained on a worker thread too, since that waits for a flush of the
+    same row.
+    """
+
+    async def _run(self, method, *args):
+        broadcasts: List[str] = []
+        token = _pending_broadcasts.set(broadcasts)
+        try:
+            async with get_async_db_session() as session:
+                def bound(sync_session):
+                    bound_token = _bound_session.set(sync_session)
+                    try:
+                        return method(*args)
+                    finally:
+                        _bound_session.reset(bound_token)
+
+                return await session.run_sync(bound)
+        finally:
+            _pending_broadcasts.reset(token)
+            # After the session has committed, before the caller sees the result
+            for table_name in dict.fromkeys(broadcasts):
+                await asyncio.to_thread(self.record_cache.broadcast_invalidation, table_name)
+
+    def _after_write(self, table_name: str):
+        broadcasts = _pending_broadcasts.get()
+        if broadcasts is None:
+            # Background writers run on their own threads and can block
+            super()._after_write(table_name)
+            return
+        self.count_cache.invalidate(table_name)
+        self.record_cache.invalidate(table_name, broadcast=False)
+        if self.record_cache.shared and table_name in self.record_cache.tables:
+            broadcasts.append(table_name)
+
+    async def _take_pending_async(self, table_name: str, record_ids: List[int]) -> Dict[int, Dict[str, Any]]:
+        if table_name not in self.write_coalescer.columns:
+            return {}
+        return await asyncio.to_thread(self._take_pending, table_name, record_ids)
+
+    async def _cache_get(self, key):
+        result = self.record_cache.get_local(key)
+        if result is None and key is not None:
+            if self.record_cache.shared:
+                result = await asyncio.to_thread(self.record_cache.get_shared, key)
+            else:
+                result = self.record_cache.get_shared(key)
+        return result
+
+    async def _cache_put(self, key, result: Dict[str, Any]):
+        if key is not None and self.record_cache.shared:
+            await asyncio.to_thread(self.record_cache.put, key, result)
+        else:
+            self.record_cache.put(key, result)
+
+    async def create_record(self, table_name: str, data: Dict[str, Any]) -> Dict[str, Any]:
+        return await self._run(super().create_record, table_name, data)
+
+    async def get_record(self, table_name: str, record_id: int, typed: bool = False, fields: Optional[List[str]] = None) -> Dict[str, Any]:
+        # Check the record cache before taking a connection from the pool
+        key = self._get_cache_key(table_name, record_id, typed, fields)
+        result = await self._cache_get(key)
+        if result is None:
+            result = await self._run(self._get_record, table_name, record_id, typed, fields)
+            await self._cache_put(key, result)
+        return result
+
+    async def update_record(self, table_name: str, record_id: int, data: Dict[str, Any], return_record: bool = False) -> Dict[str, Any]:
+        if not return_record and self.write_coalescer.offer(table_name, record_id, data):
+            return {"success": True, "message": "Record update queued"}
+        pending = await self._take_pending_async(table_name, [record_id])
+        data = {**pending.get(record_id, {}), **data}
+        result = await self._run(self._update_record, table_name, record_id, data, return_record)
+        if not result["success"]:
+            self._requeue_pending(table_name, pending)
+        return result
+
+    async def delete_record(self, table_name: str, record_id: int) -> Dict[str, Any]:
+        await self._take_pending_async(table_name, [record_id])
+        return await self._run(self._delete_record, table_name, record_id)
+
+    async def list_records(self, table_name: str, page: int = 1, page_size: int = 50, filter_conditions: Optional[str] = None, after_id: Optional[int] = None, typed: bool = False, fields: Optional[List[str]] = None, count_mode: str = "exact") -> Dict[str, Any]:
+        key = self._list_cache_key(table_name, page, page_size, filter_conditions, after_id, typed, fields, count_mode)
+        result = await self._cache_get(key)
+        if result is None:
+            result = await self._run(
+                self._list_records, table_name, page, page_size, filter_conditions, after_id, typed, fields, count_mode
+            )
+            await self._cache_put(key, result)
+        return result
+
+    async def batch_create_records(self, table_name: str, rows: List[Dict[str, Any]]) -> Dict[str, Any]:
+        return await self._run(super().batch_create_records, table_name, rows)
+
+    async def batch_update_records(self, table_name: str, updates: List[Dict[str, Any]]) -> Dict[str, Any]:
+        pending = await self._take_pending_async(table_name, self._row_ids(updates))
+        result = await self._run(self._batch_update_records, table_name, updates, pending)
+        self._requeue_pending(table_name, pending)
+        return result
+
+    async def batch_delete_records(self, table_name: str, record_ids: List[int]) -> Dict[str, Any]:
+        await self._take_pending_async(table_name, record_ids)
+        return await self._run(self._batch_delete_records, table_name, record_ids)
+
+    async def upsert_records(self, table_name: str, rows: List[Dict[str, Any]], conflict_columns: List[str], update_columns: Optional[List[str]] = None) -> Dict[str, Any]:
+        pending = await self._take_pending_async(table_name, self._row_ids(rows))
+        result = await self._run(self._upsert_records, table_name, rows, conflict_columns, update_columns)
+        self._requeue_pending(
+            table_name, self._pending_after_upsert(rows, pending, conflict_columns, update_columns, result)
+        )
+        return result
+
+    async def get_metering_rollups(self, source_table: Optional[str] = None, start_day: Optional[str] = None,
+                                   end_day: Optional[str] = None, partition_id: Optional[str] = None) -> Dict[str, Any]:
+        return await self._run(super().get_metering_rollups, source_table, start_day, end_day, partition_id)
+
+    async def get_index_advice(self, table_name: Optional[str] = None) -> Dict[str, Any]:
+        return await self._run(super().get_index_advice, table_name)
+
+    async def append_records(self, batches: AsyncIterable[Tuple[str, List[Dict[str, Any]]]], wait_committed: bool = False) -> Dict[str, Any]:
+        """Same as ``DatabaseService.append_records``; waits on the queue happen off the event loop"""
+        received, tickets, errors = 0, [], []
+        try:
+            async for table_name, rows in batches:
+                ticket = await asyncio.to_thread(self._queue_append, table_name, rows, received, errors)
+                if ticket is not None:
+                    tickets.append(ticket)
+                received += len(rows)
+            failure = None
+        except IngestQueueFull as e:
+            logger.warning("Append stream stopped", received=received, error=str(e))
+            failure = f"{e}; resend from row {received}"
+        except Exception as e:
+            logger.error("Failed to append records", received=received, error=str(e))
+            failure = f"Failed to append records: {str(e)}"
+        return await asyncio.to_thread(self._append_result, received, tickets, errors, wait_committed, failure)
+
+    async def stream_records(self, table_name: str, chunk_size: Optional[int] = None, filter_conditions: Optional[str] = None, after_id: Optional[int] = None, typed: bool = False, fields: Optional[List[str]] = None) -> AsyncIterator[Dict[str, Any]]:
+        """Stream records in id order as chunks read from a server-side cursor"""
+        try:
+            model_class = self.get_model_class(table_name)
+            if not model_class:
+                yield {"success": False, "message": f"Table {table_name} not found"}
+                return
+
+            chunk_size = min(max(chunk_size or settings.stream_chunk_size, 1), settings.max_page_size)
+
+            compiled = compile_filter(model_class, filter_conditions)
+            if compiled.order_by:
+                yield {"success": False, "message": "Streams are always in id order; order_by is not supported"}
+                return
+
+            serializer = get_serializer(model_class, fields)
+            async with get_async_db_session() as session:
+                stmt = select(*serializer.columns).order_by(model_class.id)
+                if compiled.where is not None:
+                    stmt = stmt.where(compiled.where)
+                if after_id:
+                    stmt = stmt.where(model_class.id > after_id)
+
+                result = await session.stream(stmt.execution_options(yield_per=chunk_size), compiled.params)
+                async for partition in result.partitions():
+                    yield serializer.chunk(partition, typed)
+        except Exception as e:
+            logger.error("Failed to stream records", table=table_name, error=str(e))
+            yield {"success": False, "message": f"Failed to stream records: {str(e)}"}
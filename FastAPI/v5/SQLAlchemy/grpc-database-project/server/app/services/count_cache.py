@@ -0,0 +1,37 @@
+# ================================
+# app/services/count_cache.py
+import threading
+import time
+from typing import Dict, Optional, Tuple
+
+
+class CountCache:
+    """Per-process TTL cache of list_records totals keyed by (table, filter).
+
+    Writes through DatabaseService drop every entry for the table, so a
+    cached total is only stale for changes made outside this process.
+    """
+
+    def __init__(self, ttl: float, max_entries_per_table: int = 256):
+        self.ttl = ttl
+        self.max_entries_per_table = max_entries_per_table
+        self._lock = threading.Lock()
+        self._tables: Dict[str, Dict[str, Tuple[float, int]]] = {}
+
+    def get(self, table_name: str, key: str) -> Optional[int]:
+        with self._lock:
+            entry = self._tables.get(table_name, {}).get(key)
+        if entry is None or entry[0] < time.monotonic():
+            return None
+        return entry[1]
+
+    def set(self, table_name: str, key: str, count: int):
+        with self._lock:
+            entries = self._tables.setdefault(table_name, {})
+            if len(entries) >= self.max_entries_per_table and key not in entries:
+                entries.pop(next(iter(entries)))
+            entries[key] = (time.monotonic() + self.ttl, count)
+
+    def invalidate(self, table_name: str):
+        with self._lock:
+            self._tables.pop(table_name, None)
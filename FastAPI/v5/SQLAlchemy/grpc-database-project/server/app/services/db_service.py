@@ -1,26 +1,48 @@
 # ================================
 # app/services/db_service.py
-import json
+import time
 import structlog
-from typing import Dict, Any, List, Optional
+from contextlib import contextmanager
+from contextvars import ContextVar
+from datetime import date
+from typing import Dict, Any, Iterable, Iterator, List, Optional, Tuple
 from sqlalchemy.orm import Session
-from sqlalchemy import inspect, text
+from sqlalchemy.dialects import mysql, postgresql, sqlite
+from sqlalchemy import and_, bindparam, delete, func, insert, inspect, or_, select, text, update
 from alembic.config import Config
 from alembic import command
 from alembic.runtime.migration import MigrationContext
 from alembic.script import ScriptDirectory
 
+from ..config import settings
 from ..database import get_db_session, engine, Base
 from ..models.tables import *
+from .count_cache import CountCache
+from .filters import compile_filter
+from .index_advisor import IndexAdvisor, explain, migration_stub
+from .ingest_writer import IngestQueueFull, IngestTicket, IngestWriter
+from .metering import query_rollups
+from .record_cache import RecordCache
+from .serializers import get_serializer
+from .write_coalescer import WriteCoalescer, coerce_value
 
 logger = structlog.get_logger()
 
+COUNT_MODES = ("exact", "none", "estimate", "cached")
+
+# Dialect INSERT constructs that support a native upsert clause
+UPSERT_INSERTS = {"mysql": mysql.insert, "postgresql": postgresql.insert, "sqlite": sqlite.insert}
+
+# Session handed in by AsyncDatabaseService while it runs these methods via run_sync
+_bound_session: ContextVar[Optional[Session]] = ContextVar("bound_session", default=None)
+
 class DatabaseService:
     def __init__(self):
         self.table_mapping = {
             'EMR_Cluster_Configuration': EMRClusterConfiguration,
             'emr_job_runs_status': EMRJobRunsStatus,
             'emr_job_settings': EMRJobSettings,
+            'iq_metering_daily_rollup': IQMeteringDailyRollup,
             'iq_metering_data_processed_records': IQMeteringDataProcessedRecords,
             'iq_metering_event_summary_records': IQMeteringEventSummaryRecords,
             'iq_metering_object_records': IQMeteringObjectRecords,
@@ -45,10 +67,49 @@ class DatabaseService:
             'user_settings': UserSettings,
             'user':user,
         }
+        # Writable column names per model, so request keys are checked without reflection
+        self.column_names = {
+            model_class: frozenset(model_class.__table__.columns.keys())
+            for model_class in self.table_mapping.values()
+        }
+        self.count_cache = CountCache(settings.count_cache_ttl)
+        self.record_cache = RecordCache.from_settings()
+        self.index_advisor = IndexAdvisor.from_settings()
+        self.ingest_writer = IngestWriter.from_settings(self._write_appended)
+        self.write_coalescer = WriteCoalescer.from_settings(self._flush_coalesced, self._coerce_coalesced)
+        for table_name, columns in self.write_coalescer.columns.items():
+            model_class = self.get_model_class(table_name)
+            if not model_class or not columns <= self.column_names[model_class] - {"id"}:
+                raise ValueError(f"Invalid coalesce_columns entry for table {table_name}")
 
     def get_model_class(self, table_name: str):
         return self.table_mapping.get(table_name)
 
+    def _after_write(self, table_name: str):
+        """Drop cached state for a table once a write has committed"""
+        self.count_cache.invalidate(table_name)
+        self.record_cache.invalidate(table_name)
+
+    def _get_cache_key(self, table_name: str, record_id: int, typed: bool, fields: Optional[List[str]]):
+        return self.record_cache.key(table_name, ("get", record_id, typed, tuple(fields or ())))
+
+    def _list_cache_key(self, table_name: str, page: int, page_size: int, filter_conditions: Optional[str],
+                        after_id: Optional[int], typed: bool, fields: Optional[List[str]], count_mode: str):
+        return self.record_cache.key(
+            table_name,
+            ("list", page, page_size, filter_conditions, after_id, typed, tuple(fields or ()), count_mode)
+        )
+
+    @contextmanager
+    def _session_scope(self) -> Iterator[Session]:
+        """Yield the session bound by the async service, or open a new one"""
+        session = _bound_session.get()
+        if session is not None:
+            yield session
+            return
+        with get_db_session() as session:
+            yield session
+
     def create_record(self, table_name: str, data: Dict[str, Any]) -> Dict[str, Any]:
         """Create a new record in the specified table"""
         try:
@@ -56,7 +117,7 @@ class DatabaseService:
             if not model_class:
                 return {"success": False, "message": f"Table {table_name} not found"}
 
-            with get_db_session() as session:
+            with self._session_scope() as session:
                 # Create new instance
                 record = model_class(**data)
                 session.add(record)
@@ -64,6 +125,7 @@ class DatabaseService:
                 
                 record_id = record.id
                 session.commit()
+                self._after_write(table_name)
                 
                 logger.info("Record created", table=table_name, record_id=record_id)
                 return {
@@ -75,138 +137,774 @@ class DatabaseService:
             logger.error("Failed to create record", table=table_name, error=str(e))
             return {"success": False, "message": f"Failed to create record: {str(e)}"}
 
-    def get_record(self, table_name: str, record_id: int) -> Dict[str, Any]:
-        """Get a record by ID from the specified table"""
+    def get_record(self, table_name: str, record_id: int, typed: bool = False, fields: Optional[List[str]] = None) -> Dict[str, Any]:
+        """Get a record by ID from the specified table.
+
+        Returns the row as a JSON string in ``data``, or as a plain dict in
+        ``row`` when ``typed`` is set so the caller can encode it itself.
+        ``fields`` limits the SELECT to those columns (plus ``id``). Tables
+        listed in ``record_cache_tables`` are served from the record cache.
+        """
+        key = self._get_cache_key(table_name, record_id, typed, fields)
+        result = self.record_cache.get(key)
+        if result is None:
+            result = self._get_record(table_name, record_id, typed, fields)
+            self.record_cache.put(key, result)
+        return result
+
+    def _get_record(self, table_name: str, record_id: int, typed: bool = False, fields: Optional[List[str]] = None) -> Dict[str, Any]:
         try:
             model_class = self.get_model_class(table_name)
             if not model_class:
                 return {"success": False, "message": f"Table {table_name} not found"}
 
-            with get_db_session() as session:
-                record = session.query(model_class).filter(model_class.id == record_id).first()
+            serializer = get_serializer(model_class, fields)
+            with self._session_scope() as session:
+                row = session.execute(
+                    select(*serializer.columns).where(model_class.id == record_id)
+                ).first()
                 
-                if not record:
+                if not row:
                     return {"success": False, "message": "Record not found"}
                 
-                # Convert to dict
-                record_dict = {}
-                for column in model_class.__table__.columns:
-                    value = getattr(record, column.name)
-                    if isinstance(value, datetime):
-                        value = value.isoformat()
-                    record_dict[column.name] = value
-                
-                return {
-                    "success": True,
-                    "message": "Record retrieved successfully",
-                    "data": json.dumps(record_dict)
-                }
+                result = {"success": True, "message": "Record retrieved successfully"}
+                if typed:
+                    result["row"] = serializer.to_dict(row)
+                else:
+                    result["data"] = serializer.dumps(row)
+                return result
         except Exception as e:
             logger.error("Failed to get record", table=table_name, record_id=record_id, error=str(e))
             return {"success": False, "message": f"Failed to get record: {str(e)}"}
 
-    def update_record(self, table_name: str, record_id: int, data: Dict[str, Any]) -> Dict[str, Any]:
-        """Update a record in the specified table"""
+    def _unknown_columns(self, model_class, data: Dict[str, Any]) -> List[str]:
+        return sorted(set(data) - self.column_names[model_class])
+
+    def update_record(self, table_name: str, record_id: int, data: Dict[str, Any], return_record: bool = False) -> Dict[str, Any]:
+        """Update a record in the specified table with a single UPDATE statement.
+
+        A missing row is detected from the statement's rowcount rather than a
+        prior SELECT. With ``return_record`` the updated row comes back in
+        ``data``, via RETURNING where the dialect supports it.
+
+        Updates limited to the columns in ``coalesce_columns`` are buffered
+        and written by the write coalescer instead; those return as soon as
+        they are queued and cannot report a missing row.
+        """
+        if not return_record and self.write_coalescer.offer(table_name, record_id, data):
+            return {"success": True, "message": "Record update queued"}
+        pending = self._take_pending(table_name, [record_id])
+        result = self._update_record(table_name, record_id, {**pending.get(record_id, {}), **data}, return_record)
+        if not result["success"]:
+            self._requeue_pending(table_name, pending)
+        return result
+
+    @staticmethod
+    def _row_ids(rows: List[Dict[str, Any]]) -> List[int]:
+        return [row["id"] for row in rows if isinstance(row.get("id"), int)]
+
+    def _take_pending(self, table_name: str, record_ids: Iterable[int]) -> Dict[int, Dict[str, Any]]:
+        """Drain buffered coalesced values for rows about to be written directly"""
+        if table_name not in self.write_coalescer.columns:
+            return {}
+        pending = {}
+        for record_id in record_ids:
+            values = self.write_coalescer.take(table_name, record_id)
+            if values:
+                pending[record_id] = values
+        return pending
+
+    def _requeue_pending(self, table_name: str, pending: Dict[int, Dict[str, Any]]):
+        """Buffer drained values again when the direct write they were merged into didn't happen"""
+        if pending:
+            self.write_coalescer.requeue(table_name, pending)
+
+    def _update_record(self, table_name: str, record_id: int, data: Dict[str, Any], return_record: bool = False) -> Dict[str, Any]:
         try:
             model_class = self.get_model_class(table_name)
             if not model_class:
                 return {"success": False, "message": f"Table {table_name} not found"}
 
-            with get_db_session() as session:
-                record = session.query(model_class).filter(model_class.id == record_id).first()
-                
-                if not record:
+            unknown = self._unknown_columns(model_class, data)
+            if unknown:
+                return {"success": False, "message": f"Unknown column(s): {', '.join(unknown)}"}
+
+            table = model_class.__table__
+            serializer = get_serializer(model_class)
+            with self._session_scope() as session:
+                dialect = session.get_bind().dialect
+                row = None
+                if not data:
+                    # Nothing to SET; still report whether the row exists
+                    found = session.execute(select(table.c.id).where(table.c.id == record_id)).first() is not None
+                elif return_record and dialect.update_returning:
+                    row = session.execute(
+                        update(table).where(table.c.id == record_id).values(data).returning(*serializer.columns)
+                    ).first()
+                    found = row is not None
+                else:
+                    found = session.execute(update(table).where(table.c.id == record_id).values(data)).rowcount > 0
+
+                if not found:
                     return {"success": False, "message": "Record not found"}
-                
-                # Update fields
-                for key, value in data.items():
-                    if hasattr(record, key):
-                        setattr(record, key, value)
-                
+
+                if return_record and row is None:
+                    row = session.execute(select(*serializer.columns).where(table.c.id == record_id)).first()
                 session.commit()
-                
-                logger.info("Record updated", table=table_name, record_id=record_id)
-                return {"success": True, "message": "Record updated successfully"}
+            if data:
+                self._after_write(table_name)
+
+            logger.info("Record updated", table=table_name, record_id=record_id)
+            result = {"success": True, "message": "Record updated successfully"}
+            if return_record:
+                result["data"] = serializer.dumps(row)
+            return result
         except Exception as e:
             logger.error("Failed to update record", table=table_name, record_id=record_id, error=str(e))
             return {"success": False, "message": f"Failed to update record: {str(e)}"}
 
     def delete_record(self, table_name: str, record_id: int) -> Dict[str, Any]:
-        """Delete a record from the specified table"""
+        """Delete a record from the specified table with a single DELETE statement"""
+        self._take_pending(table_name, [record_id])
+        return self._delete_record(table_name, record_id)
+
+    def _delete_record(self, table_name: str, record_id: int) -> Dict[str, Any]:
         try:
             model_class = self.get_model_class(table_name)
             if not model_class:
                 return {"success": False, "message": f"Table {table_name} not found"}
 
-            with get_db_session() as session:
-                record = session.query(model_class).filter(model_class.id == record_id).first()
-                
-                if not record:
+            table = model_class.__table__
+            with self._session_scope() as session:
+                result = session.execute(delete(table).where(table.c.id == record_id))
+                if result.rowcount == 0:
                     return {"success": False, "message": "Record not found"}
-                
-                session.delete(record)
                 session.commit()
-                
-                logger.info("Record deleted", table=table_name, record_id=record_id)
-                return {"success": True, "message": "Record deleted successfully"}
+            self._after_write(table_name)
+
+            logger.info("Record deleted", table=table_name, record_id=record_id)
+            return {"success": True, "message": "Record deleted successfully"}
         except Exception as e:
             logger.error("Failed to delete record", table=table_name, record_id=record_id, error=str(e))
             return {"success": False, "message": f"Failed to delete record: {str(e)}"}
 
-    def list_records(self, table_name: str, page: int = 1, page_size: int = 50, filter_conditions: Optional[str] = None) -> Dict[str, Any]:
-        """List records from the specified table with pagination"""
+    def _coerce_coalesced(self, table_name: str, data: Dict[str, Any]) -> Dict[str, Any]:
+        """Check values before they are buffered, so a bad one fails the request rather than a flush"""
+        table = self.get_model_class(table_name).__table__
+        return {column: coerce_value(table.c[column], value) for column, value in data.items()}
+
+    def _flush_coalesced(self, table_name: str, updates: Dict[int, Dict[str, Any]]):
+        """Write buffered updates as one executemany UPDATE per column set
+
+        Rows whose status is already terminal are left alone.
+        """
+        table = self.get_model_class(table_name).__table__
+        groups: Dict[frozenset, List[Dict[str, Any]]] = {}
+        for record_id, values in updates.items():
+            params = {f"v_{column}": value for column, value in values.items()}
+            params["record_id"] = record_id
+            groups.setdefault(frozenset(values), []).append(params)
+
+        # Another replica may have written a terminal status directly since these
+        # values were buffered; a late flush must not bring the job back to life
+        guard = None
+        if "status" in table.c and self.write_coalescer.terminal_statuses:
+            # Plain comparisons: an expanding NOT IN can't be used with executemany
+            status = func.upper(table.c.status)
+            guard = or_(
+                table.c.status.is_(None),
+                and_(*(status != terminal for terminal in sorted(self.write_coalescer.terminal_statuses)))
+            )
+
+        with self._session_scope() as session:
+            for columns, rows in groups.items():
+                stmt = (
+                    update(table)
+                    .where(table.c.id == bindparam("record_id"))
+                    .values({column: bindparam(f"v_{column}") for column in columns})
+                )
+                if guard is not None:
+                    stmt = stmt.where(guard)
+                for chunk in self._chunks(rows):
+                    session.execute(stmt, chunk)
+            session.commit()
+        self._after_write(table_name)
+        logger.debug("Coalesced updates flushed", table=table_name, rows=len(updates))
+
+    def _estimate_count(self, session: Session, model_class, compiled) -> Optional[int]:
+        """Row estimate from MySQL's statistics, or None where unsupported"""
+        dialect = session.get_bind().dialect
+        if dialect.name != "mysql":
+            return None
+        if compiled.where is None:
+            return session.execute(
+                text("SELECT TABLE_ROWS FROM information_schema.TABLES "
+                     "WHERE TABLE_SCHEMA = DATABASE() AND TABLE_NAME = :table_name"),
+                {"table_name": model_class.__tablename__}
+            ).scalar()
+
+        plan = explain(session, select(model_class.id).where(compiled.where).params(compiled.params))
+        if not plan or plan[0].get("rows") is None:
+            return None
+        return int(plan[0]["rows"] * float(plan[0].get("filtered") or 100) / 100)
+
+    def _count_records(self, session: Session, model_class, table_name: str, filter_conditions: Optional[str],
+                       compiled, count_mode: str):
+        """Total for list_records and the count mode that actually produced it"""
+        if count_mode == "none":
+            return -1, "none"
+        if count_mode == "estimate":
+            try:
+                estimate = self._estimate_count(session, model_class, compiled)
+            except Exception as e:
+                logger.warning("Count estimate failed, counting exactly", table=table_name, error=str(e))
+                estimate = None
+            if estimate is not None:
+                return estimate, "estimate"
+        if count_mode == "cached":
+            cached = self.count_cache.get(table_name, filter_conditions or "")
+            if cached is not None:
+                return cached, "cached"
+
+        count_stmt = select(func.count()).select_from(model_class.__table__)
+        if compiled.where is not None:
+            count_stmt = count_stmt.where(compiled.where)
+        total_count = session.scalar(count_stmt, compiled.params)
+        if count_mode == "cached":
+            self.count_cache.set(table_name, filter_conditions or "", total_count)
+        return total_count, "exact"
+
+    def list_records(self, table_name: str, page: int = 1, page_size: int = 50, filter_conditions: Optional[str] = None, after_id: Optional[int] = None, typed: bool = False, fields: Optional[List[str]] = None, count_mode: str = "exact") -> Dict[str, Any]:
+        """List records from the specified table with pagination.
+
+        Uses LIMIT/OFFSET paging by default. When ``after_id`` is given the
+        page is read with a keyset cursor (``id > after_id``) instead, which
+        stays cheap no matter how deep into the table the caller is.
+
+        With ``typed`` the page comes back as ``columns`` plus raw ``rows``
+        rather than JSON strings in ``records``. Only ``fields`` are selected
+        when given; otherwise large text columns are skipped unless
+        ``list_defer_large_columns`` is turned off.
+
+        ``count_mode`` picks how ``total_count`` is found: ``exact``,
+        ``none`` (-1), ``estimate`` (MySQL statistics, exact elsewhere) or
+        ``cached`` (exact, reused until the TTL expires or the table is
+        written to).
+
+        Pages of tables listed in ``record_cache_tables`` are served from
+        the record cache.
+        """
+        key = self._list_cache_key(table_name, page, page_size, filter_conditions, after_id, typed, fields, count_mode)
+        result = self.record_cache.get(key)
+        if result is None:
+            result = self._list_records(table_name, page, page_size, filter_conditions, after_id, typed, fields, count_mode)
+            self.record_cache.put(key, result)
+        return result
+
+    def _list_records(self, table_name: str, page: int = 1, page_size: int = 50, filter_conditions: Optional[str] = None, after_id: Optional[int] = None, typed: bool = False, fields: Optional[List[str]] = None, count_mode: str = "exact") -> Dict[str, Any]:
         try:
             model_class = self.get_model_class(table_name)
             if not model_class:
                 return {"success": False, "message": f"Table {table_name} not found"}
 
-            with get_db_session() as session:
-                query = session.query(model_class)
-                
-                # Apply filters if provided
-                if filter_conditions:
-                    # Simple filter implementation - can be enhanced
-                    #query = query.filter(text(filter_conditions))
-                    from sqlalchemy.sql import text as sql_text
-                    query = query.filter(sql_text(filter_conditions))
+            page = max(page or 1, 1)
+            page_size = min(max(page_size or 50, 1), settings.max_page_size)
 
-                    
+            if count_mode not in COUNT_MODES:
+                return {"success": False, "message": f"Unknown count mode: {count_mode}"}
 
-                    # Safe way to apply raw SQL filters
-                    if filter_conditions:
-                        query = query.filter(sql_text(filter_conditions))
+            compiled = compile_filter(model_class, filter_conditions)
+            if after_id and compiled.order_by:
+                return {"success": False, "message": "after_id paging cannot be combined with order_by"}
 
+            serializer = get_serializer(model_class, fields, defer_large=settings.list_defer_large_columns)
+            started = time.perf_counter()
+            with self._session_scope() as session:
+                # Core select of the table's columns; rows skip ORM identity
+                # map and attribute instrumentation entirely
+                stmt = select(*serializer.columns)
                 
-                # Get total count
-                total_count = query.count()
+                # Apply filters if provided
+                if compiled.where is not None:
+                    stmt = stmt.where(compiled.where)
                 
-                # Apply pagination
-                offset = (page - 1) * page_size
-                #records = query.offset(offset).limit(page_size).all()
-                print("SQL:", query.statement.compile(compile_kwargs={'literal_binds': True}))
-                records = query.all()
+                total_count, count_mode = self._count_records(
+                    session, model_class, table_name, filter_conditions, compiled, count_mode
+                )
                 
-                # Convert to dict list
-                records_list = []
-                for record in records:
-                    record_dict = {}
-                    for column in model_class.__table__.columns:
-                        value = getattr(record, column.name)
-                        if isinstance(value, datetime):
-                            value = value.isoformat()
-                        record_dict[column.name] = value
-                    records_list.append(json.dumps(record_dict))
+                # Apply pagination, fetching one extra row to detect a next page;
+                # id breaks ties so pages stay stable under a custom order
+                stmt = stmt.order_by(*compiled.order_by, model_class.id)
+                if after_id:
+                    stmt = stmt.where(model_class.id > after_id)
+                else:
+                    stmt = stmt.offset((page - 1) * page_size)
+                rows = session.execute(stmt.limit(page_size + 1), compiled.params).all()
+
+                self.index_advisor.record(table_name, compiled, (time.perf_counter() - started) * 1000)
+
+                has_more = len(rows) > page_size
+                rows = rows[:page_size]
                 
-                return {
+                result = {
                     "success": True,
-                    "message": f"Retrieved {len(records_list)} records",
-                    "records": records_list,
-                    "total_count": total_count
+                    "message": f"Retrieved {len(rows)} records",
+                    "total_count": total_count,
+                    "count_mode": count_mode,
+                    "next_cursor": rows[-1].id if has_more and not compiled.order_by else 0,
+                    "has_more": has_more
                 }
+                if typed:
+                    result["columns"] = serializer.keys
+                    result["rows"] = rows
+                else:
+                    result["records"] = [serializer.dumps(row) for row in rows]
+                return result
         except Exception as e:
             logger.error("Failed to list records", table=table_name, error=str(e))
             return {"success": False, "message": f"Failed to list records: {str(e)}"}
 
+    def stream_records(self, table_name: str, chunk_size: Optional[int] = None, filter_conditions: Optional[str] = None, after_id: Optional[int] = None, typed: bool = False, fields: Optional[List[str]] = None) -> Iterator[Dict[str, Any]]:
+        """Stream records in id order as chunks read from a server-side cursor"""
+        try:
+            model_class = self.get_model_class(table_name)
+            if not model_class:
+                yield {"success": False, "message": f"Table {table_name} not found"}
+                return
+
+            chunk_size = min(max(chunk_size or settings.stream_chunk_size, 1), settings.max_page_size)
+
+            compiled = compile_filter(model_class, filter_conditions)
+            if compiled.order_by:
+                yield {"success": False, "message": "Streams are always in id order; order_by is not supported"}
+                return
+
+            serializer = get_serializer(model_class, fields)
+            with get_db_session() as session:
+                stmt = select(*serializer.columns).order_by(model_class.id)
+                if compiled.where is not None:
+                    stmt = stmt.where(compiled.where)
+                if after_id:
+                    stmt = stmt.where(model_class.id > after_id)
+
+                # yield_per turns on stream_results so rows arrive from the driver in
+                # batches; plain Core rows are freed as soon as each chunk is sent
+                result = session.execute(stmt.execution_options(yield_per=chunk_size), compiled.params)
+                for partition in result.partitions():
+                    yield serializer.chunk(partition, typed)
+        except Exception as e:
+            logger.error("Failed to stream records", table=table_name, error=str(e))
+            yield {"success": False, "message": f"Failed to stream records: {str(e)}"}
+
+    # ================================
+    # Batch Operations
+    # ================================
+
+    def _chunks(self, items: List[Any]) -> Iterator[List[Any]]:
+        size = settings.batch_chunk_size
+        for start in range(0, len(items), size):
+            yield items[start:start + size]
+
+    def _split_valid_rows(self, model_class, rows: List[Dict[str, Any]]):
+        """Separate rows with unknown columns from the ones that can be written"""
+        valid, errors = [], []
+        for index, row in enumerate(rows):
+            unknown = self._unknown_columns(model_class, row)
+            if unknown:
+                errors.append({"index": index, "message": f"Unknown column(s): {', '.join(unknown)}"})
+            else:
+                valid.append((index, row))
+        return valid, errors
+
+    def _generated_id_step(self, session: Session) -> Optional[int]:
+        """Spacing of the ids one multi-row INSERT generates, or None when they can't be derived
+
+        InnoDB gives a multi-row INSERT of a known row count one block of ids
+        in lock modes 0 and 1. Under mode 2 (interleaved, the MySQL 8 default)
+        concurrent inserts can take ids from the middle of that range. Other
+        dialects without RETURNING are not asked.
+        """
+        if session.get_bind().dialect.name != "mysql":
+            return None
+        increment, lock_mode = session.execute(
+            text("SELECT @@auto_increment_increment, @@innodb_autoinc_lock_mode")
+        ).one()
+        return int(increment) if int(lock_mode) in (0, 1) else None
+
+    def _insert_chunk(self, session: Session, model_class, rows: List[Dict[str, Any]],
+                      id_step: Optional[int] = None) -> List[int]:
+        """Insert rows sharing one key set and return their ids in order
+
+        Without RETURNING, rows that need generated ids go in one multi-row
+        INSERT only when ``id_step`` says how the block is spaced; the ids run
+        from LAST_INSERT_ID() in steps of ``id_step``. Otherwise each row is
+        inserted on its own and keeps its own lastrowid.
+        """
+        if session.get_bind().dialect.insert_executemany_returning:
+            stmt = insert(model_class).returning(model_class.id, sort_by_parameter_order=True)
+            return list(session.scalars(stmt, rows))
+
+        table = model_class.__table__
+        if "id" in rows[0]:
+            session.execute(insert(table).values(rows))
+            return [row["id"] for row in rows]
+        if id_step is None:
+            return [session.execute(insert(table).values(row)).lastrowid for row in rows]
+        result = session.execute(insert(table).values(rows))
+        return list(range(result.lastrowid, result.lastrowid + id_step * len(rows), id_step))
+
+    def batch_create_records(self, table_name: str, rows: List[Dict[str, Any]]) -> Dict[str, Any]:
+        """Create many records in one transaction using multi-row INSERTs"""
+        try:
+            model_class = self.get_model_class(table_name)
+            if not model_class:
+                return {"success": False, "message": f"Table {table_name} not found"}
+
+            valid, errors = self._split_valid_rows(model_class, rows)
+            record_ids = [0] * len(rows)
+
+            # Rows with different key sets cannot share a VALUES list
+            groups: Dict[frozenset, List[Any]] = {}
+            for index, row in valid:
+                groups.setdefault(frozenset(row), []).append((index, row))
+
+            with self._session_scope() as session:
+                id_step = None
+                if groups and not session.get_bind().dialect.insert_executemany_returning:
+                    id_step = self._generated_id_step(session)
+                for group in groups.values():
+                    for chunk in self._chunks(group):
+                        ids = self._insert_chunk(session, model_class, [row for _, row in chunk], id_step)
+                        for (index, _), record_id in zip(chunk, ids):
+                            record_ids[index] = record_id
+                session.commit()
+            self._after_write(table_name)
+
+            logger.info("Records batch created", table=table_name, count=len(valid), errors=len(errors))
+            return {
+                "success": True,
+                "message": f"Created {len(valid)} of {len(rows)} records",
+                "record_ids": record_ids,
+                "errors": errors
+            }
+        except Exception as e:
+            logger.error("Failed to batch create records", table=table_name, error=str(e))
+            return {"success": False, "message": f"Failed to batch create records: {str(e)}"}
+
+    def _existing_ids(self, session: Session, model_class, record_ids: List[int]) -> set:
+        existing = set()
+        for chunk in self._chunks(record_ids):
+            existing.update(session.scalars(select(model_class.id).where(model_class.id.in_(chunk))))
+        return existing
+
+    def batch_update_records(self, table_name: str, updates: List[Dict[str, Any]]) -> Dict[str, Any]:
+        """Update many records by id in one transaction using executemany UPDATEs
+
+        Each update is a dict of column values that includes the row ``id``.
+        """
+        pending = self._take_pending(table_name, self._row_ids(updates))
+        result = self._batch_update_records(table_name, updates, pending)
+        self._requeue_pending(table_name, pending)
+        return result
+
+    def _batch_update_records(self, table_name: str, updates: List[Dict[str, Any]],
+                              pending: Dict[int, Dict[str, Any]]) -> Dict[str, Any]:
+        """Entries of ``pending`` are removed once their rows are written; the caller requeues the rest"""
+        try:
+            model_class = self.get_model_class(table_name)
+            if not model_class:
+                return {"success": False, "message": f"Table {table_name} not found"}
+
+            valid, errors = self._split_valid_rows(model_class, updates)
+
+            with self._session_scope() as session:
+                existing = self._existing_ids(session, model_class, [row["id"] for _, row in valid])
+                rows = []
+                for index, row in valid:
+                    if row["id"] in existing:
+                        rows.append({**pending.get(row["id"], {}), **row})
+                    else:
+                        errors.append({"index": index, "message": "Record not found"})
+
+                # ORM bulk UPDATE by primary key batches rows into executemany calls
+                for chunk in self._chunks(rows):
+                    session.execute(update(model_class), chunk)
+                session.commit()
+            self._after_write(table_name)
+            for row in rows:
+                pending.pop(row["id"], None)
+
+            errors.sort(key=lambda error: error["index"])
+            logger.info("Records batch updated", table=table_name, count=len(rows), errors=len(errors))
+            return {
+                "success": True,
+                "message": f"Updated {len(rows)} of {len(updates)} records",
+                "affected_count": len(rows),
+                "errors": errors
+            }
+        except Exception as e:
+            logger.error("Failed to batch update records", table=table_name, error=str(e))
+            return {"success": False, "message": f"Failed to batch update records: {str(e)}"}
+
+    def batch_delete_records(self, table_name: str, record_ids: List[int]) -> Dict[str, Any]:
+        """Delete many records by id in one transaction using DELETE ... WHERE id IN (...)"""
+        self._take_pending(table_name, record_ids)
+        return self._batch_delete_records(table_name, record_ids)
+
+    def _batch_delete_records(self, table_name: str, record_ids: List[int]) -> Dict[str, Any]:
+        try:
+            model_class = self.get_model_class(table_name)
+            if not model_class:
+                return {"success": False, "message": f"Table {table_name} not found"}
+
+            table = model_class.__table__
+            with self._session_scope() as session:
+                existing = self._existing_ids(session, model_class, record_ids)
+                for chunk in self._chunks(list(existing)):
+                    session.execute(delete(table).where(table.c.id.in_(chunk)))
+                session.commit()
+            self._after_write(table_name)
+
+            errors = [
+                {"index": index, "message": "Record not found"}
+                for index, record_id in enumerate(record_ids) if record_id not in existing
+            ]
+            logger.info("Records batch deleted", table=table_name, count=len(existing), errors=len(errors))
+            return {
+                "success": True,
+                "message": f"Deleted {len(existing)} of {len(record_ids)} records",
+                "affected_count": len(existing),
+                "errors": errors
+            }
+        except Exception as e:
+            logger.error("Failed to batch delete records", table=table_name, error=str(e))
+            return {"success": False, "message": f"Failed to batch delete records: {str(e)}"}
+
+    def _write_appended(self, table_name: str, rows: List[Dict[str, Any]]):
+        """Insert a batch of ingested rows in one transaction, one executemany per key set"""
+        table = self.get_model_class(table_name).__table__
+        groups: Dict[frozenset, List[Dict[str, Any]]] = {}
+        for row in rows:
+            groups.setdefault(frozenset(row), []).append(row)
+
+        with self._session_scope() as session:
+            for group in groups.values():
+                for chunk in self._chunks(group):
+                    session.execute(insert(table), chunk)
+            session.commit()
+        self._after_write(table_name)
+
+    def _queue_append(self, table_name: str, rows: List[Dict[str, Any]], offset: int,
+                      errors: List[Dict[str, Any]]) -> Optional[IngestTicket]:
+        """Validate one AppendRecords message and hand its rows to the ingest writer"""
+        model_class = self.get_model_class(table_name)
+        if not model_class or table_name not in self.ingest_writer.tables:
+            raise ValueError(f"Table {table_name} does not accept appends")
+
+        valid, row_errors = self._split_valid_rows(model_class, rows)
+        errors.extend({"index": offset + error["index"], "message": error["message"]} for error in row_errors)
+        if not valid:
+            return None
+        return self.ingest_writer.submit(
+            table_name, [row for _, row in valid], [offset + index for index, _ in valid],
+            settings.ingest_enqueue_timeout
+        )
+
+    def _append_result(self, received: int, tickets: List[IngestTicket], errors: List[Dict[str, Any]],
+                       wait_committed: bool, failure: Optional[str] = None) -> Dict[str, Any]:
+        accepted = sum(len(ticket.indexes) for ticket in tickets)
+        committed = 0
+        if wait_committed:
+            for ticket in tickets:
+                if ticket.wait():
+                    committed += len(ticket.indexes)
+                else:
+                    errors.extend({"index": index, "message": ticket.error} for index in ticket.indexes)
+        errors.sort(key=lambda error: error["index"])
+
+        if failure:
+            message = failure
+        elif wait_committed:
+            message = f"Committed {committed} of {received} records"
+        else:
+            message = f"Queued {accepted} of {received} records"
+        return {
+            "success": failure is None,
+            "message": message,
+            "received_count": received,
+            "accepted_count": accepted,
+            "committed_count": committed,
+            "errors": errors
+        }
+
+    def append_records(self, batches: Iterable[Tuple[str, List[Dict[str, Any]]]], wait_committed: bool = False) -> Dict[str, Any]:
+        """Queue rows from an AppendRecords stream for the background ingest writer
+
+        ``batches`` yields ``(table_name, rows)`` per stream message. Rows are
+        acknowledged once queued, or with ``wait_committed`` once the writer
+        has committed them. While the queue is full this blocks, which slows
+        the client's stream down; if no room frees up within
+        ``ingest_enqueue_timeout`` the call fails and reports how many rows
+        were received so the client can resend the rest.
+        """
+        received, tickets, errors = 0, [], []
+        try:
+            for table_name, rows in batches:
+                ticket = self._queue_append(table_name, rows, received, errors)
+                if ticket is not None:
+                    tickets.append(ticket)
+                received += len(rows)
+        except IngestQueueFull as e:
+            logger.warning("Append stream stopped", received=received, error=str(e))
+            return self._append_result(received, tickets, errors, wait_committed, f"{e}; resend from row {received}")
+        except Exception as e:
+            logger.error("Failed to append records", received=received, error=str(e))
+            return self._append_result(received, tickets, errors, wait_committed, f"Failed to append records: {str(e)}")
+        return self._append_result(received, tickets, errors, wait_committed)
+
+    def get_metering_rollups(self, source_table: Optional[str] = None, start_day: Optional[str] = None,
+                             end_day: Optional[str] = None, partition_id: Optional[str] = None) -> Dict[str, Any]:
+        """Read per-day IQ metering totals for days in [start_day, end_day) from the rollup table"""
+        try:
+            start = date.fromisoformat(start_day) if start_day else None
+            end = date.fromisoformat(end_day) if end_day else None
+            with self._session_scope() as session:
+                rows = query_rollups(session, source_table, start, end, partition_id)
+            for row in rows:
+                row["day"] = row["day"].isoformat()
+            return {"success": True, "message": f"Found {len(rows)} rollup rows", "rows": rows}
+        except Exception as e:
+            logger.error("Failed to read metering rollups", error=str(e))
+            return {"success": False, "message": f"Failed to read metering rollups: {str(e)}"}
+
+    def get_index_advice(self, table_name: Optional[str] = None) -> Dict[str, Any]:
+        """Slow ListRecords filter shapes with their plans and the indexes that would serve them"""
+        try:
+            if table_name and not self.get_model_class(table_name):
+                return {"success": False, "message": f"Table {table_name} not found"}
+            with self._session_scope() as session:
+                advice = self.index_advisor.advise(session, self.table_mapping, table_name)
+            missing = sum(1 for item in advice if item["suggested_index"])
+            return {
+                "success": True,
+                "message": f"{len(advice)} slow filter shapes, {missing} without a usable index",
+                "advice": advice,
+                "migration_stub": migration_stub(advice)
+            }
+        except Exception as e:
+            logger.error("Failed to build index advice", error=str(e))
+            return {"success": False, "message": f"Failed to build index advice: {str(e)}"}
+
+    def _upsert_statement(self, dialect_name: str, table, rows: List[Dict[str, Any]],
+                          conflict_columns: List[str], update_columns: List[str]):
+        """Multi-row INSERT that updates ``update_columns`` when a row already exists"""
+        if dialect_name not in UPSERT_INSERTS:
+            raise ValueError(f"Upsert is not supported on {dialect_name}")
+        stmt = UPSERT_INSERTS[dialect_name](table).values(rows)
+
+        if dialect_name == "mysql":
+            # ON DUPLICATE KEY UPDATE fires on any unique key; with nothing to
+            # update, a self-assignment keeps the existing row untouched
+            if not update_columns:
+                return stmt.on_duplicate_key_update({"id": table.c.id})
+            return stmt.on_duplicate_key_update({column: stmt.inserted[column] for column in update_columns})
+
+        if not update_columns:
+            return stmt.on_conflict_do_nothing(index_elements=conflict_columns)
+        return stmt.on_conflict_do_update(
+            index_elements=conflict_columns,
+            set_={column: stmt.excluded[column] for column in update_columns}
+        )
+
+    def upsert_records(self, table_name: str, rows: List[Dict[str, Any]], conflict_columns: List[str],
+                       update_columns: Optional[List[str]] = None) -> Dict[str, Any]:
+        """Insert rows, or update the ones that already exist, in one transaction
+
+        Rows are matched on ``conflict_columns``, which must be the primary key
+        or a unique key of the table (MySQL matches on any unique key). On a
+        match, ``update_columns`` are overwritten; by default that is every
+        column in the row except the conflict columns and ``id``. Rows with
+        the same keys are sent as multi-row statements using the dialect's
+        native upsert, so there is no read-then-write race.
+
+        Coalesced values buffered for rows that carry an ``id`` are drained
+        first; the ones the upsert didn't overwrite are buffered again.
+        """
+        pending = self._take_pending(table_name, self._row_ids(rows))
+        result = self._upsert_records(table_name, rows, conflict_columns, update_columns)
+        self._requeue_pending(
+            table_name, self._pending_after_upsert(rows, pending, conflict_columns, update_columns, result)
+        )
+        return result
+
+    def _pending_after_upsert(self, rows: List[Dict[str, Any]], pending: Dict[int, Dict[str, Any]],
+                              conflict_columns: List[str], update_columns: Optional[List[str]],
+                              result: Dict[str, Any]) -> Dict[int, Dict[str, Any]]:
+        """Drained values an upsert did not overwrite, which still have to be written"""
+        if not pending or not result["success"]:
+            return pending
+        rejected = {error["index"] for error in result["errors"]}
+        remaining = {record_id: dict(values) for record_id, values in pending.items()}
+        for index, row in enumerate(rows):
+            record_id = row.get("id")
+            if index in rejected or not isinstance(record_id, int) or record_id not in remaining:
+                continue
+            if update_columns:
+                written = [column for column in update_columns if column in row]
+            else:
+                written = [column for column in row if column not in conflict_columns and column != "id"]
+            for column in written:
+                remaining[record_id].pop(column, None)
+        return {record_id: values for record_id, values in remaining.items() if values}
+
+    def _upsert_records(self, table_name: str, rows: List[Dict[str, Any]], conflict_columns: List[str],
+                        update_columns: Optional[List[str]] = None) -> Dict[str, Any]:
+        try:
+            model_class = self.get_model_class(table_name)
+            if not model_class:
+                return {"success": False, "message": f"Table {table_name} not found"}
+            if not conflict_columns:
+                return {"success": False, "message": "conflict_columns is required"}
+
+            unknown = sorted((set(conflict_columns) | set(update_columns or ())) - self.column_names[model_class])
+            if unknown:
+                return {"success": False, "message": f"Unknown column(s): {', '.join(unknown)}"}
+
+            valid, errors = self._split_valid_rows(model_class, rows)
+            groups: Dict[frozenset, List[Dict[str, Any]]] = {}
+            for index, row in valid:
+                missing = [column for column in conflict_columns if column not in row]
+                if missing:
+                    errors.append({"index": index, "message": f"Missing conflict column(s): {', '.join(missing)}"})
+                else:
+                    groups.setdefault(frozenset(row), []).append(row)
+
+            table = model_class.__table__
+            with self._session_scope() as session:
+                dialect_name = session.get_bind().dialect.name
+                for keys, group in groups.items():
+                    if update_columns:
+                        columns = [column for column in update_columns if column in keys]
+                    else:
+                        columns = sorted(keys - set(conflict_columns) - {"id"})
+                    for chunk in self._chunks(group):
+                        session.execute(self._upsert_statement(dialect_name, table, chunk, conflict_columns, columns))
+                session.commit()
+            self._after_write(table_name)
+
+            count = sum(len(group) for group in groups.values())
+            errors.sort(key=lambda error: error["index"])
+            logger.info("Records upserted", table=table_name, count=count, errors=len(errors))
+            return {
+                "success": True,
+                "message": f"Upserted {count} of {len(rows)} records",
+                "affected_count": count,
+                "errors": errors
+            }
+        except Exception as e:
+            logger.error("Failed to upsert records", table=table_name, error=str(e))
+            return {"success": False, "message": f"Failed to upsert records: {str(e)}"}
+
     def run_migration(self, direction: str = "upgrade", target_revision: Optional[str] = None) -> Dict[str, Any]:
         """Run database migrations"""
         try:
@@ -0,0 +1,217 @@
+# ================================
+# app/services/filters.py
+"""Structured filters for ListRecords / ListRecordsStream.
+
+A filter is a JSON object keyed by column name::
+
+    {"email": "a@b.com"}                          equality
+    {"status": {"in": ["NEW", "DONE"]}}           IN ({"status": ["NEW", "DONE"]} too)
+    {"created_at": {"gte": "2024-01-01", "lt": "2024-02-01"}}
+    {"segy_path": {"prefix": "s3://bucket/"}}     LIKE 'prefix%'
+    {"deleted_at": null}                          IS NULL ({"ne": null} for IS NOT NULL)
+    {"or": [{"status": "NEW"}, {"retries": {"gt": 3}}]}
+    {"order_by": ["-created_at", "id"]}           top level only
+
+Keys of one object are ANDed. Values are always sent as bound parameters,
+and the SQLAlchemy clause for each filter *shape* (columns and operators,
+not values) is built once and cached, so repeated lookups hit the same
+compiled statement. Strings that are not JSON objects are treated as the
+legacy raw SQL filter when ``allow_sql_filters`` is on (off by default).
+"""
+import itertools
+import json
+import operator
+from datetime import datetime
+from functools import lru_cache
+from typing import Any, Dict, List, NamedTuple, Optional, Tuple
+
+from sqlalchemy import DateTime, and_, bindparam, or_, text
+from sqlalchemy.sql.elements import ColumnElement
+
+from ..config import settings
+
+_COMPARISONS = {
+    "eq": operator.eq,
+    "ne": operator.ne,
+    "gt": operator.gt,
+    "gte": operator.ge,
+    "lt": operator.lt,
+    "lte": operator.le,
+}
+
+
+class FilterError(ValueError):
+    """Raised for filters that do not match the grammar or the table"""
+
+
+class FilterShape(NamedTuple):
+    """Columns a filter can use an index for, by how they are compared"""
+    equality: Tuple[str, ...]  # eq, in, IS NULL
+    ranges: Tuple[str, ...]  # gt/gte/lt/lte and prefix
+    order: Tuple[str, ...]
+
+
+class CompiledFilter(NamedTuple):
+    where: Optional[ColumnElement]
+    order_by: Tuple[ColumnElement, ...]
+    params: Dict[str, Any]
+    # None for raw SQL filters, whose columns are unknown
+    shape: Optional[FilterShape] = None
+
+
+_NO_FILTER = CompiledFilter(None, (), {}, FilterShape((), (), ()))
+
+
+def _coerce(column, value: Any) -> Any:
+    if isinstance(value, str) and isinstance(column.type, DateTime):
+        try:
+            return datetime.fromisoformat(value)
+        except ValueError:
+            raise FilterError(f"Invalid datetime for {column.name}: {value}")
+    return value
+
+
+def _escape_like(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+
+
+def _shape(table, node: Any, values: List[Any]) -> Tuple:
+    """Reduce a filter object to a hashable shape, collecting its values in order"""
+    if not isinstance(node, dict):
+        raise FilterError("Filter conditions must be JSON objects")
+
+    parts = []
+    for key, condition in node.items():
+        if key in ("and", "or"):
+            if not isinstance(condition, list) or not condition:
+                raise FilterError(f"'{key}' expects a non-empty list of conditions")
+            parts.append((key, tuple(_shape(table, child, values) for child in condition)))
+            continue
+
+        column = table.c.get(key)
+        if column is None:
+            raise FilterError(f"Unknown column: {key}")
+        if isinstance(condition, list):
+            condition = {"in": condition}
+        elif not isinstance(condition, dict):
+            condition = {"eq": condition}
+
+        for op, value in condition.items():
+            if op in ("eq", "ne") and value is None:
+                parts.append(("is_null", key, op == "eq"))
+            elif op == "is_null":
+                parts.append(("is_null", key, bool(value)))
+            elif op == "in":
+                if not isinstance(value, list) or not value:
+                    raise FilterError(f"'in' on {key} expects a non-empty list")
+                values.append([_coerce(column, item) for item in value])
+                parts.append(("in", key))
+            elif op == "prefix":
+                if not isinstance(value, str):
+                    raise FilterError(f"'prefix' on {key} expects a string")
+                values.append(_escape_like(value) + "%")
+                parts.append(("prefix", key))
+            elif op in _COMPARISONS:
+                if isinstance(value, (list, dict)):
+                    raise FilterError(f"'{op}' on {key} expects a single value; use 'in' for a list")
+                values.append(_coerce(column, value))
+                parts.append((op, key))
+            else:
+                raise FilterError(f"Unknown operator: {op}")
+    return ("and", tuple(parts))
+
+
+def _order_shape(table, order_by: Any) -> Tuple[Tuple[str, bool], ...]:
+    if isinstance(order_by, str):
+        order_by = [order_by]
+    if not isinstance(order_by, list):
+        raise FilterError("'order_by' expects a column name or a list of them")
+
+    shape = []
+    for item in order_by:
+        if not isinstance(item, str) or not item.lstrip("-"):
+            raise FilterError("'order_by' entries must be column names")
+        name = item.lstrip("-")
+        if name not in table.c:
+            raise FilterError(f"Unknown column: {name}")
+        shape.append((name, item.startswith("-")))
+    return tuple(shape)
+
+
+def _build(table, shape: Tuple, names) -> Optional[ColumnElement]:
+    kind = shape[0]
+    if kind in ("and", "or"):
+        clauses = [clause for clause in (_build(table, child, names) for child in shape[1]) if clause is not None]
+        if not clauses:
+            return None
+        return and_(*clauses) if kind == "and" else or_(*clauses)
+
+    column = table.c[shape[1]]
+    if kind == "is_null":
+        return column.is_(None) if shape[2] else column.is_not(None)
+
+    param = bindparam(next(names), type_=column.type, expanding=kind == "in")
+    if kind == "in":
+        return column.in_(param)
+    if kind == "prefix":
+        return column.like(param, escape="\\")
+    return _COMPARISONS[kind](column, param)
+
+
+def _index_columns(shape: Tuple, equality: List[str], ranges: List[str]):
+    """Collect the ANDed comparisons an index could serve; OR branches are skipped"""
+    if shape[0] == "or":
+        return
+    for part in shape[1]:
+        kind = part[0]
+        if kind in ("and", "or"):
+            _index_columns(part, equality, ranges)
+            continue
+        column = part[1]
+        if kind in ("eq", "in") or (kind == "is_null" and part[2]):
+            if column not in equality:
+                equality.append(column)
+        elif kind in ("gt", "gte", "lt", "lte", "prefix") and column not in ranges:
+            ranges.append(column)
+
+
+@lru_cache(maxsize=1024)
+def _compile_shape(model_class, shape: Tuple, order_shape: Tuple) -> Tuple[Optional[ColumnElement], Tuple, FilterShape]:
+    table = model_class.__table__
+    names = (f"f{index}" for index in itertools.count())
+    where = _build(table, shape, names)
+    order_by = tuple(table.c[name].desc() if descending else table.c[name].asc() for name, descending in order_shape)
+
+    equality: List[str] = []
+    ranges: List[str] = []
+    _index_columns(shape, equality, ranges)
+    index_shape = FilterShape(
+        tuple(equality), tuple(column for column in ranges if column not in equality),
+        tuple(name for name, _ in order_shape)
+    )
+    return where, order_by, index_shape
+
+
+def compile_filter(model_class, filter_conditions: Optional[str]) -> CompiledFilter:
+    """Compile a ListRecords filter string for ``model_class``"""
+    if not filter_conditions or not filter_conditions.strip():
+        return _NO_FILTER
+
+    if not filter_conditions.lstrip().startswith("{"):
+        if not settings.allow_sql_filters:
+            raise FilterError("Raw SQL filters are disabled; use a JSON filter")
+        return CompiledFilter(text(filter_conditions), (), {})
+
+    try:
+        spec = json.loads(filter_conditions)
+    except ValueError as e:
+        raise FilterError(f"Invalid JSON filter: {e}")
+
+    table = model_class.__table__
+    order_shape = _order_shape(table, spec.pop("order_by")) if "order_by" in spec else ()
+    values: List[Any] = []
+    shape = _shape(table, spec, values)
+
+    where, order_by, index_shape = _compile_shape(model_class, shape, order_shape)
+    params = {f"f{index}": value for index, value in enumerate(values)}
+    return CompiledFilter(where, order_by, params, index_shape)
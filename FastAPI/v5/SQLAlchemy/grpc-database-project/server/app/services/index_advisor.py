@@ -0,0 +1,230 @@
+# ================================
+# app/services/index_advisor.py
+import threading
+from typing import Any, Dict, List, NamedTuple, Optional
+
+import structlog
+from sqlalchemy import JSON, LargeBinary, Text, inspect, select
+from sqlalchemy.orm import Session
+
+from ..config import settings
+from .filters import CompiledFilter, FilterShape
+
+logger = structlog.get_logger()
+
+# MySQL's identifier limit, the shortest of the supported dialects
+MAX_INDEX_NAME = 64
+
+# Columns suggested for one index at most
+MAX_INDEX_COLUMNS = 3
+
+EXPLAIN_PREFIXES = {"mysql": "EXPLAIN ", "postgresql": "EXPLAIN ", "sqlite": "EXPLAIN QUERY PLAN "}
+
+
+def explain(session: Session, stmt) -> List[Dict[str, Any]]:
+    """Plan rows for a statement with bound values, or [] on dialects without EXPLAIN support"""
+    dialect = session.get_bind().dialect
+    prefix = EXPLAIN_PREFIXES.get(dialect.name)
+    if prefix is None:
+        return []
+    sql = stmt.compile(dialect=dialect, compile_kwargs={"render_postcompile": True})
+    params = tuple(sql.params[name] for name in sql.positiontup) if sql.positional else sql.params
+    rows = session.connection().exec_driver_sql(f"{prefix}{sql.string}", params).mappings().all()
+    return [dict(row) for row in rows]
+
+
+class PlanSummary(NamedTuple):
+    full_scan: bool
+    index: str
+    detail: str
+
+
+def summarize_plan(dialect_name: str, table_name: str, plan: List[Dict[str, Any]]) -> Optional[PlanSummary]:
+    """Whether the plan reads ``table_name`` with a full scan, and which index it uses otherwise"""
+    if not plan:
+        return None
+    if dialect_name == "mysql":
+        for row in plan:
+            if row.get("table") == table_name:
+                detail = f"type={row.get('type')} key={row.get('key')} rows={row.get('rows')}"
+                return PlanSummary(row.get("type") == "ALL", row.get("key") or "", detail)
+        return None
+    if dialect_name == "sqlite":
+        details = [str(row.get("detail", "")) for row in plan]
+        for detail in details:
+            if detail in (f"SCAN {table_name}", f"SCAN TABLE {table_name}"):
+                return PlanSummary(True, "", "; ".join(details))
+        for detail in details:
+            if " INDEX " in f"{detail} ":
+                index = detail.split(" INDEX ", 1)[1].split(" ", 1)[0]
+                return PlanSummary(False, index, "; ".join(details))
+            if "PRIMARY KEY" in detail:
+                return PlanSummary(False, "PRIMARY", "; ".join(details))
+        return PlanSummary(False, "", "; ".join(details))
+    lines = [str(next(iter(row.values()), "")) for row in plan]
+    full_scan = any(f"Seq Scan on {table_name}" in line for line in lines)
+    index = next((line.split(" using ", 1)[1].split(" ", 1)[0] for line in lines if " using " in line), "")
+    return PlanSummary(full_scan, index, "; ".join(line.strip() for line in lines))
+
+
+class ShapeStats:
+    def __init__(self):
+        self.calls = 0
+        self.slow_calls = 0
+        self.total_ms = 0.0
+        self.max_ms = 0.0
+        # Filter of the slowest call, replayed under EXPLAIN
+        self.sample: Optional[CompiledFilter] = None
+
+
+class IndexAdvisor:
+    """Tracks the filter/order shapes ListRecords runs and suggests missing indexes.
+
+    ``record`` keeps call counts and timings per (table, shape), where the
+    shape is the columns a filter compares and orders by, not the values.
+    Calls over ``slow_ms`` count as slow, and the slowest call of each shape
+    is kept so ``advise`` can run it under EXPLAIN. A shape gets a suggested
+    index when its plan reads the whole table, or, on dialects without a
+    supported EXPLAIN, when no existing index leads with one of its columns.
+    """
+
+    def __init__(self, slow_ms: float, max_shapes_per_table: int):
+        self.slow_ms = slow_ms
+        self.max_shapes_per_table = max_shapes_per_table
+        self._lock = threading.Lock()
+        self._tables: Dict[str, Dict[FilterShape, ShapeStats]] = {}
+
+    @classmethod
+    def from_settings(cls) -> "IndexAdvisor":
+        return cls(settings.index_advisor_slow_ms, settings.index_advisor_max_shapes)
+
+    @property
+    def enabled(self) -> bool:
+        return self.slow_ms > 0
+
+    def record(self, table_name: str, compiled: CompiledFilter, elapsed_ms: float):
+        shape = compiled.shape
+        # Unfiltered pages walk the primary key; raw SQL filters have no known shape
+        if not self.enabled or shape is None or not any(shape):
+            return
+        slow = elapsed_ms >= self.slow_ms
+        with self._lock:
+            shapes = self._tables.setdefault(table_name, {})
+            stats = shapes.get(shape)
+            if stats is None:
+                if len(shapes) >= self.max_shapes_per_table:
+                    shapes.pop(next(iter(shapes)))
+                stats = shapes[shape] = ShapeStats()
+            stats.calls += 1
+            stats.total_ms += elapsed_ms
+            if slow:
+                stats.slow_calls += 1
+            if elapsed_ms >= stats.max_ms:
+                stats.max_ms = elapsed_ms
+                stats.sample = compiled
+            first_slow = slow and stats.slow_calls == 1
+        if first_slow:
+            logger.warning("Slow list_records filter shape", table=table_name, elapsed_ms=round(elapsed_ms, 1),
+                           equality=list(shape.equality), ranges=list(shape.ranges), order=list(shape.order))
+
+    def advise(self, session: Session, models: Dict[str, Any], table_name: Optional[str] = None) -> List[Dict[str, Any]]:
+        """One entry per slow shape, slowest first"""
+        with self._lock:
+            slow = [
+                (name, shape, stats.calls, stats.slow_calls, stats.total_ms, stats.max_ms, stats.sample)
+                for name, shapes in self._tables.items() if table_name in (None, name)
+                for shape, stats in shapes.items() if stats.slow_calls
+            ]
+
+        dialect_name = session.get_bind().dialect.name
+        inspector = inspect(session.connection())
+        indexes: Dict[str, List[List[str]]] = {}
+        advice = []
+        for name, shape, calls, slow_calls, total_ms, max_ms, sample in sorted(slow, key=lambda item: -item[5]):
+            model_class = models.get(name)
+            if model_class is None:
+                continue
+            if name not in indexes:
+                indexes[name] = self._existing_indexes(inspector, model_class)
+
+            summary = None
+            try:
+                summary = summarize_plan(dialect_name, name, explain(session, self._sample_statement(model_class, sample)))
+            except Exception as e:
+                logger.warning("EXPLAIN failed for filter shape", table=name, error=str(e))
+
+            if summary is not None:
+                missing = summary.full_scan
+            else:
+                missing = not self._covered(shape, indexes[name])
+            columns = self._candidate_columns(model_class, shape) if missing else []
+
+            advice.append({
+                "table_name": name,
+                "equality_columns": list(shape.equality),
+                "range_columns": list(shape.ranges),
+                "order_columns": list(shape.order),
+                "calls": calls,
+                "slow_calls": slow_calls,
+                "avg_ms": total_ms / calls,
+                "max_ms": max_ms,
+                "full_scan": summary.full_scan if summary else missing,
+                "plan": summary.detail if summary else "",
+                "index_used": summary.index if summary else "",
+                "suggested_index": self._index_name(name, columns) if columns else "",
+                "suggested_columns": columns,
+            })
+        return advice
+
+    def _sample_statement(self, model_class, sample: CompiledFilter):
+        table = model_class.__table__
+        stmt = select(table)
+        if sample.where is not None:
+            stmt = stmt.where(sample.where)
+        return stmt.order_by(*sample.order_by, table.c.id).limit(settings.max_page_size).params(sample.params)
+
+    def _existing_indexes(self, inspector, model_class) -> List[List[str]]:
+        table = model_class.__table__
+        columns = [list(table.primary_key.columns.keys())]
+        columns += [[column.name for column in index.columns] for index in table.indexes]
+        try:
+            reflected = inspector.get_indexes(table.name) + inspector.get_unique_constraints(table.name)
+            columns += [index["column_names"] for index in reflected]
+        except Exception as e:
+            logger.debug("Could not reflect indexes", table=table.name, error=str(e))
+        return [index for index in columns if index]
+
+    def _covered(self, shape: FilterShape, indexes: List[List[str]]) -> bool:
+        leading = set(shape.equality) | set(shape.ranges) | set(shape.order[:1])
+        return any(index[0] in leading for index in indexes)
+
+    def _candidate_columns(self, model_class, shape: FilterShape) -> List[str]:
+        """Equality columns first, then one range column, or the sort columns when there is none"""
+        columns = list(shape.equality) + list(shape.ranges[:1] if shape.ranges else shape.order)
+        table = model_class.__table__
+        candidates = []
+        for name in columns:
+            # Long text columns cannot be indexed without a prefix length
+            if name == "id" or name in candidates or isinstance(table.c[name].type, (Text, JSON, LargeBinary)):
+                continue
+            candidates.append(name)
+        return candidates[:MAX_INDEX_COLUMNS]
+
+    def _index_name(self, table_name: str, columns: List[str]) -> str:
+        return f"ix_{table_name}_{'_'.join(columns)}"[:MAX_INDEX_NAME]
+
+
+def migration_stub(advice: List[Dict[str, Any]]) -> str:
+    """Alembic upgrade/downgrade bodies creating the suggested indexes"""
+    suggestions = {}
+    for item in advice:
+        if item["suggested_index"]:
+            suggestions[item["suggested_index"]] = (item["table_name"], item["suggested_columns"])
+    if not suggestions:
+        return ""
+
+    upgrade = [f"    op.create_index({name!r}, {table_name!r}, {columns!r})"
+               for name, (table_name, columns) in suggestions.items()]
+    downgrade = [f"    op.drop_index({name!r}, table_name={table_name!r})"
+                 for name, (table_name, _) in reversed(list(suggestions.items()))]
+    return "\n".join(["def upgrade() -> None:", *upgrade, "", "", "def downgrade() -> None:", *downgrade, ""])
@@ -0,0 +1,160 @@
+# ================================
+# app/services/ingest_writer.py
+import atexit
+import threading
+import time
+from collections import deque
+from typing import Any, Callable, Deque, Dict, List, Optional, Tuple
+
+import structlog
+
+from ..config import settings
+
+logger = structlog.get_logger()
+
+WriteFunction = Callable[[str, List[Dict[str, Any]]], None]
+
+
+class IngestQueueFull(Exception):
+    """Raised when rows could not be queued within the enqueue timeout"""
+
+
+class IngestTicket:
+    """Tracks one queued AppendRecords message until its rows are committed"""
+
+    def __init__(self, indexes: List[int]):
+        self.indexes = indexes
+        self.error: Optional[str] = None
+        self._done = threading.Event()
+
+    @property
+    def done(self) -> bool:
+        return self._done.is_set()
+
+    def resolve(self, error: Optional[str] = None):
+        self.error = error
+        self._done.set()
+
+    def wait(self) -> bool:
+        """Block until the rows are written; False if the write failed"""
+        self._done.wait()
+        return self.error is None
+
+
+class IngestWriter:
+    """Bounded queue drained by a background thread in multi-row INSERT batches.
+
+    Producers block in ``submit`` while the queue holds ``max_queued_rows``
+    rows, which stops the RPC from reading its stream and lets HTTP/2 flow
+    control push back on the client. The writer takes up to ``batch_rows``
+    rows at a time, waiting at most ``max_latency`` seconds for a batch to
+    fill, and commits each table's rows in one transaction. If a batch
+    fails, its messages are retried one by one so a bad message only fails
+    its own ticket.
+    """
+
+    def __init__(self, tables: List[str], write: WriteFunction, max_queued_rows: int,
+                 batch_rows: int, max_latency: float):
+        self.tables = set(tables)
+        self._write = write
+        self.max_queued_rows = max_queued_rows
+        self.batch_rows = batch_rows
+        self.max_latency = max_latency
+        self._cond = threading.Condition()
+        self._queue: Deque[Tuple[str, List[Dict[str, Any]], IngestTicket]] = deque()
+        self._queued_rows = 0
+        self._thread: Optional[threading.Thread] = None
+
+    @classmethod
+    def from_settings(cls, write: WriteFunction) -> "IngestWriter":
+        tables = [table.strip() for table in settings.ingest_tables.split(",") if table.strip()]
+        return cls(tables, write, settings.ingest_queue_rows, settings.ingest_batch_rows,
+                   settings.ingest_max_latency_ms / 1000)
+
+    def submit(self, table_name: str, rows: List[Dict[str, Any]], indexes: List[int],
+               timeout: float) -> IngestTicket:
+        """Queue rows, waiting up to ``timeout`` seconds for room"""
+        self._start()
+        ticket = IngestTicket(indexes)
+        with self._cond:
+            # A message larger than the whole queue is still accepted once the queue is empty
+            has_room = self._cond.wait_for(
+                lambda: self._queued_rows == 0 or self._queued_rows + len(rows) <= self.max_queued_rows,
+                timeout
+            )
+            if not has_room:
+                raise IngestQueueFull(f"Ingest queue is full ({self._queued_rows} rows)")
+            self._queue.append((table_name, rows, ticket))
+            self._queued_rows += len(rows)
+            self._cond.notify_all()
+        return ticket
+
+    def close(self):
+        """Write out everything still queued"""
+        while True:
+            batch = self._take(wait=False)
+            if not batch:
+                return
+            self._write_batch(batch)
+
+    def _start(self):
+        if self._thread is not None:
+            return
+        with self._cond:
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, name="ingest-writer", daemon=True)
+                self._thread.start()
+                atexit.register(self.close)
+
+    def _take(self, wait: bool = True) -> List[Tuple[str, List[Dict[str, Any]], IngestTicket]]:
+        with self._cond:
+            if wait:
+                self._cond.wait_for(lambda: self._queue)
+                deadline = time.monotonic() + self.max_latency
+                while self._queued_rows < self.batch_rows:
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        break
+                    self._cond.wait(remaining)
+
+            batch, rows = [], 0
+            while self._queue and (not batch or rows + len(self._queue[0][1]) <= self.batch_rows):
+                item = self._queue.popleft()
+                batch.append(item)
+                rows += len(item[1])
+            self._queued_rows -= rows
+            self._cond.notify_all()
+            return batch
+
+    def _write_batch(self, batch: List[Tuple[str, List[Dict[str, Any]], IngestTicket]]):
+        tables: Dict[str, List[Tuple[str, List[Dict[str, Any]], IngestTicket]]] = {}
+        for item in batch:
+            tables.setdefault(item[0], []).append(item)
+
+        for table_name, items in tables.items():
+            try:
+                self._write(table_name, [row for _, rows, _ in items for row in rows])
+            except Exception as e:
+                logger.warning("Ingest batch failed, retrying per message", table=table_name, error=str(e))
+                for _, rows, ticket in items:
+                    try:
+                        self._write(table_name, rows)
+                    except Exception as e:
+                        logger.error("Ingest write failed", table=table_name, rows=len(rows), error=str(e))
+                        ticket.resolve(str(e))
+                    else:
+                        ticket.resolve()
+            else:
+                for _, _, ticket in items:
+                    ticket.resolve()
+
+    def _run(self):
+        while True:
+            batch = self._take()
+            try:
+                self._write_batch(batch)
+            except Exception as e:
+                logger.error("Ingest writer failed", error=str(e))
+                for _, _, ticket in batch:
+                    if not ticket.done:
+                        ticket.resolve(str(e))
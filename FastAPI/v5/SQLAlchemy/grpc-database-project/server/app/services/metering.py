@@ -0,0 +1,197 @@
+# ================================
+# app/services/metering.py
+import threading
+from datetime import date, datetime, timedelta
+from typing import Dict, List, Optional
+
+import structlog
+from sqlalchemy import delete, func, insert, literal, select, text
+from sqlalchemy.orm import Session
+
+from ..config import settings
+from ..database import engine, get_db_session
+from ..models.partitioning import partition_start, partitioning_of, rotate_partitions
+from ..models.tables import (
+    IQMeteringDailyRollup, IQMeteringDataProcessedRecords, IQMeteringEventSummaryRecords, IQMeteringObjectRecords
+)
+
+logger = structlog.get_logger()
+
+# Record tables summarised into iq_metering_daily_rollup
+ROLLUP_SOURCES = {
+    'iq_metering_data_processed_records': IQMeteringDataProcessedRecords,
+    'iq_metering_object_records': IQMeteringObjectRecords,
+}
+
+PARTITIONED_MODELS = (IQMeteringDataProcessedRecords, IQMeteringEventSummaryRecords, IQMeteringObjectRecords)
+
+# Longest day range aggregated in one transaction while catching up
+ROLLUP_CHUNK_DAYS = 31
+
+ROLLUP_LOCK = "iq_metering_rollup"
+
+
+def _as_date(value) -> date:
+    # DATE() comes back as a string on SQLite
+    return value if isinstance(value, date) else date.fromisoformat(value)
+
+
+def rollup_days(session: Session, source_table: str, start: date, end: date) -> int:
+    """Recompute the rollup rows of ``source_table`` for days in [start, end)"""
+    model_class = ROLLUP_SOURCES[source_table]
+    table = model_class.__table__
+    size = table.c.get("data_size_mb")
+    day = func.date(table.c.timestamp)
+    # Grouped on the coalesced values so NULL and "" share one rollup row
+    keys = [func.coalesce(table.c[name], "").label(name) for name in ("partition_id", "operation_type", "status")]
+
+    groups = session.execute(
+        select(
+            day,
+            *keys,
+            func.count(),
+            func.coalesce(func.sum(size), 0.0) if size is not None else literal(0.0),
+        )
+        .where(
+            table.c.timestamp >= datetime.combine(start, datetime.min.time()),
+            table.c.timestamp < datetime.combine(end, datetime.min.time())
+        )
+        .group_by(day, *keys)
+    ).all()
+
+    rollup = IQMeteringDailyRollup.__table__
+    session.execute(
+        delete(rollup).where(rollup.c.source_table == source_table, rollup.c.day >= start, rollup.c.day < end)
+    )
+    if groups:
+        session.execute(insert(rollup), [
+            {
+                "source_table": source_table,
+                "day": _as_date(group_day),
+                "partition_id": partition_id,
+                "operation_type": operation_type,
+                "status": status,
+                "record_count": count,
+                "data_size_mb": data_size_mb,
+            }
+            for group_day, partition_id, operation_type, status, count, data_size_mb in groups
+        ])
+    return len(groups)
+
+
+def query_rollups(session: Session, source_table: Optional[str], start: Optional[date], end: Optional[date],
+                  partition_id: Optional[str]) -> List[Dict]:
+    rollup = IQMeteringDailyRollup.__table__
+    stmt = select(rollup).order_by(rollup.c.day, rollup.c.source_table, rollup.c.id)
+    if source_table:
+        stmt = stmt.where(rollup.c.source_table == source_table)
+    if start:
+        stmt = stmt.where(rollup.c.day >= start)
+    if end:
+        stmt = stmt.where(rollup.c.day < end)
+    if partition_id:
+        stmt = stmt.where(rollup.c.partition_id == partition_id)
+    return [dict(row._mapping) for row in session.execute(stmt)]
+
+
+class MeteringRollupJob:
+    """Keeps iq_metering_daily_rollup current and rotates the metering partitions.
+
+    Every ``metering_rollup_interval`` seconds each source table is
+    re-aggregated from ``metering_rollup_lookback_days`` before its newest
+    rollup day through today, which also backfills an empty rollup table and
+    catches up after downtime. On MySQL, partitions are then rotated:
+    ``metering_partitions_ahead`` future partitions are kept and, with
+    ``metering_partition_retention`` set, older partitions are dropped once
+    every rollup has moved past them. Replicas coordinate with a MySQL
+    named lock so only one of them runs a given cycle.
+    """
+
+    def __init__(self, interval: int, lookback_days: int, partitions_ahead: int, retention: int):
+        self.interval = interval
+        self.lookback_days = lookback_days
+        self.partitions_ahead = partitions_ahead
+        self.retention = retention
+        self._stopped = threading.Event()
+
+    @classmethod
+    def from_settings(cls) -> "MeteringRollupJob":
+        return cls(settings.metering_rollup_interval, settings.metering_rollup_lookback_days,
+                   settings.metering_partitions_ahead, settings.metering_partition_retention)
+
+    def start(self):
+        if self.interval <= 0:
+            return
+        threading.Thread(target=self._run, name="metering-rollup", daemon=True).start()
+        logger.info("Metering rollup job started", interval=self.interval)
+
+    def stop(self):
+        self._stopped.set()
+
+    def run_once(self, now: Optional[datetime] = None):
+        now = now or datetime.utcnow()
+        with engine.connect() as lock_connection:
+            if not self._acquire(lock_connection):
+                logger.debug("Metering rollup running elsewhere, skipping")
+                return
+            try:
+                for source_table in ROLLUP_SOURCES:
+                    self._refresh(source_table, now.date())
+                if engine.dialect.name == "mysql":
+                    # Days before the lookback window will not be re-aggregated again
+                    self._rotate(now, now.date() - timedelta(days=self.lookback_days))
+            finally:
+                self._release(lock_connection)
+
+    def _refresh(self, source_table: str, today: date):
+        """Re-aggregate the recent days of one table, or everything on the first run"""
+        model_class = ROLLUP_SOURCES[source_table]
+        rollup = IQMeteringDailyRollup.__table__
+        with get_db_session() as session:
+            latest = session.scalar(select(func.max(rollup.c.day)).where(rollup.c.source_table == source_table))
+            if latest is not None:
+                start = _as_date(latest) - timedelta(days=self.lookback_days)
+            else:
+                first = session.scalar(select(func.min(model_class.__table__.c.timestamp)))
+                start = first.date() if first is not None else today
+
+            end = today + timedelta(days=1)
+            while start < end:
+                chunk_end = min(start + timedelta(days=ROLLUP_CHUNK_DAYS), end)
+                groups = rollup_days(session, source_table, start, chunk_end)
+                session.commit()
+                logger.debug("Metering rollup refreshed", table=source_table, start=str(start), groups=groups)
+                start = chunk_end
+
+    def _rotate(self, now: datetime, rolled_up_to: date):
+        for model_class in PARTITIONED_MODELS:
+            table = model_class.__table__
+            partitioning = partitioning_of(table)
+            drop_before = None
+            if self.retention > 0:
+                drop_before = partition_start(now, partitioning.interval)
+                for _ in range(self.retention):
+                    drop_before = partition_start(drop_before - timedelta(days=1), partitioning.interval)
+                # Never drop raw rows the rollup has not finished with
+                drop_before = min(drop_before, datetime.combine(rolled_up_to, datetime.min.time()))
+            with engine.connect() as connection:
+                changes = rotate_partitions(connection, table.name, partitioning, now, self.partitions_ahead, drop_before)
+            if changes["created"] or changes["dropped"]:
+                logger.info("Metering partitions rotated", table=table.name, **changes)
+
+    def _acquire(self, connection) -> bool:
+        if connection.dialect.name != "mysql":
+            return True
+        return connection.scalar(text("SELECT GET_LOCK(:name, 0)"), {"name": ROLLUP_LOCK}) == 1
+
+    def _release(self, connection):
+        if connection.dialect.name == "mysql":
+            connection.execute(text("SELECT RELEASE_LOCK(:name)"), {"name": ROLLUP_LOCK})
+
+    def _run(self):
+        while not self._stopped.is_set():
+            try:
+                self.run_once()
+            except Exception as e:
+                logger.error("Metering rollup failed", error=str(e))
+            self._stopped.wait(self.interval)
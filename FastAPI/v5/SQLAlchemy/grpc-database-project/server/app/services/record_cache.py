@@ -0,0 +1,206 @@
+# ================================
+# app/services/record_cache.py
+import hashlib
+import threading
+import time
+import uuid
+from collections import OrderedDict
+from typing import Any, Dict, Hashable, List, Optional, Tuple
+
+import orjson
+import redis
+import structlog
+
+from ..config import settings
+
+logger = structlog.get_logger()
+
+INVALIDATION_CHANNEL = "record_cache:invalidate"
+
+CacheKey = Tuple[str, int, Hashable]
+
+
+class TableCacheStats:
+    def __init__(self):
+        self.hits = 0
+        self.misses = 0
+        self.redis_hits = 0
+        self.invalidations = 0
+
+
+class RecordCache:
+    """Read-through cache for get_record / list_records results.
+
+    Only tables named in ``record_cache_tables`` are cached. Entries live in
+    an in-process LRU bounded by ``record_cache_max_entries`` and
+    ``record_cache_ttl``. Each table has a generation number that is part of
+    every key, so invalidating a table is a counter bump and any read that
+    raced with the write is stored under a generation nobody looks up again.
+
+    With ``record_cache_redis_url`` set, JSON results are also shared
+    through Redis, and invalidations are published so sibling replicas drop
+    their local entries too. Shared entries can outlive a write that raced
+    with the read by at most the TTL.
+    """
+
+    def __init__(self, tables: List[str], ttl: float, max_entries: int, redis_url: Optional[str] = None):
+        self.tables = set(tables)
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self._lock = threading.Lock()
+        self._entries: "OrderedDict[CacheKey, Tuple[float, Dict[str, Any]]]" = OrderedDict()
+        self._generations: Dict[str, int] = {}
+        self._stats: Dict[str, TableCacheStats] = {table: TableCacheStats() for table in self.tables}
+        self._redis = None
+        self._instance_id = uuid.uuid4().hex
+        if redis_url and self.tables:
+            self._redis = redis.Redis.from_url(redis_url, socket_timeout=0.5)
+            threading.Thread(
+                target=self._listen, args=(redis_url,), name="record-cache-invalidation", daemon=True
+            ).start()
+
+    @classmethod
+    def from_settings(cls) -> "RecordCache":
+        tables = [table.strip() for table in settings.record_cache_tables.split(",") if table.strip()]
+        return cls(tables, settings.record_cache_ttl, settings.record_cache_max_entries, settings.record_cache_redis_url)
+
+    def key(self, table_name: str, parts: Hashable) -> Optional[CacheKey]:
+        """Key for a read, or None when the table is not cached"""
+        if table_name not in self.tables:
+            return None
+        return (table_name, self._generations.get(table_name, 0), parts)
+
+    @property
+    def shared(self) -> bool:
+        """Whether lookups, puts and invalidations also go to Redis"""
+        return self._redis is not None
+
+    def get(self, key: Optional[CacheKey]) -> Optional[Dict[str, Any]]:
+        result = self.get_local(key)
+        if result is None and key is not None:
+            result = self.get_shared(key)
+        return result
+
+    def get_local(self, key: Optional[CacheKey]) -> Optional[Dict[str, Any]]:
+        """In-process lookup only; never blocks on Redis"""
+        if key is None:
+            return None
+        now = time.monotonic()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry[0] >= now:
+                self._entries.move_to_end(key)
+                self._stats[key[0]].hits += 1
+                return entry[1]
+        return None
+
+    def get_shared(self, key: CacheKey) -> Optional[Dict[str, Any]]:
+        """Redis lookup after a local miss, counted as a miss when Redis has nothing either"""
+        stats = self._stats[key[0]]
+        result = self._redis_get(key)
+        if result is not None:
+            stats.redis_hits += 1
+            self._store(key, result)
+            return result
+        stats.misses += 1
+        return None
+
+    def put(self, key: Optional[CacheKey], result: Dict[str, Any]):
+        """Cache a successful result; typed results stay in-process only"""
+        if key is None or not result.get("success"):
+            return
+        self._store(key, result)
+        if "rows" not in result and "row" not in result:
+            self._redis_put(key, result)
+
+    def invalidate(self, table_name: str, broadcast: bool = True):
+        if table_name not in self.tables:
+            return
+        with self._lock:
+            self._generations[table_name] = self._generations.get(table_name, 0) + 1
+        self._stats[table_name].invalidations += 1
+        if broadcast:
+            self.broadcast_invalidation(table_name)
+
+    def broadcast_invalidation(self, table_name: str):
+        """Drop the table's shared entries and tell sibling replicas; blocks on Redis"""
+        if table_name in self.tables and self._redis is not None:
+            try:
+                self._redis.delete(self._redis_hash(table_name))
+                self._redis.publish(INVALIDATION_CHANNEL, f"{self._instance_id}:{table_name}")
+            except redis.RedisError as e:
+                logger.warning("Record cache invalidation broadcast failed", table=table_name, error=str(e))
+
+    def stats(self) -> List[Dict[str, Any]]:
+        with self._lock:
+            entries: Dict[str, int] = {}
+            for table_name, generation, _ in self._entries:
+                if generation == self._generations.get(table_name, 0):
+                    entries[table_name] = entries.get(table_name, 0) + 1
+        return [
+            {
+                "table_name": table_name,
+                "hits": stats.hits,
+                "misses": stats.misses,
+                "redis_hits": stats.redis_hits,
+                "invalidations": stats.invalidations,
+                "entries": entries.get(table_name, 0),
+            }
+            for table_name, stats in sorted(self._stats.items())
+        ]
+
+    def _store(self, key: CacheKey, result: Dict[str, Any]):
+        with self._lock:
+            self._entries[key] = (time.monotonic() + self.ttl, result)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    # Redis: one hash per table, so a write drops the table with a single DEL
+
+    def _redis_hash(self, table_name: str) -> str:
+        return f"record_cache:{table_name}"
+
+    def _redis_field(self, key: CacheKey) -> str:
+        return hashlib.sha1(repr(key[2]).encode()).hexdigest()
+
+    def _redis_get(self, key: CacheKey) -> Optional[Dict[str, Any]]:
+        if self._redis is None:
+            return None
+        try:
+            payload = self._redis.hget(self._redis_hash(key[0]), self._redis_field(key))
+        except redis.RedisError as e:
+            logger.warning("Record cache read from Redis failed", table=key[0], error=str(e))
+            return None
+        if payload is None:
+            return None
+        expires_at, result = orjson.loads(payload)
+        return result if expires_at >= time.time() else None
+
+    def _redis_put(self, key: CacheKey, result: Dict[str, Any]):
+        if self._redis is None:
+            return
+        name = self._redis_hash(key[0])
+        try:
+            pipe = self._redis.pipeline(transaction=False)
+            pipe.hset(name, self._redis_field(key), orjson.dumps([time.time() + self.ttl, result]))
+            pipe.expire(name, max(int(self.ttl), 1))
+            pipe.execute()
+        except redis.RedisError as e:
+            logger.warning("Record cache write to Redis failed", table=key[0], error=str(e))
+
+    def _listen(self, redis_url: str):
+        """Drop local entries for tables written through sibling replicas"""
+        # Separate connection without a read timeout, since it idles between messages
+        client = redis.Redis.from_url(redis_url)
+        while True:
+            try:
+                pubsub = client.pubsub(ignore_subscribe_messages=True)
+                pubsub.subscribe(INVALIDATION_CHANNEL)
+                for message in pubsub.listen():
+                    instance_id, _, table_name = message["data"].decode().partition(":")
+                    if instance_id != self._instance_id:
+                        self.invalidate(table_name, broadcast=False)
+            except redis.RedisError as e:
+                logger.warning("Record cache invalidation listener failed, retrying", error=str(e))
+                time.sleep(1)
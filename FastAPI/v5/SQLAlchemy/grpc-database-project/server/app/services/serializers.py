@@ -0,0 +1,87 @@
+# ================================
+# app/services/serializers.py
+import orjson
+from decimal import Decimal
+from typing import Any, Dict, Optional, Sequence, Tuple
+from sqlalchemy import LargeBinary, Text
+
+# Column types left out of list queries by default (LONGTEXT is a Text subtype)
+LARGE_COLUMN_TYPES = (Text, LargeBinary)
+
+# Bound on cached serializers, since column subsets come from requests
+MAX_CACHED_SERIALIZERS = 1024
+
+
+def _default(value: Any) -> Any:
+    """Encode the column types orjson does not handle natively"""
+    if isinstance(value, Decimal):
+        return float(value)
+    if isinstance(value, bytes):
+        return value.decode("utf-8", errors="replace")
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+
+def dumps(value: Any) -> str:
+    # orjson writes naive datetimes exactly like datetime.isoformat()
+    return orjson.dumps(value, default=_default).decode()
+
+
+class RowSerializer:
+    """Turns Core result rows for one table into JSON strings.
+
+    Built once per (table, columns) and reused, so the hot path is a
+    ``zip`` over a precomputed key tuple plus a single encoder call, with
+    no ORM instances or per-column type checks involved.
+    """
+
+    def __init__(self, model_class, column_names: Optional[Sequence[str]] = None):
+        table = model_class.__table__
+        names = column_names or table.columns.keys()
+        unknown = [name for name in names if name not in table.c]
+        if unknown:
+            raise ValueError(f"Unknown column(s): {', '.join(unknown)}")
+        self.columns = tuple(table.c[name] for name in names)
+        self.keys = tuple(column.name for column in self.columns)
+
+    def to_dict(self, row: Sequence[Any]) -> Dict[str, Any]:
+        return dict(zip(self.keys, row))
+
+    def dumps(self, row: Sequence[Any]) -> str:
+        return dumps(dict(zip(self.keys, row)))
+
+    def chunk(self, rows: Sequence[Sequence[Any]], typed: bool = False) -> Dict[str, Any]:
+        """One stream_records chunk, as JSON strings or as raw rows"""
+        chunk = {"success": True, "last_id": rows[-1].id}
+        if typed:
+            chunk["columns"] = self.keys
+            chunk["rows"] = rows
+        else:
+            chunk["records"] = [self.dumps(row) for row in rows]
+        return chunk
+
+
+_serializers: Dict[Tuple[str, Tuple[str, ...]], RowSerializer] = {}
+
+
+def get_serializer(model_class, column_names: Optional[Sequence[str]] = None,
+                   defer_large: bool = False) -> RowSerializer:
+    """Cached serializer for a model and an optional column subset.
+
+    A subset always includes ``id`` first, since paging and stream chunks
+    key off it. With no subset and ``defer_large`` set, large text and
+    binary columns are left out.
+    """
+    table = model_class.__table__
+    if column_names:
+        column_names = tuple(dict.fromkeys(("id", *column_names)))
+    elif defer_large:
+        column_names = tuple(
+            column.name for column in table.columns if not isinstance(column.type, LARGE_COLUMN_TYPES)
+        )
+    key = (model_class.__tablename__, tuple(column_names or ()))
+    serializer = _serializers.get(key)
+    if serializer is None:
+        serializer = RowSerializer(model_class, column_names)
+        if len(_serializers) < MAX_CACHED_SERIALIZERS:
+            _serializers[key] = serializer
+    return serializer
@@ -0,0 +1,223 @@
+# ================================
+# app/services/write_coalescer.py
+import atexit
+import math
+import threading
+from datetime import datetime
+from typing import Any, Callable, Dict, Iterable, Optional, Set, Tuple
+
+import structlog
+
+from ..config import settings
+
+logger = structlog.get_logger()
+
+FlushFunction = Callable[[str, Dict[int, Dict[str, Any]]], None]
+# Returns the values to buffer for a table, raising ValueError or TypeError for bad ones
+CoerceFunction = Callable[[str, Dict[str, Any]], Dict[str, Any]]
+
+
+def coerce_value(column, value: Any) -> Any:
+    """Convert a request value to what ``column`` stores, or raise ValueError/TypeError"""
+    if value is None:
+        if not column.nullable:
+            raise ValueError(f"{column.name} cannot be null")
+        return None
+    try:
+        python_type = column.type.python_type
+    except NotImplementedError:
+        return value
+
+    if isinstance(value, bool) and python_type is not bool:
+        raise TypeError(f"{column.name} expects {python_type.__name__}, got a boolean")
+    if python_type is float:
+        value = float(value)
+        if not math.isfinite(value):
+            raise ValueError(f"{column.name} must be a finite number")
+    elif python_type is int:
+        if isinstance(value, float) and not value.is_integer():
+            raise ValueError(f"{column.name} expects an integer")
+        value = int(value)
+    elif python_type is datetime:
+        if isinstance(value, str):
+            value = datetime.fromisoformat(value)
+        elif not isinstance(value, datetime):
+            raise TypeError(f"{column.name} expects an ISO datetime string")
+    elif python_type is str:
+        if isinstance(value, (int, float)):
+            value = str(value)
+        elif not isinstance(value, str):
+            raise TypeError(f"{column.name} expects a string")
+        length = getattr(column.type, "length", None)
+        if length and len(value) > length:
+            raise ValueError(f"{column.name} is longer than {length} characters")
+    elif not isinstance(value, python_type):
+        raise TypeError(f"{column.name} expects {python_type.__name__}")
+    return value
+
+
+class WriteCoalescer:
+    """Buffers high-frequency UpdateRecord calls and writes them in batches.
+
+    Only updates that touch nothing but the configured columns of a table
+    are buffered. Updates to the same row within one window are merged, so
+    only the last value of each column is written. A background thread hands
+    the pending rows of each table to ``flush`` every ``window`` seconds.
+
+    An update that sets ``status`` to a terminal value is never buffered: it
+    is written immediately, together with whatever was pending for the row,
+    so the final state of a job is durable once UpdateRecord returns. Other
+    replicas buffer their own updates, so the flush skips rows whose status
+    is already terminal rather than overwrite a state written elsewhere.
+
+    Values are checked by ``coerce`` before they are buffered; ones it
+    rejects are written directly so the caller sees the error. A table
+    whose batch still fails is retried row by row, and a row that keeps
+    failing is dropped after ``max_requeues`` windows.
+    """
+
+    def __init__(self, columns: Dict[str, Set[str]], window: float, terminal_statuses: Iterable[str],
+                 flush: FlushFunction, coerce: Optional[CoerceFunction] = None, max_requeues: int = 20):
+        self.columns = columns
+        self.window = window
+        self.terminal_statuses = {status.upper() for status in terminal_statuses}
+        self.max_requeues = max_requeues
+        self._flush = flush
+        self._coerce = coerce
+        self._lock = threading.Lock()
+        # Notified whenever a flush has finished writing its rows
+        self._flushed = threading.Condition(self._lock)
+        # Serialises flushes, so an older batch never commits after a newer one
+        self._flush_lock = threading.Lock()
+        self._pending: Dict[Tuple[str, int], Dict[str, Any]] = {}
+        # Rows the running flush is writing; a direct write to one waits for it
+        self._in_flight: Set[Tuple[str, int]] = set()
+        # Failed flushes per buffered row
+        self._failures: Dict[Tuple[str, int], int] = {}
+        self._stopped = threading.Event()
+        if self.columns:
+            threading.Thread(target=self._run, name="write-coalescer", daemon=True).start()
+            atexit.register(self.close)
+
+    @classmethod
+    def from_settings(cls, flush: FlushFunction, coerce: Optional[CoerceFunction] = None) -> "WriteCoalescer":
+        columns: Dict[str, Set[str]] = {}
+        for item in settings.coalesce_columns.split(","):
+            if item.strip():
+                table_name, _, column = item.strip().partition(".")
+                columns.setdefault(table_name, set()).add(column)
+        terminal = [status.strip() for status in settings.coalesce_terminal_statuses.split(",") if status.strip()]
+        return cls(columns, settings.coalesce_window_ms / 1000, terminal, flush, coerce,
+                   settings.coalesce_max_requeues)
+
+    def offer(self, table_name: str, record_id: int, data: Dict[str, Any]) -> bool:
+        """Buffer an update if it is coalescable; False means write it now"""
+        columns = self.columns.get(table_name)
+        if not columns or not data or not set(data) <= columns:
+            return False
+        status = data.get("status")
+        if isinstance(status, str) and status.upper() in self.terminal_statuses:
+            return False
+        if self._coerce is not None:
+            try:
+                data = self._coerce(table_name, data)
+            except (TypeError, ValueError):
+                return False
+        with self._lock:
+            self._pending.setdefault((table_name, record_id), {}).update(data)
+        return True
+
+    def take(self, table_name: str, record_id: int) -> Dict[str, Any]:
+        """Remove and return the buffered values for a row that is about to be written directly
+
+        Blocks only while a flush is writing this same row, so the direct
+        write never lands before older buffered values.
+        """
+        if table_name not in self.columns:
+            return {}
+        key = (table_name, record_id)
+        with self._flushed:
+            while key in self._in_flight:
+                self._flushed.wait()
+            self._failures.pop(key, None)
+            return self._pending.pop(key, {})
+
+    def flush(self):
+        with self._flush_lock:
+            with self._lock:
+                pending, self._pending = self._pending, {}
+                self._in_flight.update(pending)
+
+            tables: Dict[str, Dict[int, Dict[str, Any]]] = {}
+            for (table_name, record_id), values in pending.items():
+                tables.setdefault(table_name, {})[record_id] = values
+
+            failed: Dict[str, Dict[int, Dict[str, Any]]] = {}
+            try:
+                for table_name, updates in tables.items():
+                    failed_rows = self._flush_table(table_name, updates)
+                    if failed_rows:
+                        failed[table_name] = failed_rows
+            finally:
+                with self._flushed:
+                    for key in pending:
+                        if key[1] not in failed.get(key[0], ()):
+                            self._failures.pop(key, None)
+                    for table_name, updates in failed.items():
+                        self._requeue_failed(table_name, updates)
+                    self._in_flight.difference_update(pending)
+                    self._flushed.notify_all()
+
+    def _flush_table(self, table_name: str, updates: Dict[int, Dict[str, Any]]) -> Dict[int, Dict[str, Any]]:
+        """Write one table's rows, falling back to one row at a time; returns the rows that failed"""
+        try:
+            self._flush(table_name, updates)
+            return {}
+        except Exception as e:
+            if len(updates) == 1:
+                logger.error("Coalesced flush failed", table=table_name, rows=1, error=str(e))
+                return updates
+            logger.warning("Coalesced flush failed, retrying row by row", table=table_name,
+                           rows=len(updates), error=str(e))
+
+        failed = {}
+        for record_id, values in updates.items():
+            try:
+                self._flush(table_name, {record_id: values})
+            except Exception as e:
+                logger.error("Coalesced flush failed for row", table=table_name, record_id=record_id, error=str(e))
+                failed[record_id] = values
+        return failed
+
+    def close(self):
+        """Stop the flush thread and write out anything still buffered"""
+        self._stopped.set()
+        self.flush()
+
+    def requeue(self, table_name: str, updates: Dict[int, Dict[str, Any]]):
+        """Buffer values again after the write they were taken for failed"""
+        with self._lock:
+            self._requeue(table_name, updates)
+
+    def _requeue_failed(self, table_name: str, updates: Dict[int, Dict[str, Any]]):
+        # Caller holds _lock
+        for record_id, values in updates.items():
+            key = (table_name, record_id)
+            failures = self._failures.get(key, 0) + 1
+            if failures > self.max_requeues:
+                self._failures.pop(key, None)
+                logger.error("Dropping coalesced update after repeated flush failures", table=table_name,
+                             record_id=record_id, values=values, failures=failures)
+                continue
+            self._failures[key] = failures
+            self._requeue(table_name, {record_id: values})
+
+    def _requeue(self, table_name: str, updates: Dict[int, Dict[str, Any]]):
+        # Caller holds _lock; values buffered since they were taken are newer and win
+        for record_id, values in updates.items():
+            key = (table_name, record_id)
+            self._pending[key] = {**values, **self._pending.get(key, {})}
+
+    def _run(self):
+        while not self._stopped.wait(self.window):
+            self.flush()
@@ -0,0 +1,170 @@
+# ================================
+# app/tracing.py
+"""OpenTelemetry spans for RPCs and the SQL they run.
+
+Tracing is off unless ``tracing_enabled`` is set. ``tracing_sample_ratio``
+applies to traces started here; calls from the gateway carry a W3C
+``traceparent`` in their gRPC metadata and follow the gateway's decision,
+so a sampled gateway request is traced end to end. Spans are batched off
+the request path and written as JSON lines to ``tracing_file`` or sent to
+an OTLP collector at ``tracing_otlp_endpoint``.
+"""
+import threading
+from typing import Optional, Sequence
+
+import structlog
+from opentelemetry import context as otel_context
+from opentelemetry import propagate, trace
+from opentelemetry.sdk.resources import Resource
+from opentelemetry.sdk.trace import ReadableSpan, TracerProvider
+from opentelemetry.sdk.trace.export import BatchSpanProcessor, SpanExporter, SpanExportResult
+from opentelemetry.sdk.trace.sampling import ParentBased, TraceIdRatioBased
+from opentelemetry.trace import SpanKind, Status, StatusCode
+from sqlalchemy import event
+
+from .config import settings
+from .interceptors import AsyncObserverInterceptor, CallObserver, ObserverInterceptor, status_code
+from .metrics import statement_operation, statement_table
+
+logger = structlog.get_logger()
+
+tracer = trace.get_tracer("db-grpc-server")
+
+
+class JsonLinesSpanExporter(SpanExporter):
+    """Appends finished spans to a file, one JSON object per line"""
+
+    def __init__(self, path: str):
+        self._lock = threading.Lock()
+        self._file = open(path, "a", encoding="utf-8")
+
+    def export(self, spans: Sequence[ReadableSpan]) -> SpanExportResult:
+        lines = "".join(span.to_json(indent=None) + "\n" for span in spans)
+        with self._lock:
+            self._file.write(lines)
+            self._file.flush()
+        return SpanExportResult.SUCCESS
+
+    def shutdown(self):
+        with self._lock:
+            self._file.close()
+
+
+def _exporter() -> SpanExporter:
+    if settings.tracing_exporter == "otlp":
+        from opentelemetry.exporter.otlp.proto.grpc.trace_exporter import OTLPSpanExporter
+        return OTLPSpanExporter(endpoint=settings.tracing_otlp_endpoint, insecure=True)
+    if settings.tracing_exporter == "file":
+        return JsonLinesSpanExporter(settings.tracing_file)
+    raise ValueError(f"Unknown tracing exporter: {settings.tracing_exporter}")
+
+
+def setup_tracing(service_name: str) -> bool:
+    """Install the tracer provider; False when tracing is disabled"""
+    if not settings.tracing_enabled:
+        return False
+    provider = TracerProvider(
+        resource=Resource.create({"service.name": service_name}),
+        sampler=ParentBased(TraceIdRatioBased(min(max(settings.tracing_sample_ratio, 0.0), 1.0)))
+    )
+    provider.add_span_processor(BatchSpanProcessor(
+        _exporter(),
+        max_queue_size=settings.tracing_max_queue_size,
+        max_export_batch_size=settings.tracing_export_batch_size,
+        schedule_delay_millis=settings.tracing_export_delay_ms
+    ))
+    trace.set_tracer_provider(provider)
+    logger.info("Tracing enabled", exporter=settings.tracing_exporter, sample_ratio=settings.tracing_sample_ratio)
+    return True
+
+
+# ================================
+# gRPC server spans
+# ================================
+
+class RpcSpan(CallObserver):
+    """Server span for one RPC, parented on the caller's traceparent metadata"""
+
+    def __init__(self, method: str, context):
+        super().__init__(method, context)
+        parent = propagate.extract(dict(context.invocation_metadata() or ()))
+        self.span = tracer.start_span(
+            f"DatabaseService/{method}",
+            context=parent,
+            kind=SpanKind.SERVER,
+            attributes={"rpc.system": "grpc", "rpc.service": "database.DatabaseService", "rpc.method": method}
+        )
+        self._token = otel_context.attach(trace.set_span_in_context(self.span, parent))
+        self._table_set = False
+
+    def request(self, request):
+        table_name = getattr(request, "table_name", "")
+        if table_name and not self._table_set:
+            self.span.set_attribute("db.sql.table", table_name)
+            self._table_set = True
+
+    def response(self, response):
+        if response is not None and "success" in response.DESCRIPTOR.fields_by_name and not response.success:
+            self.span.set_attribute("app.success", False)
+            self.span.set_status(Status(StatusCode.ERROR, response.message))
+
+    def finish(self, context, error: Optional[BaseException] = None):
+        code = status_code(context, error)
+        self.span.set_attribute("rpc.grpc.status_code", code.value[0])
+        if error is not None:
+            self.span.record_exception(error)
+            self.span.set_status(Status(StatusCode.ERROR, str(error)))
+        try:
+            otel_context.detach(self._token)
+        except ValueError:
+            pass
+        self.span.end()
+
+
+class TracingInterceptor(ObserverInterceptor):
+    observer_class = RpcSpan
+
+
+class AsyncTracingInterceptor(AsyncObserverInterceptor):
+    observer_class = RpcSpan
+
+
+# ================================
+# SQL spans
+# ================================
+
+def trace_queries(engine):
+    """Child spans for statements run while a sampled span is current"""
+    sync_engine = getattr(engine, "sync_engine", engine)
+    db_system = sync_engine.dialect.name
+
+    @event.listens_for(sync_engine, "before_cursor_execute")
+    def _before_execute(conn, cursor, statement, parameters, context, executemany):
+        # Background writers and unsampled requests pay only this check
+        if context is None or not trace.get_current_span().is_recording():
+            return
+        table, operation = statement_table(context), statement_operation(context, statement)
+        attributes = {"db.system": db_system, "db.operation": operation, "db.sql.table": table}
+        if settings.tracing_statement_max_length > 0:
+            attributes["db.statement"] = statement[:settings.tracing_statement_max_length]
+        if executemany:
+            attributes["db.executemany"] = True
+        context._otel_span = tracer.start_span(f"{operation} {table}", kind=SpanKind.CLIENT, attributes=attributes)
+
+    @event.listens_for(sync_engine, "after_cursor_execute")
+    def _after_execute(conn, cursor, statement, parameters, context, executemany):
+        span = getattr(context, "_otel_span", None)
+        if span is not None:
+            if cursor.rowcount is not None and cursor.rowcount >= 0:
+                span.set_attribute("db.rowcount", cursor.rowcount)
+            span.end()
+            context._otel_span = None
+
+    @event.listens_for(sync_engine, "handle_error")
+    def _on_error(exception_context):
+        span = getattr(exception_context.execution_context, "_otel_span", None)
+        if span is not None:
+            span.record_exception(exception_context.original_exception)
+            span.set_status(Status(StatusCode.ERROR, str(exception_context.original_exception)))
+            span.end()
+            exception_context.execution_context._otel_span = None
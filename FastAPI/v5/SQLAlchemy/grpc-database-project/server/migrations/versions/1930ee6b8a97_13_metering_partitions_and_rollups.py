@@ -0,0 +1,103 @@
+"""13_metering_partitions_and_rollups
+
+Revision ID: 1930ee6b8a97
+Revises: b88697d5c808
+Create Date: 2026-10-18 10:12:31.204518
+
+"""
+from datetime import datetime
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+from app.models.partitioning import TimePartitioning, next_start, partition_by_sql, partition_start
+
+
+# revision identifiers, used by Alembic.
+revision: str = '1930ee6b8a97'
+down_revision: Union[str, None] = 'b88697d5c808'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# table -> (index prefix, has partition_id)
+METERING_TABLES = {
+    'iq_metering_data_processed_records': ('iqm_data_processed', True),
+    'iq_metering_event_summary_records': ('iqm_event_summary', False),
+    'iq_metering_object_records': ('iqm_object', True),
+}
+
+PARTITIONING = TimePartitioning('timestamp', 'month')
+
+# Future monthly partitions created up front; the rollup job keeps extending them
+PARTITIONS_AHEAD = 3
+
+
+def _partition(bind, table_name: str) -> None:
+    """Switch a MySQL table to monthly RANGE COLUMNS partitions on timestamp"""
+    now = datetime.utcnow()
+    first = bind.execute(sa.text(f"SELECT MIN(`timestamp`) FROM `{table_name}`")).scalar() or now
+
+    # The partitioning column must be NOT NULL and part of the primary key
+    op.execute(sa.text(f"UPDATE `{table_name}` SET `timestamp` = :first WHERE `timestamp` IS NULL").bindparams(first=first))
+    op.execute(
+        f"ALTER TABLE `{table_name}` "
+        f"MODIFY `timestamp` DATETIME(6) NOT NULL DEFAULT CURRENT_TIMESTAMP(6), "
+        f"DROP PRIMARY KEY, ADD PRIMARY KEY (`id`, `timestamp`)"
+    )
+
+    until = partition_start(now, PARTITIONING.interval)
+    for _ in range(PARTITIONS_AHEAD):
+        until = next_start(until, PARTITIONING.interval)
+    op.execute(partition_by_sql(table_name, PARTITIONING, first, until))
+
+
+def upgrade() -> None:
+    bind = op.get_bind()
+    inspector = sa.inspect(bind)
+
+    op.create_table('iq_metering_daily_rollup',
+    sa.Column('id', sa.BigInteger(), autoincrement=True, nullable=False),
+    sa.Column('source_table', sa.String(length=64), nullable=False),
+    sa.Column('day', sa.Date(), nullable=False),
+    sa.Column('partition_id', sa.String(length=255), nullable=False),
+    sa.Column('operation_type', sa.String(length=191), nullable=False),
+    sa.Column('status', sa.String(length=191), nullable=False),
+    sa.Column('record_count', sa.BigInteger(), nullable=False),
+    sa.Column('data_size_mb', sa.Float(), nullable=False),
+    sa.PrimaryKeyConstraint('id'),
+    sa.UniqueConstraint('source_table', 'day', 'partition_id', 'operation_type', 'status',
+                        name='uq_iq_metering_daily_rollup')
+    )
+
+    for table_name, (prefix, has_partition_id) in METERING_TABLES.items():
+        if not inspector.has_table(table_name):
+            continue
+        op.create_index(f'ix_{prefix}_timestamp', table_name, ['timestamp'])
+        op.create_index(f'ix_{prefix}_metering_event_id', table_name, ['metering_event_id'])
+        if has_partition_id:
+            op.create_index(f'ix_{prefix}_partition_id_timestamp', table_name, ['partition_id', 'timestamp'])
+        if bind.dialect.name == 'mysql':
+            _partition(bind, table_name)
+
+
+def downgrade() -> None:
+    bind = op.get_bind()
+    inspector = sa.inspect(bind)
+
+    for table_name, (prefix, has_partition_id) in METERING_TABLES.items():
+        if not inspector.has_table(table_name):
+            continue
+        if bind.dialect.name == 'mysql':
+            op.execute(f"ALTER TABLE `{table_name}` REMOVE PARTITIONING")
+            op.execute(
+                f"ALTER TABLE `{table_name}` "
+                f"DROP PRIMARY KEY, ADD PRIMARY KEY (`id`), "
+                f"MODIFY `timestamp` DATETIME(6) NULL"
+            )
+        if has_partition_id:
+            op.drop_index(f'ix_{prefix}_partition_id_timestamp', table_name=table_name)
+        op.drop_index(f'ix_{prefix}_metering_event_id', table_name=table_name)
+        op.drop_index(f'ix_{prefix}_timestamp', table_name=table_name)
+
+    op.drop_table('iq_metering_daily_rollup')
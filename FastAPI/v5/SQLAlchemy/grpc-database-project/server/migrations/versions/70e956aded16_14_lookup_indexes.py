@@ -0,0 +1,50 @@
+"""14_lookup_indexes
+
+Revision ID: 70e956aded16
+Revises: 1930ee6b8a97
+Create Date: 2026-10-18 14:41:07.518230
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '70e956aded16'
+down_revision: Union[str, None] = '1930ee6b8a97'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# (index name, table, columns) for the columns the services look rows up by
+INDEXES = [
+    ('ix_emr_job_runs_status_job_id', 'emr_job_runs_status', ['job_id']),
+    ('ix_emr_job_runs_status_run_id', 'emr_job_runs_status', ['run_id']),
+    ('ix_osdu_user_token_user_id', 'osdu_user_token', ['user_id']),
+    ('ix_rbac_user_info_email', 'rbac_user_info', ['email']),
+    ('ix_segy_to_vds_status_pod_uid', 'segy_to_vds_status', ['pod_uid']),
+    ('ix_segy_to_vds_status_status', 'segy_to_vds_status', ['status']),
+    ('ix_user_settings_username', 'user_settings', ['username']),
+]
+
+
+def upgrade() -> None:
+    inspector = sa.inspect(op.get_bind())
+    for name, table_name, columns in INDEXES:
+        if not inspector.has_table(table_name):
+            continue
+        # Databases created outside Alembic may already index the column under another name
+        existing = inspector.get_indexes(table_name) + inspector.get_unique_constraints(table_name)
+        if any(index['column_names'][:len(columns)] == columns for index in existing):
+            continue
+        op.create_index(name, table_name, columns)
+
+
+def downgrade() -> None:
+    inspector = sa.inspect(op.get_bind())
+    for name, table_name, columns in reversed(INDEXES):
+        if not inspector.has_table(table_name):
+            continue
+        if any(index['name'] == name for index in inspector.get_indexes(table_name)):
+            op.drop_index(name, table_name=table_name)
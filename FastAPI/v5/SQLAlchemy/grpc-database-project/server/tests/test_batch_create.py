@@ -0,0 +1,33 @@
+# ================================
+# tests/test_batch_create.py
+import pytest
+from sqlalchemy import create_engine, select
+from sqlalchemy.orm import Session
+
+from app.models.tables import user
+from app.services.db_service import DatabaseService, _bound_session
+
+
+@pytest.fixture
+def session():
+    engine = create_engine("sqlite://")
+    user.__table__.create(engine)
+    with Session(engine) as session:
+        token = _bound_session.set(session)
+        yield session
+        _bound_session.reset(token)
+
+
+def test_ids_without_returning(session, monkeypatch):
+    """Dialects without RETURNING other than MySQL get each row's own id, and no MySQL-only query"""
+    monkeypatch.setattr(session.get_bind().dialect, "insert_executemany_returning", False)
+    session.execute(user.__table__.insert(), [{"name": "old", "email": "old@example.com"}])
+    session.commit()
+
+    rows = [{"name": f"u{index}", "email": f"u{index}@example.com"} for index in range(3)]
+    result = DatabaseService().batch_create_records("user", rows + [{"id": 10, "name": "x", "email": "x@example.com"}])
+
+    assert result["success"], result["message"]
+    assert result["record_ids"] == [2, 3, 4, 10]
+    names = dict(session.execute(select(user.id, user.name)).all())
+    assert [names[record_id] for record_id in result["record_ids"]] == ["u0", "u1", "u2", "x"]
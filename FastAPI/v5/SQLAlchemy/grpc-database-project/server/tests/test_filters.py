@@ -0,0 +1,52 @@
+# ================================
+# tests/test_filters.py
+from datetime import datetime
+
+import pytest
+from sqlalchemy import BigInteger, create_engine, select
+from sqlalchemy.ext.compiler import compiles
+from sqlalchemy.orm import Session
+
+from app.models.tables import IQMeteringDataProcessedRecords
+from app.services.filters import FilterError, compile_filter
+
+
+@compiles(BigInteger, "sqlite")
+def _sqlite_bigint(type_, compiler, **kw):
+    # SQLite only autoincrements INTEGER PRIMARY KEY columns
+    return "INTEGER"
+
+
+@pytest.fixture
+def session():
+    engine = create_engine("sqlite://")
+    IQMeteringDataProcessedRecords.__table__.create(engine)
+    with Session(engine) as session:
+        session.execute(IQMeteringDataProcessedRecords.__table__.insert(), [
+            {"timestamp": datetime(2024, 1, 1), "partition_id": partition_id, "data_size_mb": 1.0}
+            for partition_id in ("p1", "p2", "p3")
+        ])
+        yield session
+
+
+def _partitions(session, filter_conditions):
+    compiled = compile_filter(IQMeteringDataProcessedRecords, filter_conditions)
+    table = IQMeteringDataProcessedRecords.__table__
+    query = select(table.c.partition_id).where(compiled.where).order_by(table.c.partition_id)
+    return session.execute(query, compiled.params).scalars().all()
+
+
+def test_list_value_is_in(session):
+    """A bare list compiles to IN, the same as {"in": [...]}"""
+    assert _partitions(session, '{"partition_id": ["p1", "p3"]}') == ["p1", "p3"]
+    assert _partitions(session, '{"partition_id": {"in": ["p1", "p3"]}}') == ["p1", "p3"]
+
+
+def test_comparison_rejects_list():
+    with pytest.raises(FilterError, match="use 'in'"):
+        compile_filter(IQMeteringDataProcessedRecords, '{"partition_id": {"eq": ["p1", "p2"]}}')
+
+
+def test_raw_sql_disabled_by_default():
+    with pytest.raises(FilterError, match="disabled"):
+        compile_filter(IQMeteringDataProcessedRecords, "partition_id = 'p1'")
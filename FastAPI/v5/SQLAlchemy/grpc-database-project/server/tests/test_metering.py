@@ -0,0 +1,41 @@
+# ================================
+# tests/test_metering.py
+from datetime import date, datetime
+
+import pytest
+from sqlalchemy import BigInteger, create_engine
+from sqlalchemy.ext.compiler import compiles
+from sqlalchemy.orm import Session
+
+from app.models.tables import IQMeteringDailyRollup, IQMeteringDataProcessedRecords
+from app.services.metering import rollup_days
+
+
+@compiles(BigInteger, "sqlite")
+def _sqlite_bigint(type_, compiler, **kw):
+    # SQLite only autoincrements INTEGER PRIMARY KEY columns
+    return "INTEGER"
+
+
+@pytest.fixture
+def session():
+    engine = create_engine("sqlite://")
+    for model in (IQMeteringDataProcessedRecords, IQMeteringDailyRollup):
+        model.__table__.create(engine)
+    with Session(engine) as session:
+        yield session
+
+
+def test_rollup_merges_null_and_empty_keys(session):
+    """NULL and '' grouping values land in one rollup row instead of colliding on the unique key"""
+    records = IQMeteringDataProcessedRecords.__table__
+    session.execute(records.insert(), [
+        {"timestamp": datetime(2024, 1, 1, 9), "partition_id": "p1", "status": None, "data_size_mb": 1.5},
+        {"timestamp": datetime(2024, 1, 1, 10), "partition_id": "p1", "status": "", "data_size_mb": 2.5},
+    ])
+
+    assert rollup_days(session, "iq_metering_data_processed_records", date(2024, 1, 1), date(2024, 1, 2)) == 1
+    rows = session.execute(IQMeteringDailyRollup.__table__.select()).mappings().all()
+    assert len(rows) == 1
+    assert rows[0]["status"] == "" and rows[0]["operation_type"] == ""
+    assert rows[0]["record_count"] == 2 and rows[0]["data_size_mb"] == 4.0
@@ -0,0 +1,147 @@
+# ================================
+# tests/test_write_coalescer.py
+import threading
+
+import pytest
+from sqlalchemy import BigInteger, create_engine, select
+from sqlalchemy.dialects.mysql import LONGTEXT
+from sqlalchemy.ext.compiler import compiles
+from sqlalchemy.orm import Session
+
+from app.models.tables import SegyToVdsStatus
+from app.services.db_service import DatabaseService, _bound_session
+from app.services.write_coalescer import WriteCoalescer
+
+TERMINAL = ["COMPLETED", "FAILED"]
+
+
+@compiles(BigInteger, "sqlite")
+def _sqlite_bigint(type_, compiler, **kw):
+    # SQLite only autoincrements INTEGER PRIMARY KEY columns
+    return "INTEGER"
+
+
+@compiles(LONGTEXT, "sqlite")
+def _sqlite_longtext(type_, compiler, **kw):
+    return "TEXT"
+
+
+@pytest.fixture
+def session():
+    engine = create_engine("sqlite://")
+    SegyToVdsStatus.__table__.create(engine)
+    with Session(engine) as session:
+        session.execute(SegyToVdsStatus.__table__.insert(), [
+            {"id": 1, "pod_uid": "a", "thread_id": "t", "status": "RUNNING", "progress": 10.0},
+            {"id": 2, "pod_uid": "b", "thread_id": "t", "status": "RUNNING", "progress": 10.0},
+        ])
+        session.commit()
+        token = _bound_session.set(session)
+        yield session
+        _bound_session.reset(token)
+
+
+@pytest.fixture
+def service(session):
+    service = DatabaseService()
+    service.write_coalescer = WriteCoalescer(
+        {"segy_to_vds_status": {"progress", "status"}}, 3600, TERMINAL, service._flush_coalesced,
+        service._coerce_coalesced
+    )
+    return service
+
+
+def _rows(session):
+    table = SegyToVdsStatus.__table__
+    return {row.id: (row.status, row.progress) for row in session.execute(select(table.c.id, table.c.status, table.c.progress))}
+
+
+def test_flush_keeps_terminal_status_written_elsewhere(service, session):
+    """A replica's buffered RUNNING must not overwrite a COMPLETED written directly by another replica"""
+    assert service.update_record("segy_to_vds_status", 1, {"status": "RUNNING", "progress": 50.0})["success"]
+    assert service.update_record("segy_to_vds_status", 2, {"status": "RUNNING", "progress": 50.0})["success"]
+
+    # The other replica finishes job 1 without going through this coalescer
+    table = SegyToVdsStatus.__table__
+    session.execute(table.update().where(table.c.id == 1).values(status="completed", progress=100.0))
+    session.commit()
+
+    service.write_coalescer.flush()
+    assert _rows(session) == {1: ("completed", 100.0), 2: ("RUNNING", 50.0)}
+
+
+def test_take_waits_only_for_its_own_row():
+    """A direct write waits for a flush of its own row, not for flushes of other rows"""
+    writing, release = threading.Event(), threading.Event()
+
+    def slow_flush(table_name, updates):
+        writing.set()
+        release.wait(5)
+
+    coalescer = WriteCoalescer({"segy_to_vds_status": {"progress"}}, 3600, TERMINAL, slow_flush)
+    coalescer.offer("segy_to_vds_status", 1, {"progress": 1.0})
+    flusher = threading.Thread(target=coalescer.flush)
+    flusher.start()
+    assert writing.wait(5)
+
+    coalescer.offer("segy_to_vds_status", 2, {"progress": 2.0})
+    assert coalescer.take("segy_to_vds_status", 2) == {"progress": 2.0}
+
+    taken = []
+    waiter = threading.Thread(target=lambda: taken.append(coalescer.take("segy_to_vds_status", 1)))
+    waiter.start()
+    waiter.join(0.2)
+    assert waiter.is_alive()
+
+    release.set()
+    flusher.join(5)
+    waiter.join(5)
+    assert taken == [{}]
+
+
+def test_offer_rejects_values_the_column_cannot_store(service):
+    """Bad values are written directly, where the caller sees the error, instead of failing a flush"""
+    coalescer = service.write_coalescer
+    assert not coalescer.offer("segy_to_vds_status", 1, {"progress": "half"})
+    assert coalescer.offer("segy_to_vds_status", 1, {"progress": "50"})
+    assert coalescer.take("segy_to_vds_status", 1) == {"progress": 50.0}
+
+
+def test_failed_rows_are_isolated_and_eventually_dropped():
+    """One unwritable row doesn't hold back the rest of its table, and stops being retried"""
+    written = []
+
+    def flush(table_name, updates):
+        if 2 in updates:
+            raise ValueError("bad row")
+        written.extend(updates)
+
+    coalescer = WriteCoalescer({"segy_to_vds_status": {"progress"}}, 3600, TERMINAL, flush, max_requeues=2)
+    for record_id in (1, 2, 3):
+        coalescer.offer("segy_to_vds_status", record_id, {"progress": 1.0})
+
+    for _ in range(2):
+        coalescer.flush()
+        assert coalescer._pending == {("segy_to_vds_status", 2): {"progress": 1.0}}
+    assert sorted(written) == [1, 3]
+    coalescer.flush()
+    assert coalescer._pending == {}
+
+
+def test_failed_direct_write_requeues_taken_values(service, session):
+    """Buffered values merged into a direct write that fails are flushed later instead of lost"""
+    assert service.update_record("segy_to_vds_status", 2, {"progress": 75.0})["success"]
+    assert not service.update_record("segy_to_vds_status", 2, {"progress": 80.0, "bogus": 1})["success"]
+
+    service.write_coalescer.flush()
+    assert _rows(session)[2] == ("RUNNING", 75.0)
+
+
+def test_upsert_wins_over_older_buffered_values(service, session):
+    """Buffered values for columns an upsert wrote are dropped; the others are still flushed"""
+    assert service.update_record("segy_to_vds_status", 2, {"status": "STAGING", "progress": 60.0})["success"]
+    row = {"id": 2, "pod_uid": "b", "thread_id": "t", "progress": 99.0}
+    assert service.upsert_records("segy_to_vds_status", [row], ["id"])["success"]
+
+    service.write_coalescer.flush()
+    assert _rows(session)[2] == ("STAGING", 99.0)
@@ -1,4 +1,4 @@
-from fastapi import APIRouter, Depends, HTTPException, status, Request
+from fastapi import APIRouter, Depends, Header, HTTPException, status, Request
 from datetime import timedelta
 from typing import Any
 import json
@@ -9,9 +9,10 @@ from app.core.config import settings
 from app.schemas.auth import Token, LoginRequest, RefreshTokenRequest, OAuthCallback
 from app.schemas.user import UserCreate, UserResponse
 from app.services.user_service import UserService
-from app.services.session_service import SessionService
+from app.services.session_service import SESSION_FLAG_OAUTH, SESSION_FLAG_REFRESHED, SessionService
 from app.services.auth_service import AuthService
 from app.core.dependencies import get_current_user
+from app.core.user_cache import user_cache
 
 router = APIRouter()
 
@@ -117,7 +118,8 @@ async def refresh_token(
         await session_service.create_session(
             user_id=int(user_id),
             access_token=access_token,
-            refresh_token=refresh_data.refresh_token
+            refresh_token=refresh_data.refresh_token,
+            flags=SESSION_FLAG_REFRESHED
         )
         
         return {
@@ -137,6 +139,7 @@ async def refresh_token(
 @router.post("/logout")
 async def logout(
     request: Request,
+    session_id: str = Header(...),
     current_user = Depends(get_current_user),
     grpc_client = Depends(get_grpc_client),
     redis = Depends(get_redis)
@@ -155,6 +158,8 @@ async def logout(
     # Invalidate session
     session_service = SessionService(grpc_client.get_stub(), redis)
     await session_service.invalidate_session(current_user.id, token)
+    await session_service.delete_session(session_id)
+    await user_cache.invalidate(current_user.id)
     
     return {"message": "Successfully logged out"}
 
@@ -168,6 +173,7 @@ async def logout_all(
     """Logout from all sessions"""
     session_service = SessionService(grpc_client.get_stub(), redis)
     await session_service.invalidate_all_user_sessions(current_user.id)
+    await user_cache.invalidate(current_user.id)
     
     return {"message": "Successfully logged out from all sessions"}
 
@@ -208,7 +214,8 @@ async def oauth_callback(
             access_token=access_token,
             refresh_token=refresh_token,
             user_agent=request.headers.get("user-agent"),
-            ip_address=request.client.host if request.client else None
+            ip_address=request.client.host if request.client else None,
+            flags=SESSION_FLAG_OAUTH
         )
         
         # Store additional session data in Redis
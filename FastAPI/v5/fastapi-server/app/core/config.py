@@ -15,6 +15,18 @@ class Settings(BaseSettings):
     ACCESS_TOKEN_EXPIRE_MINUTES: int = 30
     REFRESH_TOKEN_EXPIRE_MINUTES: int = 60 * 24 * 7  # 7 days
     ALGORITHM: str = "HS256"
+    JWT_CACHE_MAX_ENTRIES: int = 10000  # Verified tokens kept until their exp; 0 disables
+    # "hash" keeps sessions in Redis as user id, expiry and flags; "json" stores the token pair
+    SESSION_FORMAT: str = "json"
+    
+    # Password hashing runs on its own thread pool, off the event loop
+    PASSWORD_HASH_SCHEME: str = "bcrypt"  # bcrypt or argon2; argon2 rehashes bcrypt users at login
+    PASSWORD_HASH_WORKERS: int = 4
+    PASSWORD_HASH_MAX_PENDING: int = 64  # Queued plus running; beyond this logins get a 503
+    BCRYPT_ROUNDS: int = 12
+    ARGON2_TIME_COST: int = 3
+    ARGON2_MEMORY_COST_KB: int = 65536
+    ARGON2_PARALLELISM: int = 2
     
     # gRPC Database Service
     GRPC_DATABASE_HOST: str = "localhost"
@@ -27,9 +39,34 @@ class Settings(BaseSettings):
             return v
         return f"{values.get('GRPC_DATABASE_HOST')}:{values.get('GRPC_DATABASE_PORT')}"
     
+    # Point GRPC_DATABASE_URL at a headless service (dns:///db-grpc-headless:50051)
+    # so round_robin spreads calls over every server replica
+    GRPC_CHANNEL_POOL_SIZE: int = 4
+    GRPC_LB_POLICY: str = "round_robin"
+    GRPC_KEEPALIVE_TIME_MS: int = 30000
+    GRPC_KEEPALIVE_TIMEOUT_MS: int = 10000
+    GRPC_MAX_MESSAGE_SIZE: int = 64 * 1024 * 1024
+    GRPC_TIMEOUT_SECONDS: float = 10.0  # Deadline for calls that don't set one
+    GRPC_STREAM_TIMEOUT_SECONDS: float = 300.0  # Deadline for response streams such as exports
+    
     # Redis for session management
     REDIS_URL: str = "redis://localhost:6379"
     
+    # Tracing: sampled requests are traced through the gRPC server down to SQL
+    TRACING_ENABLED: bool = False
+    TRACING_SAMPLE_RATIO: float = 0.01
+    TRACING_EXPORTER: str = "file"  # file or otlp
+    TRACING_FILE: str = "/tmp/fastapi-gateway-spans.jsonl"
+    TRACING_OTLP_ENDPOINT: str = "http://localhost:4317"
+    TRACING_MAX_QUEUE_SIZE: int = 2048
+    TRACING_EXPORT_BATCH_SIZE: int = 512
+    TRACING_EXPORT_DELAY_MS: int = 5000
+    
+    # Users resolved by get_current_user; a TTL of 0 disables the cache
+    USER_CACHE_TTL_SECONDS: int = 30
+    USER_CACHE_MAX_ENTRIES: int = 10000
+    USER_CACHE_REDIS: bool = True  # Share entries and invalidations across replicas
+    
     # OAuth2 / IdP Settings
     OAUTH2_PROVIDER_URL: str = "https://your-idp.com"
     OAUTH2_CLIENT_ID: str = ""
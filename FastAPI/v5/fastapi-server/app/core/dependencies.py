@@ -2,7 +2,6 @@ from fastapi import Depends, HTTPException, status, Header
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
 from typing import Optional
 from app.core.grpc_client import get_grpc_client, get_redis
-from app.core.security import decode_token
 from app.schemas.user import User
 from app.services.user_service import UserService
 from app.services.session_service import SessionService
@@ -17,27 +16,17 @@ async def get_current_user(
 ) -> User:
     """Dependency to get current authenticated user"""
     session_service = SessionService(grpc_client.get_stub(), redis)
-    tokens = await session_service.get_session_tokens(session_id)
+    session = await session_service.get_session(session_id)
     
-    if not tokens:
+    if not session:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Invalid or expired session",
         )
     
-    # Use access token from session
-    payload = decode_token(tokens["access_token"])
-    user_id = payload.get("sub")
-    
-    if not user_id:
-        raise HTTPException(
-            status_code=status.HTTP_401_UNAUTHORIZED,
-            detail="Invalid token payload",
-        )
-    
-    # Get user from database
+    # Get user from the user cache, falling back to the database
     user_service = UserService(grpc_client.get_stub())
-    user = await user_service.get_user_by_id(int(user_id))
+    user = await user_service.get_cached_user(session.user_id)
     
     if not user or not user.is_active:
         raise HTTPException(
@@ -1,37 +1,142 @@
 import grpc
 import asyncio
-from typing import Optional
-import redis.asyncio as aioredis
+import itertools
+import json
+from datetime import datetime, timedelta
+from typing import Any, Dict, List, Optional
 from app.core.config import settings
+from app.core.tracing import TracedRedis, client_interceptors
 from app.proto import database_pb2_grpc
 
 
+_EPOCH = datetime(1970, 1, 1)
+
+
+def channel_options() -> List[tuple]:
+    """Channel arguments for every channel in the pool"""
+    return [
+        ("grpc.service_config", json.dumps({"loadBalancingConfig": [{settings.GRPC_LB_POLICY: {}}]})),
+        ("grpc.keepalive_time_ms", settings.GRPC_KEEPALIVE_TIME_MS),
+        ("grpc.keepalive_timeout_ms", settings.GRPC_KEEPALIVE_TIMEOUT_MS),
+        ("grpc.keepalive_permit_without_calls", 1),
+        ("grpc.http2.max_pings_without_data", 0),
+        ("grpc.max_send_message_length", settings.GRPC_MAX_MESSAGE_SIZE),
+        ("grpc.max_receive_message_length", settings.GRPC_MAX_MESSAGE_SIZE),
+        # Give every pooled channel its own connections instead of a shared subchannel
+        ("grpc.use_local_subchannel_pool", 1),
+    ]
+
+
+class _DeadlineInterceptor:
+    """Applies a default deadline to calls made without one"""
+
+    def __init__(self, timeout: float):
+        self.timeout = timeout
+
+    def _details(self, details):
+        if details.timeout is not None or self.timeout <= 0:
+            return details
+        return grpc.aio.ClientCallDetails(
+            details.method, self.timeout, details.metadata, details.credentials, details.wait_for_ready
+        )
+
+
+class _UnaryUnaryDeadline(_DeadlineInterceptor, grpc.aio.UnaryUnaryClientInterceptor):
+    async def intercept_unary_unary(self, continuation, client_call_details, request):
+        return await continuation(self._details(client_call_details), request)
+
+
+class _UnaryStreamDeadline(_DeadlineInterceptor, grpc.aio.UnaryStreamClientInterceptor):
+    async def intercept_unary_stream(self, continuation, client_call_details, request):
+        return await continuation(self._details(client_call_details), request)
+
+
+class _StreamUnaryDeadline(_DeadlineInterceptor, grpc.aio.StreamUnaryClientInterceptor):
+    async def intercept_stream_unary(self, continuation, client_call_details, request_iterator):
+        return await continuation(self._details(client_call_details), request_iterator)
+
+
+def deadline_interceptors() -> list:
+    return [
+        _UnaryUnaryDeadline(settings.GRPC_TIMEOUT_SECONDS),
+        _UnaryStreamDeadline(settings.GRPC_STREAM_TIMEOUT_SECONDS),
+        _StreamUnaryDeadline(settings.GRPC_TIMEOUT_SECONDS),
+    ]
+
+
+def from_value(value) -> Any:
+    """Decode a typed Value from a PAYLOAD_TYPED response"""
+    kind = value.WhichOneof("kind")
+    if kind is None:
+        return None
+    if kind == "timestamp_value":
+        return _EPOCH + timedelta(microseconds=value.timestamp_value)
+    if kind == "json_value":
+        return json.loads(value.json_value)
+    return getattr(value, kind)
+
+
+def record_to_dict(record) -> Dict[str, Any]:
+    return {name: from_value(value) for name, value in record.fields.items()}
+
+
+def batch_to_dicts(batch) -> List[Dict[str, Any]]:
+    """Turn a column-major RecordBatch into one dict per row"""
+    names = [column.name for column in batch.columns]
+    columns = [[from_value(value) for value in column.values] for column in batch.columns]
+    return [dict(zip(names, row)) for row in zip(*columns)]
+
+
 class GRPCDatabaseClient:
-    def __init__(self):
-        self.channel = None
-        self.stub = None
+    """Pool of channels to the database service, handed out round-robin.
+
+    Each channel keeps its own HTTP/2 connections and balances over every
+    address GRPC_DATABASE_URL resolves to, so calls spread across server
+    replicas and a slow stream only holds up its own connection.
+    """
+
+    def __init__(self, pool_size: Optional[int] = None):
+        self.pool_size = max(pool_size or settings.GRPC_CHANNEL_POOL_SIZE, 1)
+        self.channels: List[grpc.aio.Channel] = []
+        self.stubs: List[database_pb2_grpc.DatabaseServiceStub] = []
+        self._next_stub = itertools.count()
+    
+    @property
+    def stub(self):
+        return self.stubs[0] if self.stubs else None
     
     async def connect(self):
-        """Establish gRPC connection"""
-        if self.channel is None:
-            self.channel = grpc.aio.insecure_channel(settings.GRPC_DATABASE_URL)
-            self.stub = database_pb2_grpc.DatabaseServiceStub(self.channel)
+        """Establish gRPC connections"""
+        if not self.channels:
+            interceptors = deadline_interceptors()
+            if settings.TRACING_ENABLED:
+                interceptors += client_interceptors()
+            for _ in range(self.pool_size):
+                channel = grpc.aio.insecure_channel(
+                    settings.GRPC_DATABASE_URL, options=channel_options(), interceptors=interceptors
+                )
+                self.channels.append(channel)
+                self.stubs.append(database_pb2_grpc.DatabaseServiceStub(channel))
     
     async def close(self):
-        """Close gRPC connection"""
-        if self.channel:
-            await self.channel.close()
+        """Close gRPC connections"""
+        channels, self.channels, self.stubs = self.channels, [], []
+        for channel in channels:
+            await channel.close()
     
     def get_stub(self):
-        """Get gRPC stub"""
-        return self.stub
+        """Get the next gRPC stub in round-robin order"""
+        stubs = self.stubs
+        if not stubs:
+            raise RuntimeError("gRPC client not connected")
+        return stubs[next(self._next_stub) % len(stubs)]
 
 
 # Global gRPC client instance
 grpc_client = GRPCDatabaseClient()
 
 # Redis for session management
-async_redis_client = aioredis.from_url(settings.REDIS_URL, decode_responses=True)
+async_redis_client = TracedRedis.from_url(settings.REDIS_URL, decode_responses=True)
 
 
 # Dependency to get gRPC client
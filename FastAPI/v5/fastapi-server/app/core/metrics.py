@@ -0,0 +1,20 @@
+"""Prometheus metrics for the gateway, served on /metrics"""
+from prometheus_client import Counter, Gauge, Histogram
+
+LATENCY_BUCKETS = (0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10)
+
+PASSWORD_HASH_QUEUE_TIME = Histogram(
+    "password_hash_queue_seconds", "Time a password hash or check waited for a hashing thread",
+    ["operation"], buckets=LATENCY_BUCKETS
+)
+PASSWORD_HASH_TIME = Histogram(
+    "password_hash_seconds", "Time spent hashing or checking a password",
+    ["operation"], buckets=LATENCY_BUCKETS
+)
+PASSWORD_HASH_IN_FLIGHT = Gauge("password_hash_in_flight", "Password hashes and checks queued or running")
+PASSWORD_HASH_REJECTED = Counter(
+    "password_hash_rejected_total", "Password hashes and checks refused because the pool was full", ["operation"]
+)
+JWT_CACHE_LOOKUPS = Counter("jwt_cache_lookups_total", "Token verification cache lookups", ["result"])
+SESSION_LOOKUPS = Counter("session_lookups_total", "Session lookups by stored format", ["format"])
+PASSWORD_REHASHES = Counter("password_rehash_total", "Stored hashes upgraded to the current scheme at login")
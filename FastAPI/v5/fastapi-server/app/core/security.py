@@ -1,11 +1,42 @@
+import asyncio
+import hashlib
+import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta
-from typing import Optional, Union
+from typing import Dict, Optional, Tuple, Union
 from jose import JWTError, jwt
 from passlib.context import CryptContext
 from fastapi import HTTPException, status
 from app.core.config import settings
+from app.core.metrics import (
+    JWT_CACHE_LOOKUPS, PASSWORD_HASH_IN_FLIGHT, PASSWORD_HASH_QUEUE_TIME, PASSWORD_HASH_REJECTED, PASSWORD_HASH_TIME
+)
 
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+
+def _crypt_context() -> CryptContext:
+    """bcrypt, or argon2id with bcrypt kept for verifying and upgrading old hashes"""
+    if settings.PASSWORD_HASH_SCHEME == "argon2":
+        # Needs argon2-cffi, only imported once a password is hashed or checked
+        return CryptContext(
+            schemes=["argon2", "bcrypt"],
+            deprecated=["bcrypt"],
+            argon2__type="ID",
+            argon2__rounds=settings.ARGON2_TIME_COST,
+            argon2__memory_cost=settings.ARGON2_MEMORY_COST_KB,
+            argon2__parallelism=settings.ARGON2_PARALLELISM,
+            bcrypt__rounds=settings.BCRYPT_ROUNDS
+        )
+    if settings.PASSWORD_HASH_SCHEME == "bcrypt":
+        return CryptContext(schemes=["bcrypt"], deprecated="auto", bcrypt__rounds=settings.BCRYPT_ROUNDS)
+    raise ValueError(f"Unknown password hash scheme: {settings.PASSWORD_HASH_SCHEME}")
+
+
+pwd_context = _crypt_context()
+
+# bcrypt and argon2-cffi release the GIL, so hashes on these threads run in parallel
+_hash_executor = ThreadPoolExecutor(max_workers=settings.PASSWORD_HASH_WORKERS, thread_name_prefix="password-hash")
+_hash_pending = 0
 
 
 def create_access_token(data: dict, expires_delta: Optional[timedelta] = None):
@@ -36,13 +67,76 @@ def get_password_hash(password: str) -> str:
     return pwd_context.hash(password)
 
 
+async def _run_hash(operation: str, func, *args):
+    """Run a hash function on the hashing pool, refusing work once it is full"""
+    global _hash_pending
+    if _hash_pending >= settings.PASSWORD_HASH_MAX_PENDING:
+        PASSWORD_HASH_REJECTED.labels(operation).inc()
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="Too many password checks in progress, try again shortly",
+            headers={"Retry-After": "1"},
+        )
+
+    queued_at = time.perf_counter()
+
+    def timed():
+        started = time.perf_counter()
+        PASSWORD_HASH_QUEUE_TIME.labels(operation).observe(started - queued_at)
+        try:
+            return func(*args)
+        finally:
+            PASSWORD_HASH_TIME.labels(operation).observe(time.perf_counter() - started)
+
+    _hash_pending += 1
+    PASSWORD_HASH_IN_FLIGHT.inc()
+    try:
+        return await asyncio.get_running_loop().run_in_executor(_hash_executor, timed)
+    finally:
+        _hash_pending -= 1
+        PASSWORD_HASH_IN_FLIGHT.dec()
+
+
+async def get_password_hash_async(password: str) -> str:
+    return await _run_hash("hash", pwd_context.hash, password)
+
+
+async def verify_password_async(plain_password: str, hashed_password: str) -> Tuple[bool, Optional[str]]:
+    """Check a password off the event loop.
+
+    Returns (valid, new_hash); new_hash is set when the stored hash uses a
+    deprecated scheme or cost and should be replaced.
+    """
+    return await _run_hash("verify", pwd_context.verify_and_update, plain_password, hashed_password)
+
+
+# Verified payloads by token digest, each kept until its own exp
+_verified_tokens: "OrderedDict[bytes, Tuple[float, Dict]]" = OrderedDict()
+
+
 def decode_token(token: str) -> dict:
+    """Verify a token, reusing the result for a token already verified and not yet expired"""
+    digest = hashlib.sha256(token.encode()).digest() if settings.JWT_CACHE_MAX_ENTRIES > 0 else None
+    if digest is not None:
+        entry = _verified_tokens.get(digest)
+        if entry is not None:
+            if entry[0] > time.time():
+                _verified_tokens.move_to_end(digest)
+                JWT_CACHE_LOOKUPS.labels("hit").inc()
+                return dict(entry[1])
+            del _verified_tokens[digest]
+        JWT_CACHE_LOOKUPS.labels("miss").inc()
     try:
         payload = jwt.decode(token, settings.SECRET_KEY, algorithms=[settings.ALGORITHM])
-        return payload
     except JWTError:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Could not validate credentials",
             headers={"WWW-Authenticate": "Bearer"},
         )
+    # Tokens without a numeric exp are verified every time
+    if digest is not None and isinstance(payload.get("exp"), (int, float)):
+        _verified_tokens[digest] = (payload["exp"], dict(payload))
+        while len(_verified_tokens) > settings.JWT_CACHE_MAX_ENTRIES:
+            _verified_tokens.popitem(last=False)
+    return payload
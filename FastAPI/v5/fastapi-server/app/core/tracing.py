@@ -0,0 +1,213 @@
+"""OpenTelemetry tracing for the gateway.
+
+A sampled request gets a server span from ``TracingMiddleware``, a client
+span per gRPC call that carries the W3C ``traceparent`` to the database
+service, and a span per Redis command. The database service follows the
+sampling decision in that header, so one trace covers the HTTP request,
+the RPCs it made and the SQL they ran. Unsampled requests still forward
+the header, which keeps the database service from sampling them again.
+"""
+import asyncio
+import threading
+from typing import Optional, Sequence
+
+import grpc
+import redis.asyncio as aioredis
+from opentelemetry import context as otel_context
+from opentelemetry import propagate, trace
+from opentelemetry.sdk.resources import Resource
+from opentelemetry.sdk.trace import ReadableSpan, TracerProvider
+from opentelemetry.sdk.trace.export import BatchSpanProcessor, SpanExporter, SpanExportResult
+from opentelemetry.sdk.trace.sampling import ParentBased, TraceIdRatioBased
+from opentelemetry.trace import SpanKind, Status, StatusCode
+from starlette.routing import Match
+
+from app.core.config import settings
+
+tracer = trace.get_tracer("fastapi-gateway")
+
+
+class JsonLinesSpanExporter(SpanExporter):
+    """Appends finished spans to a file, one JSON object per line"""
+
+    def __init__(self, path: str):
+        self._lock = threading.Lock()
+        self._file = open(path, "a", encoding="utf-8")
+
+    def export(self, spans: Sequence[ReadableSpan]) -> SpanExportResult:
+        lines = "".join(span.to_json(indent=None) + "\n" for span in spans)
+        with self._lock:
+            self._file.write(lines)
+            self._file.flush()
+        return SpanExportResult.SUCCESS
+
+    def shutdown(self):
+        with self._lock:
+            self._file.close()
+
+
+def _exporter() -> SpanExporter:
+    if settings.TRACING_EXPORTER == "otlp":
+        from opentelemetry.exporter.otlp.proto.grpc.trace_exporter import OTLPSpanExporter
+        return OTLPSpanExporter(endpoint=settings.TRACING_OTLP_ENDPOINT, insecure=True)
+    if settings.TRACING_EXPORTER == "file":
+        return JsonLinesSpanExporter(settings.TRACING_FILE)
+    raise ValueError(f"Unknown tracing exporter: {settings.TRACING_EXPORTER}")
+
+
+def setup_tracing(service_name: str = "fastapi-gateway") -> Optional[TracerProvider]:
+    """Install the tracer provider, or return None when tracing is disabled"""
+    if not settings.TRACING_ENABLED:
+        return None
+    provider = TracerProvider(
+        resource=Resource.create({"service.name": service_name}),
+        sampler=ParentBased(TraceIdRatioBased(min(max(settings.TRACING_SAMPLE_RATIO, 0.0), 1.0)))
+    )
+    provider.add_span_processor(BatchSpanProcessor(
+        _exporter(),
+        max_queue_size=settings.TRACING_MAX_QUEUE_SIZE,
+        max_export_batch_size=settings.TRACING_EXPORT_BATCH_SIZE,
+        schedule_delay_millis=settings.TRACING_EXPORT_DELAY_MS
+    ))
+    trace.set_tracer_provider(provider)
+    return provider
+
+
+# ================================
+# HTTP server spans
+# ================================
+
+def _route_template(scope) -> Optional[str]:
+    """The matched route's path template, so span names don't carry ids"""
+    route = scope.get("route")
+    if route is not None:
+        return getattr(route, "path", None)
+    app = scope.get("app")
+    for route in getattr(app, "routes", ()):
+        match, _ = route.matches(scope)
+        if match == Match.FULL:
+            return getattr(route, "path", None)
+    return None
+
+
+class TracingMiddleware:
+    """Server span per HTTP request, parented on an incoming traceparent header"""
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        headers = {key.decode("latin-1"): value.decode("latin-1") for key, value in scope["headers"]}
+        parent = propagate.extract(headers)
+        method = scope["method"]
+        span = tracer.start_span(
+            f"{method} {scope['path']}",
+            context=parent,
+            kind=SpanKind.SERVER,
+            attributes={"http.method": method, "http.target": scope["path"]}
+        )
+        token = otel_context.attach(trace.set_span_in_context(span, parent))
+
+        async def send_with_status(message):
+            if message["type"] == "http.response.start":
+                span.set_attribute("http.status_code", message["status"])
+                if message["status"] >= 500:
+                    span.set_status(Status(StatusCode.ERROR))
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_status)
+        except Exception as e:
+            span.record_exception(e)
+            span.set_status(Status(StatusCode.ERROR, str(e)))
+            raise
+        finally:
+            if span.is_recording():
+                template = _route_template(scope)
+                if template:
+                    span.set_attribute("http.route", template)
+                    span.update_name(f"{method} {template}")
+            otel_context.detach(token)
+            span.end()
+
+
+# ================================
+# gRPC client spans
+# ================================
+
+def _client_call_details(details, metadata):
+    return grpc.aio.ClientCallDetails(
+        details.method, details.timeout, metadata, details.credentials, details.wait_for_ready
+    )
+
+
+class _TracingClientInterceptor:
+    def _start(self, details):
+        method = details.method.decode() if isinstance(details.method, bytes) else details.method
+        service, _, name = method.lstrip("/").rpartition("/")
+        span = tracer.start_span(
+            method.lstrip("/"),
+            kind=SpanKind.CLIENT,
+            attributes={"rpc.system": "grpc", "rpc.service": service, "rpc.method": name}
+        )
+        carrier = {}
+        propagate.inject(carrier, context=trace.set_span_in_context(span))
+        metadata = grpc.aio.Metadata(*(details.metadata or ()))
+        for key, value in carrier.items():
+            metadata.add(key, value)
+        return span, _client_call_details(details, metadata)
+
+    def _end_when_done(self, span, call):
+        async def finish():
+            code = await call.code()
+            span.set_attribute("rpc.grpc.status_code", code.value[0])
+            if code != grpc.StatusCode.OK:
+                span.set_status(Status(StatusCode.ERROR, await call.details()))
+            span.end()
+
+        call.add_done_callback(lambda _: asyncio.ensure_future(finish()))
+        return call
+
+
+class TracingUnaryUnaryInterceptor(_TracingClientInterceptor, grpc.aio.UnaryUnaryClientInterceptor):
+    async def intercept_unary_unary(self, continuation, client_call_details, request):
+        span, details = self._start(client_call_details)
+        return self._end_when_done(span, await continuation(details, request))
+
+
+class TracingUnaryStreamInterceptor(_TracingClientInterceptor, grpc.aio.UnaryStreamClientInterceptor):
+    async def intercept_unary_stream(self, continuation, client_call_details, request):
+        span, details = self._start(client_call_details)
+        return self._end_when_done(span, await continuation(details, request))
+
+
+class TracingStreamUnaryInterceptor(_TracingClientInterceptor, grpc.aio.StreamUnaryClientInterceptor):
+    async def intercept_stream_unary(self, continuation, client_call_details, request_iterator):
+        span, details = self._start(client_call_details)
+        return self._end_when_done(span, await continuation(details, request_iterator))
+
+
+def client_interceptors():
+    return [TracingUnaryUnaryInterceptor(), TracingUnaryStreamInterceptor(), TracingStreamUnaryInterceptor()]
+
+
+# ================================
+# Redis spans
+# ================================
+
+class TracedRedis(aioredis.Redis):
+    """Redis client with a span per command under sampled requests"""
+
+    async def execute_command(self, *args, **options):
+        if not trace.get_current_span().is_recording():
+            return await super().execute_command(*args, **options)
+        command = str(args[0]).upper() if args else ""
+        with tracer.start_as_current_span(
+            f"redis {command}", kind=SpanKind.CLIENT,
+            attributes={"db.system": "redis", "db.operation": command}
+        ):
+            return await super().execute_command(*args, **options)
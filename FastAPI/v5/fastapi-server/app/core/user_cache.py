@@ -0,0 +1,158 @@
+"""Short-lived cache of the users that get_current_user resolves.
+
+Every protected endpoint needs the current ``User``; without a cache that
+is a gRPC GetRecord per request. Users are kept in an in-process LRU for
+``USER_CACHE_TTL_SECONDS`` and, with ``USER_CACHE_REDIS``, shared through
+Redis so a replica's first request for a user skips the database too.
+
+Writes through ``UserService`` and logouts call ``invalidate``, which
+drops the Redis copy and publishes the user id so sibling replicas drop
+their local entries. Each user has a generation number that ``invalidate``
+bumps; a lookup that raced with an invalidation doesn't store what it read.
+"""
+import asyncio
+import logging
+import time
+import uuid
+from collections import OrderedDict
+from typing import Awaitable, Callable, Dict, Optional, Tuple
+
+from redis.exceptions import RedisError
+
+from app.core.config import settings
+from app.core.grpc_client import async_redis_client
+from app.schemas.user import User
+
+logger = logging.getLogger(__name__)
+
+INVALIDATION_CHANNEL = "user_cache:invalidate"
+
+
+class UserCache:
+    def __init__(self, ttl: float, max_entries: int, redis=None):
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self._redis = redis
+        self._entries: "OrderedDict[int, Tuple[float, User]]" = OrderedDict()
+        self._generations: Dict[int, int] = {}
+        self._instance_id = uuid.uuid4().hex
+        self._listener: Optional[asyncio.Task] = None
+        self.hits = 0
+        self.redis_hits = 0
+        self.misses = 0
+        self.invalidations = 0
+
+    @classmethod
+    def from_settings(cls, redis=None) -> "UserCache":
+        return cls(
+            settings.USER_CACHE_TTL_SECONDS,
+            settings.USER_CACHE_MAX_ENTRIES,
+            redis if settings.USER_CACHE_REDIS else None
+        )
+
+    @property
+    def enabled(self) -> bool:
+        return self.ttl > 0
+
+    async def get_user(self, user_id: int, loader: Callable[[int], Awaitable[Optional[User]]]) -> Optional[User]:
+        """The cached user, or ``loader(user_id)`` stored for the next request"""
+        if not self.enabled:
+            return await loader(user_id)
+
+        entry = self._entries.get(user_id)
+        if entry is not None and entry[0] >= time.monotonic():
+            self._entries.move_to_end(user_id)
+            self.hits += 1
+            return entry[1]
+
+        generation = self._generations.get(user_id, 0)
+        user = await self._redis_get(user_id)
+        if user is not None:
+            self.redis_hits += 1
+        else:
+            self.misses += 1
+            user = await loader(user_id)
+            if user is None:
+                return None
+            if self._generations.get(user_id, 0) == generation:
+                await self._redis_put(user)
+
+        if self._generations.get(user_id, 0) == generation:
+            self._store(user_id, user)
+        return user
+
+    async def invalidate(self, user_id: int, broadcast: bool = True):
+        self._generations[user_id] = self._generations.get(user_id, 0) + 1
+        self._entries.pop(user_id, None)
+        self.invalidations += 1
+        if broadcast and self._redis is not None:
+            try:
+                await self._redis.delete(self._redis_key(user_id))
+                await self._redis.publish(INVALIDATION_CHANNEL, f"{self._instance_id}:{user_id}")
+            except RedisError as e:
+                logger.warning("User cache invalidation broadcast failed for user %s: %s", user_id, e)
+
+    async def start(self):
+        """Listen for invalidations from sibling replicas"""
+        if self.enabled and self._redis is not None and self._listener is None:
+            self._listener = asyncio.create_task(self._listen())
+
+    async def stop(self):
+        if self._listener is not None:
+            self._listener.cancel()
+            try:
+                await self._listener
+            except asyncio.CancelledError:
+                pass
+            self._listener = None
+
+    def _store(self, user_id: int, user: User):
+        self._entries[user_id] = (time.monotonic() + self.ttl, user)
+        self._entries.move_to_end(user_id)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    # Redis: one key per user, without the password hash
+
+    def _redis_key(self, user_id: int) -> str:
+        return f"user_cache:{user_id}"
+
+    async def _redis_get(self, user_id: int) -> Optional[User]:
+        if self._redis is None:
+            return None
+        try:
+            payload = await self._redis.get(self._redis_key(user_id))
+        except RedisError as e:
+            logger.warning("User cache read from Redis failed for user %s: %s", user_id, e)
+            return None
+        return User.parse_raw(payload) if payload else None
+
+    async def _redis_put(self, user: User):
+        if self._redis is None:
+            return
+        try:
+            await self._redis.set(
+                self._redis_key(user.id), user.json(exclude={"hashed_password"}), ex=max(int(self.ttl), 1)
+            )
+        except RedisError as e:
+            logger.warning("User cache write to Redis failed for user %s: %s", user.id, e)
+
+    async def _listen(self):
+        """Drop local entries for users written through sibling replicas"""
+        while True:
+            pubsub = self._redis.pubsub(ignore_subscribe_messages=True)
+            try:
+                await pubsub.subscribe(INVALIDATION_CHANNEL)
+                async for message in pubsub.listen():
+                    data = message["data"]
+                    instance_id, _, user_id = (data.decode() if isinstance(data, bytes) else data).partition(":")
+                    if instance_id != self._instance_id and user_id.isdigit():
+                        await self.invalidate(int(user_id), broadcast=False)
+            except RedisError as e:
+                logger.warning("User cache invalidation listener failed, retrying: %s", e)
+                await asyncio.sleep(1)
+            finally:
+                await pubsub.reset()
+
+
+user_cache = UserCache.from_settings(async_redis_client)
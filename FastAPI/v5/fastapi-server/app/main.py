@@ -1,21 +1,26 @@
 from fastapi import FastAPI, HTTPException
+from fastapi.responses import Response, StreamingResponse
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.middleware.trustedhost import TrustedHostMiddleware
 from fastapi.middleware.gzip import GZipMiddleware
 from contextlib import asynccontextmanager
 from datetime import datetime
 from pydantic import BaseModel
+import json
+from prometheus_client import CONTENT_TYPE_LATEST, generate_latest
 
 from app.core.config import settings
 from app.core.grpc_client import startup_grpc, shutdown_grpc
+from app.core.tracing import TracingMiddleware, setup_tracing
+from app.core.user_cache import user_cache
 from app.api.v1 import auth, users, protected
 import grpc
 #from app.proto import database_service_pb2, database_service_pb2_grpc
 from app.proto import database_pb2, database_pb2_grpc
 
 from fastapi import Path, Query
-from typing import Optional
-from app.core.grpc_client import get_grpc_client
+from typing import List, Literal, Optional
+from app.core.grpc_client import get_grpc_client, batch_to_dicts, record_to_dict
 
 
 # Define request model for CreateRecord endpoint
@@ -28,6 +33,7 @@ class UpdateRecordRequestModel(BaseModel):
     table_name: str
     record_id: int
     data: str  # JSON string
+    return_record: bool = False
 
 class GetOrDeleteRequestModel(BaseModel):
     table_name: str
@@ -38,15 +44,24 @@ class ListRecordsRequestModel(BaseModel):
     page: Optional[int] = 1
     page_size: Optional[int] = 50
     filter_conditions: Optional[str] = None
+    after_id: Optional[int] = None  # Keyset cursor from a previous next_cursor
+    typed: bool = False  # Fetch typed values and return records as objects
+    fields: Optional[List[str]] = None  # Columns to return; large text columns are skipped by default
+    count_mode: Literal["exact", "none", "estimate", "cached"] = "exact"
 
 
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
-    # Startup: create gRPC channel and stub
+    # Startup: install tracing, then create gRPC channel and stub
+    tracer_provider = setup_tracing()
     await startup_grpc()
+    await user_cache.start()
     yield
+    await user_cache.stop()
     await shutdown_grpc()
+    if tracer_provider is not None:
+        tracer_provider.shutdown()
 
 
 app = FastAPI(
@@ -72,6 +87,10 @@ app.add_middleware(
 
 app.add_middleware(GZipMiddleware, minimum_size=1000)
 
+# Added last so the request span covers the other middleware too
+if settings.TRACING_ENABLED:
+    app.add_middleware(TracingMiddleware)
+
 # Routes
 app.include_router(auth.router, prefix=f"{settings.API_V1_STR}/auth", tags=["auth"])
 app.include_router(users.router, prefix=f"{settings.API_V1_STR}/users", tags=["users"])
@@ -116,19 +135,23 @@ async def create_record_via_grpc(
 async def get_record_via_grpc(
     table_name: str = Query(...),
     record_id: int = Query(...),
+    typed: bool = Query(False),
+    fields: Optional[List[str]] = Query(None),
     grpc_client=Depends(get_grpc_client)
 ):
     try:
         stub = grpc_client.get_stub()
         grpc_request = database_pb2.GetRecordRequest(
             table_name=table_name,
-            record_id=record_id
+            record_id=record_id,
+            format=database_pb2.PAYLOAD_TYPED if typed else database_pb2.PAYLOAD_JSON,
+            fields=fields or []
         )
         grpc_response = await stub.GetRecord(grpc_request)
         return {
             "success": grpc_response.success,
             "message": grpc_response.message,
-            "data": grpc_response.data
+            "data": record_to_dict(grpc_response.record) if grpc_response.HasField("record") else grpc_response.data
         }
     except grpc.aio.AioRpcError as e:
         raise HTTPException(status_code=500, detail=f"gRPC error: {e.details()}")
@@ -143,12 +166,16 @@ async def update_record_via_grpc(
         grpc_request = database_pb2.UpdateRecordRequest(
             table_name=request.table_name,
             record_id=request.record_id,
-            data=request.data
+            data=request.data,
+            return_record=request.return_record
         )
         grpc_response = await stub.UpdateRecord(grpc_request)
+        if request.table_name == "users":
+            await user_cache.invalidate(request.record_id)
         return {
             "success": grpc_response.success,
-            "message": grpc_response.message
+            "message": grpc_response.message,
+            "data": grpc_response.data
         }
     except grpc.aio.AioRpcError as e:
         raise HTTPException(status_code=500, detail=f"gRPC error: {e.details()}")
@@ -166,6 +193,8 @@ async def delete_record_via_grpc(
             record_id=record_id
         )
         grpc_response = await stub.DeleteRecord(grpc_request)
+        if table_name == "users":
+            await user_cache.invalidate(record_id)
         return {
             "success": grpc_response.success,
             "message": grpc_response.message
@@ -184,18 +213,61 @@ async def list_records_via_grpc(
             table_name=request.table_name,
             page=request.page,
             page_size=request.page_size,
-            filter_conditions=request.filter_conditions or ""
+            filter=request.filter_conditions or "",
+            after_id=request.after_id or 0,
+            format=database_pb2.PAYLOAD_TYPED if request.typed else database_pb2.PAYLOAD_JSON,
+            fields=request.fields or [],
+            count_mode=database_pb2.CountMode.Value(f"COUNT_{request.count_mode.upper()}")
         )
         grpc_response = await stub.ListRecords(grpc_request)
+        if grpc_response.HasField("batch"):
+            records = batch_to_dicts(grpc_response.batch)
+        else:
+            records = list(grpc_response.records) if grpc_response.records else []
         return {
             "success": grpc_response.success,
             "message": grpc_response.message,
             "total_count": grpc_response.total_count,
-            "records": list(grpc_response.records) if grpc_response.records else []
+            "count_mode": database_pb2.CountMode.Name(grpc_response.count_mode)[len("COUNT_"):].lower(),
+            "records": records,
+            "next_cursor": grpc_response.next_cursor,
+            "has_more": grpc_response.has_more
         }
     except grpc.aio.AioRpcError as e:
         raise HTTPException(status_code=500, detail=f"gRPC error: {e.details()}")
 
+@app.get(f"{settings.API_V1_STR}/grpc/export_records")
+async def export_records_via_grpc(
+    table_name: str = Query(...),
+    filter_conditions: Optional[str] = Query(None),
+    chunk_size: int = Query(500),
+    after_id: Optional[int] = Query(None),
+    fields: Optional[List[str]] = Query(None),
+    grpc_client=Depends(get_grpc_client)
+):
+    """Stream a table as newline-delimited JSON straight from ListRecordsStream"""
+    stub = grpc_client.get_stub()
+    grpc_request = database_pb2.ListRecordsStreamRequest(
+        table_name=table_name,
+        filter=filter_conditions or "",
+        chunk_size=chunk_size,
+        after_id=after_id or 0,
+        fields=fields or []
+    )
+
+    async def ndjson_rows():
+        try:
+            async for chunk in stub.ListRecordsStream(grpc_request):
+                if not chunk.success:
+                    # Headers are already sent, so report the failure in-band
+                    yield json.dumps({"error": chunk.message}) + "\n"
+                    return
+                yield "".join(record + "\n" for record in chunk.records)
+        except grpc.aio.AioRpcError as e:
+            yield json.dumps({"error": f"gRPC error: {e.details()}"}) + "\n"
+
+    return StreamingResponse(ndjson_rows(), media_type="application/x-ndjson")
+
 # If instead startup_grpc sets channel/stub, import and use those
 
 
@@ -227,6 +299,11 @@ async def root():
     return {"message": f"Welcome to {settings.PROJECT_NAME}"}
 
 
+@app.get("/metrics")
+async def metrics():
+    return Response(generate_latest(), media_type=CONTENT_TYPE_LATEST)
+
+
 @app.get("/health")
 async def health_check():
     return {
@@ -24,57 +24,129 @@ _sym_db = _symbol_database.Default()
 
 
 
-DESCRIPTOR = _descriptor_pool.Default().AddSerializedFile(b'\n\x16\x64\x61tabase_service.proto\x12\x08\x64\x61tabase\"7\n\x13\x43reateRecordRequest\x12\x12\n\ntable_name\x18\x01 \x01(\t\x12\x0c\n\x04\x64\x61ta\x18\x02 \x01(\t\"K\n\x14\x43reateRecordResponse\x12\x0f\n\x07success\x18\x01 \x01(\x08\x12\x0f\n\x07message\x18\x02 \x01(\t\x12\x11\n\trecord_id\x18\x03 \x01(\x03\"9\n\x10GetRecordRequest\x12\x12\n\ntable_name\x18\x01 \x01(\t\x12\x11\n\trecord_id\x18\x02 \x01(\x03\"C\n\x11GetRecordResponse\x12\x0f\n\x07success\x18\x01 \x01(\x08\x12\x0f\n\x07message\x18\x02 \x01(\t\x12\x0c\n\x04\x64\x61ta\x18\x03 \x01(\t\"J\n\x13UpdateRecordRequest\x12\x12\n\ntable_name\x18\x01 \x01(\t\x12\x11\n\trecord_id\x18\x02 \x01(\x03\x12\x0c\n\x04\x64\x61ta\x18\x03 \x01(\t\"8\n\x14UpdateRecordResponse\x12\x0f\n\x07success\x18\x01 \x01(\x08\x12\x0f\n\x07message\x18\x02 \x01(\t\"<\n\x13\x44\x65leteRecordRequest\x12\x12\n\ntable_name\x18\x01 \x01(\t\x12\x11\n\trecord_id\x18\x02 \x01(\x03\"8\n\x14\x44\x65leteRecordResponse\x12\x0f\n\x07success\x18\x01 \x01(\x08\x12\x0f\n\x07message\x18\x02 \x01(\t\"Y\n\x12ListRecordsRequest\x12\x12\n\ntable_name\x18\x01 \x01(\t\x12\x0c\n\x04page\x18\x02 \x01(\x05\x12\x11\n\tpage_size\x18\x03 \x01(\x05\x12\x0e\n\x06\x66ilter\x18\x04 \x01(\t\"]\n\x13ListRecordsResponse\x12\x0f\n\x07success\x18\x01 \x01(\x08\x12\x0f\n\x07message\x18\x02 \x01(\t\x12\x0f\n\x07records\x18\x03 \x03(\t\x12\x13\n\x0btotal_count\x18\x04 \x01(\x05\"H\n\x10MigrationRequest\x12\x1b\n\x13migration_direction\x18\x01 \x01(\t\x12\x17\n\x0ftarget_revision\x18\x02 \x01(\t\"O\n\x11MigrationResponse\x12\x0f\n\x07success\x18\x01 \x01(\x08\x12\x0f\n\x07message\x18\x02 \x01(\t\x12\x18\n\x10\x63urrent_revision\x18\x03 \x01(\t\"\x18\n\x16MigrationStatusRequest\"`\n\x17MigrationStatusResponse\x12\x0f\n\x07success\x18\x01 \x01(\x08\x12\x18\n\x10\x63urrent_revision\x18\x02 \x01(\t\x12\x1a\n\x12pending_migrations\x18\x03 \x03(\t\">\n\x12\x43reateTableRequest\x12\x12\n\ntable_name\x18\x01 \x01(\t\x12\x14\n\x0ctable_schema\x18\x02 \x01(\t\"7\n\x13\x43reateTableResponse\x12\x0f\n\x07success\x18\x01 \x01(\x08\x12\x0f\n\x07message\x18\x02 \x01(\t\"y\n\x10\x41\x64\x64\x43olumnRequest\x12\x12\n\ntable_name\x18\x01 \x01(\t\x12\x13\n\x0b\x63olumn_name\x18\x02 \x01(\t\x12\x13\n\x0b\x63olumn_type\x18\x03 \x01(\t\x12\x10\n\x08nullable\x18\x04 \x01(\x08\x12\x15\n\rdefault_value\x18\x05 \x01(\t\"5\n\x11\x41\x64\x64\x43olumnResponse\x12\x0f\n\x07success\x18\x01 \x01(\x08\x12\x0f\n\x07message\x18\x02 \x01(\t\"<\n\x11\x44ropColumnRequest\x12\x12\n\ntable_name\x18\x01 \x01(\t\x12\x13\n\x0b\x63olumn_name\x18\x02 \x01(\t\"6\n\x12\x44ropColumnResponse\x12\x0f\n\x07success\x18\x01 \x01(\x08\x12\x0f\n\x07message\x18\x02 \x01(\t\"\x14\n\x12HealthCheckRequest\"H\n\x13HealthCheckResponse\x12\x0f\n\x07healthy\x18\x01 \x01(\x08\x12\x0f\n\x07message\x18\x02 \x01(\t\x12\x0f\n\x07version\x18\x03 \x01(\t2\xdb\x06\n\x0f\x44\x61tabaseService\x12M\n\x0c\x43reateRecord\x12\x1d.database.CreateRecordRequest\x1a\x1e.database.CreateRecordResponse\x12\x44\n\tGetRecord\x12\x1a.database.GetRecordRequest\x1a\x1b.database.GetRecordResponse\x12M\n\x0cUpdateRecord\x12\x1d.database.UpdateRecordRequest\x1a\x1e.database.UpdateRecordResponse\x12M\n\x0c\x44\x65leteRecord\x12\x1d.database.DeleteRecordRequest\x1a\x1e.database.DeleteRecordResponse\x12J\n\x0bListRecords\x12\x1c.database.ListRecordsRequest\x1a\x1d.database.ListRecordsResponse\x12G\n\x0cRunMigration\x12\x1a.database.MigrationRequest\x1a\x1b.database.MigrationResponse\x12Y\n\x12GetMigrationStatus\x12 .database.MigrationStatusRequest\x1a!.database.MigrationStatusResponse\x12J\n\x0b\x43reateTable\x12\x1c.database.CreateTableRequest\x1a\x1d.database.CreateTableResponse\x12\x44\n\tAddColumn\x12\x1a.database.AddColumnRequest\x1a\x1b.database.AddColumnResponse\x12G\n\nDropColumn\x12\x1b.database.DropColumnRequest\x1a\x1c.database.DropColumnResponse\x12J\n\x0bHealthCheck\x12\x1c.database.HealthCheckRequest\x1a\x1d.database.HealthCheckResponseb\x06proto3')
+DESCRIPTOR = _descriptor_pool.Default().AddSerializedFile(b'\n\x16\x64\x61tabase_service.proto\x12\x08\x64\x61tabase\"7\n\x13\x43reateRecordRequest\x12\x12\n\ntable_name\x18\x01 \x01(\t\x12\x0c\n\x04\x64\x61ta\x18\x02 \x01(\t\"K\n\x14\x43reateRecordResponse\x12\x0f\n\x07success\x18\x01 \x01(\x08\x12\x0f\n\x07message\x18\x02 \x01(\t\x12\x11\n\trecord_id\x18\x03 \x01(\x03\"\xb2\x01\n\x05Value\x12\x13\n\tint_value\x18\x01 \x01(\x03H\x00\x12\x16\n\x0c\x64ouble_value\x18\x02 \x01(\x01H\x00\x12\x16\n\x0cstring_value\x18\x03 \x01(\tH\x00\x12\x14\n\nbool_value\x18\x04 \x01(\x08H\x00\x12\x15\n\x0b\x62ytes_value\x18\x05 \x01(\x0cH\x00\x12\x19\n\x0ftimestamp_value\x18\x06 \x01(\x03H\x00\x12\x14\n\njson_value\x18\x07 \x01(\tH\x00\x42\x06\n\x04kind\"v\n\x06Record\x12,\n\x06\x66ields\x18\x01 \x03(\x0b\x32\x1c.database.Record.FieldsEntry\x1a>\n\x0b\x46ieldsEntry\x12\x0b\n\x03key\x18\x01 \x01(\t\x12\x1e\n\x05value\x18\x02 \x01(\x0b\x32\x0f.database.Value:\x02\x38\x01\"7\n\x06\x43olumn\x12\x0c\n\x04name\x18\x01 \x01(\t\x12\x1f\n\x06values\x18\x02 \x03(\x0b\x32\x0f.database.Value\"C\n\x0bRecordBatch\x12!\n\x07\x63olumns\x18\x01 \x03(\x0b\x32\x10.database.Column\x12\x11\n\trow_count\x18\x02 \x01(\x05\"r\n\x10GetRecordRequest\x12\x12\n\ntable_name\x18\x01 \x01(\t\x12\x11\n\trecord_id\x18\x02 \x01(\x03\x12\'\n\x06\x66ormat\x18\x03 \x01(\x0e\x32\x17.database.PayloadFormat\x12\x0e\n\x06\x66ields\x18\x04 \x03(\t\"e\n\x11GetRecordResponse\x12\x0f\n\x07success\x18\x01 \x01(\x08\x12\x0f\n\x07message\x18\x02 \x01(\t\x12\x0c\n\x04\x64\x61ta\x18\x03 \x01(\t\x12 \n\x06record\x18\x04 \x01(\x0b\x32\x10.database.Record\"a\n\x13UpdateRecordRequest\x12\x12\n\ntable_name\x18\x01 \x01(\t\x12\x11\n\trecord_id\x18\x02 \x01(\x03\x12\x0c\n\x04\x64\x61ta\x18\x03 \x01(\t\x12\x15\n\rreturn_record\x18\x04 \x01(\x08\"F\n\x14UpdateRecordResponse\x12\x0f\n\x07success\x18\x01 \x01(\x08\x12\x0f\n\x07message\x18\x02 \x01(\t\x12\x0c\n\x04\x64\x61ta\x18\x03 \x01(\t\"<\n\x13\x44\x65leteRecordRequest\x12\x12\n\ntable_name\x18\x01 \x01(\t\x12\x11\n\trecord_id\x18\x02 \x01(\x03\"8\n\x14\x44\x65leteRecordResponse\x12\x0f\n\x07success\x18\x01 \x01(\x08\x12\x0f\n\x07message\x18\x02 \x01(\t\"\xcd\x01\n\x12ListRecordsRequest\x12\x12\n\ntable_name\x18\x01 \x01(\t\x12\x0c\n\x04page\x18\x02 \x01(\x05\x12\x11\n\tpage_size\x18\x03 \x01(\x05\x12\x0e\n\x06\x66ilter\x18\x04 \x01(\t\x12\x10\n\x08\x61\x66ter_id\x18\x05 \x01(\x03\x12\'\n\x06\x66ormat\x18\x06 \x01(\x0e\x32\x17.database.PayloadFormat\x12\x0e\n\x06\x66ields\x18\x07 \x03(\t\x12\'\n\ncount_mode\x18\x08 \x01(\x0e\x32\x13.database.CountMode\"\xd3\x01\n\x13ListRecordsResponse\x12\x0f\n\x07success\x18\x01 \x01(\x08\x12\x0f\n\x07message\x18\x02 \x01(\t\x12\x0f\n\x07records\x18\x03 \x03(\t\x12\x13\n\x0btotal_count\x18\x04 \x01(\x05\x12\x13\n\x0bnext_cursor\x18\x05 \x01(\x03\x12\x10\n\x08has_more\x18\x06 \x01(\x08\x12$\n\x05\x62\x61tch\x18\x07 \x01(\x0b\x32\x15.database.RecordBatch\x12\'\n\ncount_mode\x18\x08 \x01(\x0e\x32\x13.database.CountMode\"\x9d\x01\n\x18ListRecordsStreamRequest\x12\x12\n\ntable_name\x18\x01 \x01(\t\x12\x0e\n\x06\x66ilter\x18\x02 \x01(\t\x12\x12\n\nchunk_size\x18\x03 \x01(\x05\x12\x10\n\x08\x61\x66ter_id\x18\x04 \x01(\x03\x12\'\n\x06\x66ormat\x18\x05 \x01(\x0e\x32\x17.database.PayloadFormat\x12\x0e\n\x06\x66ields\x18\x06 \x03(\t\"w\n\x0bRecordChunk\x12\x0f\n\x07success\x18\x01 \x01(\x08\x12\x0f\n\x07message\x18\x02 \x01(\t\x12\x0f\n\x07records\x18\x03 \x03(\t\x12\x0f\n\x07last_id\x18\x04 \x01(\x03\x12$\n\x05\x62\x61tch\x18\x05 \x01(\x0b\x32\x15.database.RecordBatch\"*\n\x08RowError\x12\r\n\x05index\x18\x01 \x01(\x05\x12\x0f\n\x07message\x18\x02 \x01(\t\"@\n\x19\x42\x61tchCreateRecordsRequest\x12\x12\n\ntable_name\x18\x01 \x01(\t\x12\x0f\n\x07records\x18\x02 \x03(\t\"v\n\x1a\x42\x61tchCreateRecordsResponse\x12\x0f\n\x07success\x18\x01 \x01(\x08\x12\x0f\n\x07message\x18\x02 \x01(\t\x12\x12\n\nrecord_ids\x18\x03 \x03(\x03\x12\"\n\x06\x65rrors\x18\x04 \x03(\x0b\x32\x12.database.RowError\"/\n\x0cRecordUpdate\x12\x11\n\trecord_id\x18\x01 \x01(\x03\x12\x0c\n\x04\x64\x61ta\x18\x02 \x01(\t\"X\n\x19\x42\x61tchUpdateRecordsRequest\x12\x12\n\ntable_name\x18\x01 \x01(\t\x12\'\n\x07updates\x18\x02 \x03(\x0b\x32\x16.database.RecordUpdate\"z\n\x1a\x42\x61tchUpdateRecordsResponse\x12\x0f\n\x07success\x18\x01 \x01(\x08\x12\x0f\n\x07message\x18\x02 \x01(\t\x12\x16\n\x0e\x61\x66\x66\x65\x63ted_count\x18\x03 \x01(\x05\x12\"\n\x06\x65rrors\x18\x04 \x03(\x0b\x32\x12.database.RowError\"C\n\x19\x42\x61tchDeleteRecordsRequest\x12\x12\n\ntable_name\x18\x01 \x01(\t\x12\x12\n\nrecord_ids\x18\x02 \x03(\x03\"z\n\x1a\x42\x61tchDeleteRecordsResponse\x12\x0f\n\x07success\x18\x01 \x01(\x08\x12\x0f\n\x07message\x18\x02 \x01(\t\x12\x16\n\x0e\x61\x66\x66\x65\x63ted_count\x18\x03 \x01(\x05\x12\"\n\x06\x65rrors\x18\x04 \x03(\x0b\x32\x12.database.RowError\"m\n\x14UpsertRecordsRequest\x12\x12\n\ntable_name\x18\x01 \x01(\t\x12\x0f\n\x07records\x18\x02 \x03(\t\x12\x18\n\x10\x63onflict_columns\x18\x03 \x03(\t\x12\x16\n\x0eupdate_columns\x18\x04 \x03(\t\"u\n\x15UpsertRecordsResponse\x12\x0f\n\x07success\x18\x01 \x01(\x08\x12\x0f\n\x07message\x18\x02 \x01(\t\x12\x16\n\x0e\x61\x66\x66\x65\x63ted_count\x18\x03 \x01(\x05\x12\"\n\x06\x65rrors\x18\x04 \x03(\x0b\x32\x12.database.RowError\"\\\n\x14\x41ppendRecordsRequest\x12\x12\n\ntable_name\x18\x01 \x01(\t\x12\x0f\n\x07records\x18\x02 \x03(\t\x12\x1f\n\x03\x61\x63k\x18\x03 \x01(\x0e\x32\x12.database.AckLevel\"\xa6\x01\n\x15\x41ppendRecordsResponse\x12\x0f\n\x07success\x18\x01 \x01(\x08\x12\x0f\n\x07message\x18\x02 \x01(\t\x12\x16\n\x0ereceived_count\x18\x03 \x01(\x05\x12\x16\n\x0e\x61\x63\x63\x65pted_count\x18\x04 \x01(\x05\x12\x17\n\x0f\x63ommitted_count\x18\x05 \x01(\x05\x12\"\n\x06\x65rrors\x18\x06 \x03(\x0b\x32\x12.database.RowError\"h\n\x16MeteringRollupsRequest\x12\x14\n\x0csource_table\x18\x01 \x01(\t\x12\x11\n\tstart_day\x18\x02 \x01(\t\x12\x0f\n\x07\x65nd_day\x18\x03 \x01(\t\x12\x14\n\x0cpartition_id\x18\x04 \x01(\t\"\x9d\x01\n\x0eMeteringRollup\x12\x0b\n\x03\x64\x61y\x18\x01 \x01(\t\x12\x14\n\x0csource_table\x18\x02 \x01(\t\x12\x14\n\x0cpartition_id\x18\x03 \x01(\t\x12\x16\n\x0eoperation_type\x18\x04 \x01(\t\x12\x0e\n\x06status\x18\x05 \x01(\t\x12\x14\n\x0crecord_count\x18\x06 \x01(\x03\x12\x14\n\x0c\x64\x61ta_size_mb\x18\x07 \x01(\x01\"f\n\x17MeteringRollupsResponse\x12\x0f\n\x07success\x18\x01 \x01(\x08\x12\x0f\n\x07message\x18\x02 \x01(\t\x12)\n\x07rollups\x18\x03 \x03(\x0b\x32\x18.database.MeteringRollup\"H\n\x10MigrationRequest\x12\x1b\n\x13migration_direction\x18\x01 \x01(\t\x12\x17\n\x0ftarget_revision\x18\x02 \x01(\t\"O\n\x11MigrationResponse\x12\x0f\n\x07success\x18\x01 \x01(\x08\x12\x0f\n\x07message\x18\x02 \x01(\t\x12\x18\n\x10\x63urrent_revision\x18\x03 \x01(\t\"\x18\n\x16MigrationStatusRequest\"`\n\x17MigrationStatusResponse\x12\x0f\n\x07success\x18\x01 \x01(\x08\x12\x18\n\x10\x63urrent_revision\x18\x02 \x01(\t\x12\x1a\n\x12pending_migrations\x18\x03 \x03(\t\">\n\x12\x43reateTableRequest\x12\x12\n\ntable_name\x18\x01 \x01(\t\x12\x14\n\x0ctable_schema\x18\x02 \x01(\t\"7\n\x13\x43reateTableResponse\x12\x0f\n\x07success\x18\x01 \x01(\x08\x12\x0f\n\x07message\x18\x02 \x01(\t\"y\n\x10\x41\x64\x64\x43olumnRequest\x12\x12\n\ntable_name\x18\x01 \x01(\t\x12\x13\n\x0b\x63olumn_name\x18\x02 \x01(\t\x12\x13\n\x0b\x63olumn_type\x18\x03 \x01(\t\x12\x10\n\x08nullable\x18\x04 \x01(\x08\x12\x15\n\rdefault_value\x18\x05 \x01(\t\"5\n\x11\x41\x64\x64\x43olumnResponse\x12\x0f\n\x07success\x18\x01 \x01(\x08\x12\x0f\n\x07message\x18\x02 \x01(\t\"<\n\x11\x44ropColumnRequest\x12\x12\n\ntable_name\x18\x01 \x01(\t\x12\x13\n\x0b\x63olumn_name\x18\x02 \x01(\t\"6\n\x12\x44ropColumnResponse\x12\x0f\n\x07success\x18\x01 \x01(\x08\x12\x0f\n\x07message\x18\x02 \x01(\t\"\x14\n\x12HealthCheckRequest\"H\n\x13HealthCheckResponse\x12\x0f\n\x07healthy\x18\x01 \x01(\x08\x12\x0f\n\x07message\x18\x02 \x01(\t\x12\x0f\n\x07version\x18\x03 \x01(\t\"\x12\n\x10PoolStatsRequest\",\n\x0fHistogramBucket\x12\n\n\x02le\x18\x01 \x01(\x01\x12\r\n\x05\x63ount\x18\x02 \x01(\x03\"\x81\x02\n\tPoolStats\x12\x0c\n\x04name\x18\x01 \x01(\t\x12\x0c\n\x04size\x18\x02 \x01(\x05\x12\x13\n\x0b\x63hecked_out\x18\x03 \x01(\x05\x12\x12\n\nchecked_in\x18\x04 \x01(\x05\x12\x10\n\x08overflow\x18\x05 \x01(\x05\x12\x11\n\tcheckouts\x18\x06 \x01(\x03\x12\x10\n\x08timeouts\x18\x07 \x01(\x03\x12\x10\n\x08\x63onnects\x18\x08 \x01(\x03\x12\x1b\n\x13\x63onnect_time_avg_ms\x18\t \x01(\x01\x12\x18\n\x10wait_time_sum_ms\x18\n \x01(\x01\x12/\n\x0cwait_time_ms\x18\x0b \x03(\x0b\x32\x19.database.HistogramBucket\"Y\n\x11PoolStatsResponse\x12\x0f\n\x07success\x18\x01 \x01(\x08\x12\x0f\n\x07message\x18\x02 \x01(\t\x12\"\n\x05pools\x18\x03 \x03(\x0b\x32\x13.database.PoolStats\"\x13\n\x11\x43\x61\x63heStatsRequest\"\x7f\n\x0fTableCacheStats\x12\x12\n\ntable_name\x18\x01 \x01(\t\x12\x0c\n\x04hits\x18\x02 \x01(\x03\x12\x0e\n\x06misses\x18\x03 \x01(\x03\x12\x12\n\nredis_hits\x18\x04 \x01(\x03\x12\x15\n\rinvalidations\x18\x05 \x01(\x03\x12\x0f\n\x07\x65ntries\x18\x06 \x01(\x05\"a\n\x12\x43\x61\x63heStatsResponse\x12\x0f\n\x07success\x18\x01 \x01(\x08\x12\x0f\n\x07message\x18\x02 \x01(\t\x12)\n\x06tables\x18\x03 \x03(\x0b\x32\x19.database.TableCacheStats\"(\n\x12IndexAdviceRequest\x12\x12\n\ntable_name\x18\x01 \x01(\t\"\x95\x02\n\x0bIndexAdvice\x12\x12\n\ntable_name\x18\x01 \x01(\t\x12\x18\n\x10\x65quality_columns\x18\x02 \x03(\t\x12\x15\n\rrange_columns\x18\x03 \x03(\t\x12\x15\n\rorder_columns\x18\x04 \x03(\t\x12\r\n\x05\x63\x61lls\x18\x05 \x01(\x03\x12\x12\n\nslow_calls\x18\x06 \x01(\x03\x12\x0e\n\x06\x61vg_ms\x18\x07 \x01(\x01\x12\x0e\n\x06max_ms\x18\x08 \x01(\x01\x12\x11\n\tfull_scan\x18\t \x01(\x08\x12\x0c\n\x04plan\x18\n \x01(\t\x12\x12\n\nindex_used\x18\x0b \x01(\t\x12\x17\n\x0fsuggested_index\x18\x0c \x01(\t\x12\x19\n\x11suggested_columns\x18\r \x03(\t\"v\n\x13IndexAdviceResponse\x12\x0f\n\x07success\x18\x01 \x01(\x08\x12\x0f\n\x07message\x18\x02 \x01(\t\x12%\n\x06\x61\x64vice\x18\x03 \x03(\x0b\x32\x15.database.IndexAdvice\x12\x16\n\x0emigration_stub\x18\x04 \x01(\t*4\n\rPayloadFormat\x12\x10\n\x0cPAYLOAD_JSON\x10\x00\x12\x11\n\rPAYLOAD_TYPED\x10\x01*R\n\tCountMode\x12\x0f\n\x0b\x43OUNT_EXACT\x10\x00\x12\x0e\n\nCOUNT_NONE\x10\x01\x12\x12\n\x0e\x43OUNT_ESTIMATE\x10\x02\x12\x10\n\x0c\x43OUNT_CACHED\x10\x03*-\n\x08\x41\x63kLevel\x12\x0e\n\nACK_QUEUED\x10\x00\x12\x11\n\rACK_COMMITTED\x10\x01\x32\xb5\r\n\x0f\x44\x61tabaseService\x12M\n\x0c\x43reateRecord\x12\x1d.database.CreateRecordRequest\x1a\x1e.database.CreateRecordResponse\x12\x44\n\tGetRecord\x12\x1a.database.GetRecordRequest\x1a\x1b.database.GetRecordResponse\x12M\n\x0cUpdateRecord\x12\x1d.database.UpdateRecordRequest\x1a\x1e.database.UpdateRecordResponse\x12M\n\x0c\x44\x65leteRecord\x12\x1d.database.DeleteRecordRequest\x1a\x1e.database.DeleteRecordResponse\x12J\n\x0bListRecords\x12\x1c.database.ListRecordsRequest\x1a\x1d.database.ListRecordsResponse\x12P\n\x11ListRecordsStream\x12\".database.ListRecordsStreamRequest\x1a\x15.database.RecordChunk0\x01\x12_\n\x12\x42\x61tchCreateRecords\x12#.database.BatchCreateRecordsRequest\x1a$.database.BatchCreateRecordsResponse\x12_\n\x12\x42\x61tchUpdateRecords\x12#.database.BatchUpdateRecordsRequest\x1a$.database.BatchUpdateRecordsResponse\x12_\n\x12\x42\x61tchDeleteRecords\x12#.database.BatchDeleteRecordsRequest\x1a$.database.BatchDeleteRecordsResponse\x12P\n\rUpsertRecords\x12\x1e.database.UpsertRecordsRequest\x1a\x1f.database.UpsertRecordsResponse\x12R\n\rAppendRecords\x12\x1e.database.AppendRecordsRequest\x1a\x1f.database.AppendRecordsResponse(\x01\x12Y\n\x12GetMeteringRollups\x12 .database.MeteringRollupsRequest\x1a!.database.MeteringRollupsResponse\x12G\n\x0cRunMigration\x12\x1a.database.MigrationRequest\x1a\x1b.database.MigrationResponse\x12Y\n\x12GetMigrationStatus\x12 .database.MigrationStatusRequest\x1a!.database.MigrationStatusResponse\x12J\n\x0b\x43reateTable\x12\x1c.database.CreateTableRequest\x1a\x1d.database.CreateTableResponse\x12\x44\n\tAddColumn\x12\x1a.database.AddColumnRequest\x1a\x1b.database.AddColumnResponse\x12G\n\nDropColumn\x12\x1b.database.DropColumnRequest\x1a\x1c.database.DropColumnResponse\x12J\n\x0bHealthCheck\x12\x1c.database.HealthCheckRequest\x1a\x1d.database.HealthCheckResponse\x12G\n\x0cGetPoolStats\x12\x1a.database.PoolStatsRequest\x1a\x1b.database.PoolStatsResponse\x12J\n\rGetCacheStats\x12\x1b.database.CacheStatsRequest\x1a\x1c.database.CacheStatsResponse\x12M\n\x0eGetIndexAdvice\x12\x1c.database.IndexAdviceRequest\x1a\x1d.database.IndexAdviceResponseb\x06proto3')
 
 _globals = globals()
 _builder.BuildMessageAndEnumDescriptors(DESCRIPTOR, _globals)
 _builder.BuildTopDescriptorsAndMessages(DESCRIPTOR, 'database_service_pb2', _globals)
 if not _descriptor._USE_C_DESCRIPTORS:
   DESCRIPTOR._loaded_options = None
+  _globals['_RECORD_FIELDSENTRY']._loaded_options = None
+  _globals['_RECORD_FIELDSENTRY']._serialized_options = b'8\001'
+  _globals['_PAYLOADFORMAT']._serialized_start=5259
+  _globals['_PAYLOADFORMAT']._serialized_end=5311
+  _globals['_COUNTMODE']._serialized_start=5313
+  _globals['_COUNTMODE']._serialized_end=5395
+  _globals['_ACKLEVEL']._serialized_start=5397
+  _globals['_ACKLEVEL']._serialized_end=5442
   _globals['_CREATERECORDREQUEST']._serialized_start=36
   _globals['_CREATERECORDREQUEST']._serialized_end=91
   _globals['_CREATERECORDRESPONSE']._serialized_start=93
   _globals['_CREATERECORDRESPONSE']._serialized_end=168
-  _globals['_GETRECORDREQUEST']._serialized_start=170
-  _globals['_GETRECORDREQUEST']._serialized_end=227
-  _globals['_GETRECORDRESPONSE']._serialized_start=229
-  _globals['_GETRECORDRESPONSE']._serialized_end=296
-  _globals['_UPDATERECORDREQUEST']._serialized_start=298
-  _globals['_UPDATERECORDREQUEST']._serialized_end=372
-  _globals['_UPDATERECORDRESPONSE']._serialized_start=374
-  _globals['_UPDATERECORDRESPONSE']._serialized_end=430
-  _globals['_DELETERECORDREQUEST']._serialized_start=432
-  _globals['_DELETERECORDREQUEST']._serialized_end=492
-  _globals['_DELETERECORDRESPONSE']._serialized_start=494
-  _globals['_DELETERECORDRESPONSE']._serialized_end=550
-  _globals['_LISTRECORDSREQUEST']._serialized_start=552
-  _globals['_LISTRECORDSREQUEST']._serialized_end=641
-  _globals['_LISTRECORDSRESPONSE']._serialized_start=643
-  _globals['_LISTRECORDSRESPONSE']._serialized_end=736
-  _globals['_MIGRATIONREQUEST']._serialized_start=738
-  _globals['_MIGRATIONREQUEST']._serialized_end=810
-  _globals['_MIGRATIONRESPONSE']._serialized_start=812
-  _globals['_MIGRATIONRESPONSE']._serialized_end=891
-  _globals['_MIGRATIONSTATUSREQUEST']._serialized_start=893
-  _globals['_MIGRATIONSTATUSREQUEST']._serialized_end=917
-  _globals['_MIGRATIONSTATUSRESPONSE']._serialized_start=919
-  _globals['_MIGRATIONSTATUSRESPONSE']._serialized_end=1015
-  _globals['_CREATETABLEREQUEST']._serialized_start=1017
-  _globals['_CREATETABLEREQUEST']._serialized_end=1079
-  _globals['_CREATETABLERESPONSE']._serialized_start=1081
-  _globals['_CREATETABLERESPONSE']._serialized_end=1136
-  _globals['_ADDCOLUMNREQUEST']._serialized_start=1138
-  _globals['_ADDCOLUMNREQUEST']._serialized_end=1259
-  _globals['_ADDCOLUMNRESPONSE']._serialized_start=1261
-  _globals['_ADDCOLUMNRESPONSE']._serialized_end=1314
-  _globals['_DROPCOLUMNREQUEST']._serialized_start=1316
-  _globals['_DROPCOLUMNREQUEST']._serialized_end=1376
-  _globals['_DROPCOLUMNRESPONSE']._serialized_start=1378
-  _globals['_DROPCOLUMNRESPONSE']._serialized_end=1432
-  _globals['_HEALTHCHECKREQUEST']._serialized_start=1434
-  _globals['_HEALTHCHECKREQUEST']._serialized_end=1454
-  _globals['_HEALTHCHECKRESPONSE']._serialized_start=1456
-  _globals['_HEALTHCHECKRESPONSE']._serialized_end=1528
-  _globals['_DATABASESERVICE']._serialized_start=1531
-  _globals['_DATABASESERVICE']._serialized_end=2390
+  _globals['_VALUE']._serialized_start=171
+  _globals['_VALUE']._serialized_end=349
+  _globals['_RECORD']._serialized_start=351
+  _globals['_RECORD']._serialized_end=469
+  _globals['_RECORD_FIELDSENTRY']._serialized_start=407
+  _globals['_RECORD_FIELDSENTRY']._serialized_end=469
+  _globals['_COLUMN']._serialized_start=471
+  _globals['_COLUMN']._serialized_end=526
+  _globals['_RECORDBATCH']._serialized_start=528
+  _globals['_RECORDBATCH']._serialized_end=595
+  _globals['_GETRECORDREQUEST']._serialized_start=597
+  _globals['_GETRECORDREQUEST']._serialized_end=711
+  _globals['_GETRECORDRESPONSE']._serialized_start=713
+  _globals['_GETRECORDRESPONSE']._serialized_end=814
+  _globals['_UPDATERECORDREQUEST']._serialized_start=816
+  _globals['_UPDATERECORDREQUEST']._serialized_end=913
+  _globals['_UPDATERECORDRESPONSE']._serialized_start=915
+  _globals['_UPDATERECORDRESPONSE']._serialized_end=985
+  _globals['_DELETERECORDREQUEST']._serialized_start=987
+  _globals['_DELETERECORDREQUEST']._serialized_end=1047
+  _globals['_DELETERECORDRESPONSE']._serialized_start=1049
+  _globals['_DELETERECORDRESPONSE']._serialized_end=1105
+  _globals['_LISTRECORDSREQUEST']._serialized_start=1108
+  _globals['_LISTRECORDSREQUEST']._serialized_end=1313
+  _globals['_LISTRECORDSRESPONSE']._serialized_start=1316
+  _globals['_LISTRECORDSRESPONSE']._serialized_end=1527
+  _globals['_LISTRECORDSSTREAMREQUEST']._serialized_start=1530
+  _globals['_LISTRECORDSSTREAMREQUEST']._serialized_end=1687
+  _globals['_RECORDCHUNK']._serialized_start=1689
+  _globals['_RECORDCHUNK']._serialized_end=1808
+  _globals['_ROWERROR']._serialized_start=1810
+  _globals['_ROWERROR']._serialized_end=1852
+  _globals['_BATCHCREATERECORDSREQUEST']._serialized_start=1854
+  _globals['_BATCHCREATERECORDSREQUEST']._serialized_end=1918
+  _globals['_BATCHCREATERECORDSRESPONSE']._serialized_start=1920
+  _globals['_BATCHCREATERECORDSRESPONSE']._serialized_end=2038
+  _globals['_RECORDUPDATE']._serialized_start=2040
+  _globals['_RECORDUPDATE']._serialized_end=2087
+  _globals['_BATCHUPDATERECORDSREQUEST']._serialized_start=2089
+  _globals['_BATCHUPDATERECORDSREQUEST']._serialized_end=2177
+  _globals['_BATCHUPDATERECORDSRESPONSE']._serialized_start=2179
+  _globals['_BATCHUPDATERECORDSRESPONSE']._serialized_end=2301
+  _globals['_BATCHDELETERECORDSREQUEST']._serialized_start=2303
+  _globals['_BATCHDELETERECORDSREQUEST']._serialized_end=2370
+  _globals['_BATCHDELETERECORDSRESPONSE']._serialized_start=2372
+  _globals['_BATCHDELETERECORDSRESPONSE']._serialized_end=2494
+  _globals['_UPSERTRECORDSREQUEST']._serialized_start=2496
+  _globals['_UPSERTRECORDSREQUEST']._serialized_end=2605
+  _globals['_UPSERTRECORDSRESPONSE']._serialized_start=2607
+  _globals['_UPSERTRECORDSRESPONSE']._serialized_end=2724
+  _globals['_APPENDRECORDSREQUEST']._serialized_start=2726
+  _globals['_APPENDRECORDSREQUEST']._serialized_end=2818
+  _globals['_APPENDRECORDSRESPONSE']._serialized_start=2821
+  _globals['_APPENDRECORDSRESPONSE']._serialized_end=2987
+  _globals['_METERINGROLLUPSREQUEST']._serialized_start=2989
+  _globals['_METERINGROLLUPSREQUEST']._serialized_end=3093
+  _globals['_METERINGROLLUP']._serialized_start=3096
+  _globals['_METERINGROLLUP']._serialized_end=3253
+  _globals['_METERINGROLLUPSRESPONSE']._serialized_start=3255
+  _globals['_METERINGROLLUPSRESPONSE']._serialized_end=3357
+  _globals['_MIGRATIONREQUEST']._serialized_start=3359
+  _globals['_MIGRATIONREQUEST']._serialized_end=3431
+  _globals['_MIGRATIONRESPONSE']._serialized_start=3433
+  _globals['_MIGRATIONRESPONSE']._serialized_end=3512
+  _globals['_MIGRATIONSTATUSREQUEST']._serialized_start=3514
+  _globals['_MIGRATIONSTATUSREQUEST']._serialized_end=3538
+  _globals['_MIGRATIONSTATUSRESPONSE']._serialized_start=3540
+  _globals['_MIGRATIONSTATUSRESPONSE']._serialized_end=3636
+  _globals['_CREATETABLEREQUEST']._serialized_start=3638
+  _globals['_CREATETABLEREQUEST']._serialized_end=3700
+  _globals['_CREATETABLERESPONSE']._serialized_start=3702
+  _globals['_CREATETABLERESPONSE']._serialized_end=3757
+  _globals['_ADDCOLUMNREQUEST']._serialized_start=3759
+  _globals['_ADDCOLUMNREQUEST']._serialized_end=3880
+  _globals['_ADDCOLUMNRESPONSE']._serialized_start=3882
+  _globals['_ADDCOLUMNRESPONSE']._serialized_end=3935
+  _globals['_DROPCOLUMNREQUEST']._serialized_start=3937
+  _globals['_DROPCOLUMNREQUEST']._serialized_end=3997
+  _globals['_DROPCOLUMNRESPONSE']._serialized_start=3999
+  _globals['_DROPCOLUMNRESPONSE']._serialized_end=4053
+  _globals['_HEALTHCHECKREQUEST']._serialized_start=4055
+  _globals['_HEALTHCHECKREQUEST']._serialized_end=4075
+  _globals['_HEALTHCHECKRESPONSE']._serialized_start=4077
+  _globals['_HEALTHCHECKRESPONSE']._serialized_end=4149
+  _globals['_POOLSTATSREQUEST']._serialized_start=4151
+  _globals['_POOLSTATSREQUEST']._serialized_end=4169
+  _globals['_HISTOGRAMBUCKET']._serialized_start=4171
+  _globals['_HISTOGRAMBUCKET']._serialized_end=4215
+  _globals['_POOLSTATS']._serialized_start=4218
+  _globals['_POOLSTATS']._serialized_end=4475
+  _globals['_POOLSTATSRESPONSE']._serialized_start=4477
+  _globals['_POOLSTATSRESPONSE']._serialized_end=4566
+  _globals['_CACHESTATSREQUEST']._serialized_start=4568
+  _globals['_CACHESTATSREQUEST']._serialized_end=4587
+  _globals['_TABLECACHESTATS']._serialized_start=4589
+  _globals['_TABLECACHESTATS']._serialized_end=4716
+  _globals['_CACHESTATSRESPONSE']._serialized_start=4718
+  _globals['_CACHESTATSRESPONSE']._serialized_end=4815
+  _globals['_INDEXADVICEREQUEST']._serialized_start=4817
+  _globals['_INDEXADVICEREQUEST']._serialized_end=4857
+  _globals['_INDEXADVICE']._serialized_start=4860
+  _globals['_INDEXADVICE']._serialized_end=5137
+  _globals['_INDEXADVICERESPONSE']._serialized_start=5139
+  _globals['_INDEXADVICERESPONSE']._serialized_end=5257
+  _globals['_DATABASESERVICE']._serialized_start=5445
+  _globals['_DATABASESERVICE']._serialized_end=7162
 # @@protoc_insertion_point(module_scope)
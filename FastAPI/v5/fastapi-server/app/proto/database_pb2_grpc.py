@@ -60,6 +60,41 @@ class DatabaseServiceStub(object):
                 request_serializer=database__service__pb2.ListRecordsRequest.SerializeToString,
                 response_deserializer=database__service__pb2.ListRecordsResponse.FromString,
                 _registered_method=True)
+        self.ListRecordsStream = channel.unary_stream(
+                '/database.DatabaseService/ListRecordsStream',
+                request_serializer=database__service__pb2.ListRecordsStreamRequest.SerializeToString,
+                response_deserializer=database__service__pb2.RecordChunk.FromString,
+                _registered_method=True)
+        self.BatchCreateRecords = channel.unary_unary(
+                '/database.DatabaseService/BatchCreateRecords',
+                request_serializer=database__service__pb2.BatchCreateRecordsRequest.SerializeToString,
+                response_deserializer=database__service__pb2.BatchCreateRecordsResponse.FromString,
+                _registered_method=True)
+        self.BatchUpdateRecords = channel.unary_unary(
+                '/database.DatabaseService/BatchUpdateRecords',
+                request_serializer=database__service__pb2.BatchUpdateRecordsRequest.SerializeToString,
+                response_deserializer=database__service__pb2.BatchUpdateRecordsResponse.FromString,
+                _registered_method=True)
+        self.BatchDeleteRecords = channel.unary_unary(
+                '/database.DatabaseService/BatchDeleteRecords',
+                request_serializer=database__service__pb2.BatchDeleteRecordsRequest.SerializeToString,
+                response_deserializer=database__service__pb2.BatchDeleteRecordsResponse.FromString,
+                _registered_method=True)
+        self.UpsertRecords = channel.unary_unary(
+                '/database.DatabaseService/UpsertRecords',
+                request_serializer=database__service__pb2.UpsertRecordsRequest.SerializeToString,
+                response_deserializer=database__service__pb2.UpsertRecordsResponse.FromString,
+                _registered_method=True)
+        self.AppendRecords = channel.stream_unary(
+                '/database.DatabaseService/AppendRecords',
+                request_serializer=database__service__pb2.AppendRecordsRequest.SerializeToString,
+                response_deserializer=database__service__pb2.AppendRecordsResponse.FromString,
+                _registered_method=True)
+        self.GetMeteringRollups = channel.unary_unary(
+                '/database.DatabaseService/GetMeteringRollups',
+                request_serializer=database__service__pb2.MeteringRollupsRequest.SerializeToString,
+                response_deserializer=database__service__pb2.MeteringRollupsResponse.FromString,
+                _registered_method=True)
         self.RunMigration = channel.unary_unary(
                 '/database.DatabaseService/RunMigration',
                 request_serializer=database__service__pb2.MigrationRequest.SerializeToString,
@@ -90,6 +125,21 @@ class DatabaseServiceStub(object):
                 request_serializer=database__service__pb2.HealthCheckRequest.SerializeToString,
                 response_deserializer=database__service__pb2.HealthCheckResponse.FromString,
                 _registered_method=True)
+        self.GetPoolStats = channel.unary_unary(
+                '/database.DatabaseService/GetPoolStats',
+                request_serializer=database__service__pb2.PoolStatsRequest.SerializeToString,
+                response_deserializer=database__service__pb2.PoolStatsResponse.FromString,
+                _registered_method=True)
+        self.GetCacheStats = channel.unary_unary(
+                '/database.DatabaseService/GetCacheStats',
+                request_serializer=database__service__pb2.CacheStatsRequest.SerializeToString,
+                response_deserializer=database__service__pb2.CacheStatsResponse.FromString,
+                _registered_method=True)
+        self.GetIndexAdvice = channel.unary_unary(
+                '/database.DatabaseService/GetIndexAdvice',
+                request_serializer=database__service__pb2.IndexAdviceRequest.SerializeToString,
+                response_deserializer=database__service__pb2.IndexAdviceResponse.FromString,
+                _registered_method=True)
 
 
 class DatabaseServiceServicer(object):
@@ -126,6 +176,51 @@ class DatabaseServiceServicer(object):
         context.set_details('Method not implemented!')
         raise NotImplementedError('Method not implemented!')
 
+    def ListRecordsStream(self, request, context):
+        """Missing associated documentation comment in .proto file."""
+        context.set_code(grpc.StatusCode.UNIMPLEMENTED)
+        context.set_details('Method not implemented!')
+        raise NotImplementedError('Method not implemented!')
+
+    def BatchCreateRecords(self, request, context):
+        """Batch operations, each executed in a single transaction
+        """
+        context.set_code(grpc.StatusCode.UNIMPLEMENTED)
+        context.set_details('Method not implemented!')
+        raise NotImplementedError('Method not implemented!')
+
+    def BatchUpdateRecords(self, request, context):
+        """Missing associated documentation comment in .proto file."""
+        context.set_code(grpc.StatusCode.UNIMPLEMENTED)
+        context.set_details('Method not implemented!')
+        raise NotImplementedError('Method not implemented!')
+
+    def BatchDeleteRecords(self, request, context):
+        """Missing associated documentation comment in .proto file."""
+        context.set_code(grpc.StatusCode.UNIMPLEMENTED)
+        context.set_details('Method not implemented!')
+        raise NotImplementedError('Method not implemented!')
+
+    def UpsertRecords(self, request, context):
+        """Missing associated documentation comment in .proto file."""
+        context.set_code(grpc.StatusCode.UNIMPLEMENTED)
+        context.set_details('Method not implemented!')
+        raise NotImplementedError('Method not implemented!')
+
+    def AppendRecords(self, request_iterator, context):
+        """Client-streaming ingestion into append-only tables, written in background batches
+        """
+        context.set_code(grpc.StatusCode.UNIMPLEMENTED)
+        context.set_details('Method not implemented!')
+        raise NotImplementedError('Method not implemented!')
+
+    def GetMeteringRollups(self, request, context):
+        """Per-day IQ metering totals from the rollup table
+        """
+        context.set_code(grpc.StatusCode.UNIMPLEMENTED)
+        context.set_details('Method not implemented!')
+        raise NotImplementedError('Method not implemented!')
+
     def RunMigration(self, request, context):
         """Database migration operations
         """
@@ -164,6 +259,24 @@ class DatabaseServiceServicer(object):
         context.set_details('Method not implemented!')
         raise NotImplementedError('Method not implemented!')
 
+    def GetPoolStats(self, request, context):
+        """Missing associated documentation comment in .proto file."""
+        context.set_code(grpc.StatusCode.UNIMPLEMENTED)
+        context.set_details('Method not implemented!')
+        raise NotImplementedError('Method not implemented!')
+
+    def GetCacheStats(self, request, context):
+        """Missing associated documentation comment in .proto file."""
+        context.set_code(grpc.StatusCode.UNIMPLEMENTED)
+        context.set_details('Method not implemented!')
+        raise NotImplementedError('Method not implemented!')
+
+    def GetIndexAdvice(self, request, context):
+        """Missing associated documentation comment in .proto file."""
+        context.set_code(grpc.StatusCode.UNIMPLEMENTED)
+        context.set_details('Method not implemented!')
+        raise NotImplementedError('Method not implemented!')
+
 
 def add_DatabaseServiceServicer_to_server(servicer, server):
     rpc_method_handlers = {
@@ -192,6 +305,41 @@ def add_DatabaseServiceServicer_to_server(servicer, server):
                     request_deserializer=database__service__pb2.ListRecordsRequest.FromString,
                     response_serializer=database__service__pb2.ListRecordsResponse.SerializeToString,
             ),
+            'ListRecordsStream': grpc.unary_stream_rpc_method_handler(
+                    servicer.ListRecordsStream,
+                    request_deserializer=database__service__pb2.ListRecordsStreamRequest.FromString,
+                    response_serializer=database__service__pb2.RecordChunk.SerializeToString,
+            ),
+            'BatchCreateRecords': grpc.unary_unary_rpc_method_handler(
+                    servicer.BatchCreateRecords,
+                    request_deserializer=database__service__pb2.BatchCreateRecordsRequest.FromString,
+                    response_serializer=database__service__pb2.BatchCreateRecordsResponse.SerializeToString,
+            ),
+            'BatchUpdateRecords': grpc.unary_unary_rpc_method_handler(
+                    servicer.BatchUpdateRecords,
+                    request_deserializer=database__service__pb2.BatchUpdateRecordsRequest.FromString,
+                    response_serializer=database__service__pb2.BatchUpdateRecordsResponse.SerializeToString,
+            ),
+            'BatchDeleteRecords': grpc.unary_unary_rpc_method_handler(
+                    servicer.BatchDeleteRecords,
+                    request_deserializer=database__service__pb2.BatchDeleteRecordsRequest.FromString,
+                    response_serializer=database__service__pb2.BatchDeleteRecordsResponse.SerializeToString,
+            ),
+            'UpsertRecords': grpc.unary_unary_rpc_method_handler(
+                    servicer.UpsertRecords,
+                    request_deserializer=database__service__pb2.UpsertRecordsRequest.FromString,
+                    response_serializer=database__service__pb2.UpsertRecordsResponse.SerializeToString,
+            ),
+            'AppendRecords': grpc.stream_unary_rpc_method_handler(
+                    servicer.AppendRecords,
+                    request_deserializer=database__service__pb2.AppendRecordsRequest.FromString,
+                    response_serializer=database__service__pb2.AppendRecordsResponse.SerializeToString,
+            ),
+            'GetMeteringRollups': grpc.unary_unary_rpc_method_handler(
+                    servicer.GetMeteringRollups,
+                    request_deserializer=database__service__pb2.MeteringRollupsRequest.FromString,
+                    response_serializer=database__service__pb2.MeteringRollupsResponse.SerializeToString,
+            ),
             'RunMigration': grpc.unary_unary_rpc_method_handler(
                     servicer.RunMigration,
                     request_deserializer=database__service__pb2.MigrationRequest.FromString,
@@ -222,6 +370,21 @@ def add_DatabaseServiceServicer_to_server(servicer, server):
                     request_deserializer=database__service__pb2.HealthCheckRequest.FromString,
                     response_serializer=database__service__pb2.HealthCheckResponse.SerializeToString,
             ),
+            'GetPoolStats': grpc.unary_unary_rpc_method_handler(
+                    servicer.GetPoolStats,
+                    request_deserializer=database__service__pb2.PoolStatsRequest.FromString,
+                    response_serializer=database__service__pb2.PoolStatsResponse.SerializeToString,
+            ),
+            'GetCacheStats': grpc.unary_unary_rpc_method_handler(
+                    servicer.GetCacheStats,
+                    request_deserializer=database__service__pb2.CacheStatsRequest.FromString,
+                    response_serializer=database__service__pb2.CacheStatsResponse.SerializeToString,
+            ),
+            'GetIndexAdvice': grpc.unary_unary_rpc_method_handler(
+                    servicer.GetIndexAdvice,
+                    request_deserializer=database__service__pb2.IndexAdviceRequest.FromString,
+                    response_serializer=database__service__pb2.IndexAdviceResponse.SerializeToString,
+            ),
     }
     generic_handler = grpc.method_handlers_generic_handler(
             'database.DatabaseService', rpc_method_handlers)
@@ -368,6 +531,195 @@ class DatabaseService(object):
             metadata,
             _registered_method=True)
 
+    @staticmethod
+    def ListRecordsStream(request,
+            target,
+            options=(),
+            channel_credentials=None,
+            call_credentials=None,
+            insecure=False,
+            compression=None,
+            wait_for_ready=None,
+            timeout=None,
+            metadata=None):
+        return grpc.experimental.unary_stream(
+            request,
+            target,
+            '/database.DatabaseService/ListRecordsStream',
+            database__service__pb2.ListRecordsStreamRequest.SerializeToString,
+            database__service__pb2.RecordChunk.FromString,
+            options,
+            channel_credentials,
+            insecure,
+            call_credentials,
+            compression,
+            wait_for_ready,
+            timeout,
+            metadata,
+            _registered_method=True)
+
+    @staticmethod
+    def BatchCreateRecords(request,
+            target,
+            options=(),
+            channel_credentials=None,
+            call_credentials=None,
+            insecure=False,
+            compression=None,
+            wait_for_ready=None,
+            timeout=None,
+            metadata=None):
+        return grpc.experimental.unary_unary(
+            request,
+            target,
+            '/database.DatabaseService/BatchCreateRecords',
+            database__service__pb2.BatchCreateRecordsRequest.SerializeToString,
+            database__service__pb2.BatchCreateRecordsResponse.FromString,
+            options,
+            channel_credentials,
+            insecure,
+            call_credentials,
+            compression,
+            wait_for_ready,
+            timeout,
+            metadata,
+            _registered_method=True)
+
+    @staticmethod
+    def BatchUpdateRecords(request,
+            target,
+            options=(),
+            channel_credentials=None,
+            call_credentials=None,
+            insecure=False,
+            compression=None,
+            wait_for_ready=None,
+            timeout=None,
+            metadata=None):
+        return grpc.experimental.unary_unary(
+            request,
+            target,
+            '/database.DatabaseService/BatchUpdateRecords',
+            database__service__pb2.BatchUpdateRecordsRequest.SerializeToString,
+            database__service__pb2.BatchUpdateRecordsResponse.FromString,
+            options,
+            channel_credentials,
+            insecure,
+            call_credentials,
+            compression,
+            wait_for_ready,
+            timeout,
+            metadata,
+            _registered_method=True)
+
+    @staticmethod
+    def BatchDeleteRecords(request,
+            target,
+            options=(),
+            channel_credentials=None,
+            call_credentials=None,
+            insecure=False,
+            compression=None,
+            wait_for_ready=None,
+            timeout=None,
+            metadata=None):
+        return grpc.experimental.unary_unary(
+            request,
+            target,
+            '/database.DatabaseService/BatchDeleteRecords',
+            database__service__pb2.BatchDeleteRecordsRequest.SerializeToString,
+            database__service__pb2.BatchDeleteRecordsResponse.FromString,
+            options,
+            channel_credentials,
+            insecure,
+            call_credentials,
+            compression,
+            wait_for_ready,
+            timeout,
+            metadata,
+            _registered_method=True)
+
+    @staticmethod
+    def UpsertRecords(request,
+            target,
+            options=(),
+            channel_credentials=None,
+            call_credentials=None,
+            insecure=False,
+            compression=None,
+            wait_for_ready=None,
+            timeout=None,
+            metadata=None):
+        return grpc.experimental.unary_unary(
+            request,
+            target,
+            '/database.DatabaseService/UpsertRecords',
+            database__service__pb2.UpsertRecordsRequest.SerializeToString,
+            database__service__pb2.UpsertRecordsResponse.FromString,
+            options,
+            channel_credentials,
+            insecure,
+            call_credentials,
+            compression,
+            wait_for_ready,
+            timeout,
+            metadata,
+            _registered_method=True)
+
+    @staticmethod
+    def AppendRecords(request_iterator,
+            target,
+            options=(),
+            channel_credentials=None,
+            call_credentials=None,
+            insecure=False,
+            compression=None,
+            wait_for_ready=None,
+            timeout=None,
+            metadata=None):
+        return grpc.experimental.stream_unary(
+            request_iterator,
+            target,
+            '/database.DatabaseService/AppendRecords',
+            database__service__pb2.AppendRecordsRequest.SerializeToString,
+            database__service__pb2.AppendRecordsResponse.FromString,
+            options,
+            channel_credentials,
+            insecure,
+            call_credentials,
+            compression,
+            wait_for_ready,
+            timeout,
+            metadata,
+            _registered_method=True)
+
+    @staticmethod
+    def GetMeteringRollups(request,
+            target,
+            options=(),
+            channel_credentials=None,
+            call_credentials=None,
+            insecure=False,
+            compression=None,
+            wait_for_ready=None,
+            timeout=None,
+            metadata=None):
+        return grpc.experimental.unary_unary(
+            request,
+            target,
+            '/database.DatabaseService/GetMeteringRollups',
+            database__service__pb2.MeteringRollupsRequest.SerializeToString,
+            database__service__pb2.MeteringRollupsResponse.FromString,
+            options,
+            channel_credentials,
+            insecure,
+            call_credentials,
+            compression,
+            wait_for_ready,
+            timeout,
+            metadata,
+            _registered_method=True)
+
     @staticmethod
     def RunMigration(request,
             target,
@@ -529,3 +881,84 @@ class DatabaseService(object):
             timeout,
             metadata,
             _registered_method=True)
+
+    @staticmethod
+    def GetPoolStats(request,
+            target,
+            options=(),
+            channel_credentials=None,
+            call_credentials=None,
+            insecure=False,
+            compression=None,
+            wait_for_ready=None,
+            timeout=None,
+            metadata=None):
+        return grpc.experimental.unary_unary(
+            request,
+            target,
+            '/database.DatabaseService/GetPoolStats',
+            database__service__pb2.PoolStatsRequest.SerializeToString,
+            database__service__pb2.PoolStatsResponse.FromString,
+            options,
+            channel_credentials,
+            insecure,
+            call_credentials,
+            compression,
+            wait_for_ready,
+            timeout,
+            metadata,
+            _registered_method=True)
+
+    @staticmethod
+    def GetCacheStats(request,
+            target,
+            options=(),
+            channel_credentials=None,
+            call_credentials=None,
+            insecure=False,
+            compression=None,
+            wait_for_ready=None,
+            timeout=None,
+            metadata=None):
+        return grpc.experimental.unary_unary(
+            request,
+            target,
+            '/database.DatabaseService/GetCacheStats',
+            database__service__pb2.CacheStatsRequest.SerializeToString,
+            database__service__pb2.CacheStatsResponse.FromString,
+            options,
+            channel_credentials,
+            insecure,
+            call_credentials,
+            compression,
+            wait_for_ready,
+            timeout,
+            metadata,
+            _registered_method=True)
+
+    @staticmethod
+    def GetIndexAdvice(request,
+            target,
+            options=(),
+            channel_credentials=None,
+            call_credentials=None,
+            insecure=False,
+            compression=None,
+            wait_for_ready=None,
+            timeout=None,
+            metadata=None):
+        return grpc.experimental.unary_unary(
+            request,
+            target,
+            '/database.DatabaseService/GetIndexAdvice',
+            database__service__pb2.IndexAdviceRequest.SerializeToString,
+            database__service__pb2.IndexAdviceResponse.FromString,
+            options,
+            channel_credentials,
+            insecure,
+            call_credentials,
+            compression,
+            wait_for_ready,
+            timeout,
+            metadata,
+            _registered_method=True)
@@ -1,12 +1,25 @@
 import json
+import time
 import uuid
-from typing import Optional, List
+from typing import NamedTuple, Optional, List
 from datetime import datetime, timedelta
 from app.proto import database_pb2, database_pb2_grpc
 from app.schemas.user import UserSession
 from app.core.config import settings
+from app.core.metrics import SESSION_LOOKUPS
+from app.core.security import decode_token
 import grpc
 
+# Session flags, stored as a bitmask with the compact session format
+SESSION_FLAG_REFRESHED = 1  # Created from a refresh token rather than a login
+SESSION_FLAG_OAUTH = 2  # Created by an OAuth login
+
+
+class SessionInfo(NamedTuple):
+    user_id: int
+    expires_at: float  # Unix time
+    flags: int = 0
+
 
 class SessionService:
     def __init__(self, grpc_stub: database_pb2_grpc.DatabaseServiceStub, redis):
@@ -15,7 +28,7 @@ class SessionService:
 
     async def create_session(self, user_id: int, access_token: str, 
                            refresh_token: str, user_agent: str = None, 
-                           ip_address: str = None) -> UserSession:
+                           ip_address: str = None, flags: int = 0) -> UserSession:
         """Create a new user session"""
         session_token = str(uuid.uuid4())
         expires_at = datetime.utcnow() + timedelta(minutes=settings.ACCESS_TOKEN_EXPIRE_MINUTES)
@@ -40,17 +53,26 @@ class SessionService:
         if response.success:
             session_data["id"] = response.record_id
             
-            # Store tokens in Redis
-            await self.redis.setex(
-                f"session_tokens:{response.record_id}",
-                settings.ACCESS_TOKEN_EXPIRE_MINUTES * 60,
-                json.dumps({
-                    "access_token": access_token,
-                    "refresh_token": refresh_token
-                })
-            )
+            ttl = settings.ACCESS_TOKEN_EXPIRE_MINUTES * 60
+            if settings.SESSION_FORMAT == "hash":
+                # What get_current_user needs, readable without JSON or JWT work
+                key = f"session_info:{response.record_id}"
+                pipe = self.redis.pipeline(transaction=False)
+                pipe.hset(key, mapping={"u": user_id, "e": int(time.time()) + ttl, "f": flags})
+                pipe.expire(key, ttl)
+                await pipe.execute()
+            else:
+                # Store tokens in Redis
+                await self.redis.setex(
+                    f"session_tokens:{response.record_id}",
+                    ttl,
+                    json.dumps({
+                        "access_token": access_token,
+                        "refresh_token": refresh_token
+                    })
+                )
             
-            return UserSession(**session_data)
+            return UserSession(**session_data, refresh_token=refresh_token)
         else:
             raise Exception(f"Failed to create session: {response.message}")
 
@@ -70,7 +92,8 @@ class SessionService:
             table_name="user_sessions",
             page=1,
             page_size=1,
-            filter=json.dumps({"user_id": user_id, "is_active": True})
+            filter=json.dumps({"user_id": user_id, "is_active": True}),
+            count_mode=database_pb2.COUNT_NONE
         )
         response = await self.stub.ListRecords(request)
         
@@ -96,13 +119,15 @@ class SessionService:
         
         if keys:
             await self.redis.delete(*keys)
+        session_ids = []
         
         # Mark all sessions as inactive in database
         request = database_pb2.ListRecordsRequest(
             table_name="user_sessions",
             page=1,
             page_size=1000,  # Assuming a user won't have more than 1000 sessions
-            filter=json.dumps({"user_id": user_id, "is_active": True})
+            filter=json.dumps({"user_id": user_id, "is_active": True}),
+            count_mode=database_pb2.COUNT_NONE
         )
         response = await self.stub.ListRecords(request)
         
@@ -110,6 +135,7 @@ class SessionService:
             for record in response.records:
                 session_data = json.loads(record)
                 session_id = session_data["id"]
+                session_ids.append(session_id)
                 
                 update_request = database_pb2.UpdateRecordRequest(
                     table_name="user_sessions",
@@ -117,6 +143,9 @@ class SessionService:
                     data=json.dumps({"is_active": False})
                 )
                 await self.stub.UpdateRecord(update_request)
+        
+        for session_id in session_ids:
+            await self.delete_session(session_id)
 
     async def get_user_sessions(self, user_id: int, active_only: bool = True) -> List[UserSession]:
         """Get all sessions for a user"""
@@ -128,7 +157,8 @@ class SessionService:
             table_name="user_sessions",
             page=1,
             page_size=100,
-            filter=json.dumps(filter_data)
+            filter=json.dumps(filter_data),
+            count_mode=database_pb2.COUNT_NONE
         )
         response = await self.stub.ListRecords(request)
         
@@ -144,3 +174,28 @@ class SessionService:
         """Get tokens for a session"""
         tokens = await self.redis.get(f"session_tokens:{session_id}")
         return json.loads(tokens) if tokens else None
+
+    async def get_session(self, session_id: str) -> Optional[SessionInfo]:
+        """Resolve a live session from either stored format"""
+        if settings.SESSION_FORMAT == "hash":
+            user_id, expires_at, flags = await self.redis.hmget(f"session_info:{session_id}", "u", "e", "f")
+            if user_id is not None:
+                SESSION_LOOKUPS.labels("hash").inc()
+                if int(expires_at) <= time.time():
+                    return None
+                return SessionInfo(int(user_id), float(expires_at), int(flags or 0))
+
+        # Sessions stored as a token pair, including ones created before a switch to "hash"
+        tokens = await self.get_session_tokens(session_id)
+        if not tokens:
+            return None
+        SESSION_LOOKUPS.labels("json").inc()
+        payload = decode_token(tokens["access_token"])
+        user_id = payload.get("sub")
+        if not user_id:
+            return None
+        return SessionInfo(int(user_id), float(payload.get("exp", 0)))
+
+    async def delete_session(self, session_id):
+        """Drop a session's Redis entries so it stops authenticating immediately"""
+        await self.redis.delete(f"session_info:{session_id}", f"session_tokens:{session_id}")
@@ -2,7 +2,9 @@ import json
 from typing import Optional, List
 from app.proto import database_pb2, database_pb2_grpc
 from app.schemas.user import UserCreate, UserUpdate, User
-from app.core.security import get_password_hash, verify_password
+from app.core.metrics import PASSWORD_REHASHES
+from app.core.security import get_password_hash_async, verify_password_async
+from app.core.user_cache import user_cache
 from datetime import datetime
 import grpc
 
@@ -27,6 +29,10 @@ class UserService:
         except grpc.RpcError:
             return None
 
+    async def get_cached_user(self, user_id: int) -> Optional[User]:
+        """Get user by ID through the short-lived user cache"""
+        return await user_cache.get_user(user_id, self.get_user_by_id)
+
     async def get_user_by_email(self, email: str) -> Optional[User]:
         """Get user by email"""
         try:
@@ -34,7 +40,8 @@ class UserService:
                 table_name="users",
                 page=1,
                 page_size=1,
-                filter=json.dumps({"email": email})
+                filter=json.dumps({"email": email}),
+                count_mode=database_pb2.COUNT_NONE
             )
             response = await self.stub.ListRecords(request)
             
@@ -52,7 +59,8 @@ class UserService:
                 table_name="users",
                 page=1,
                 page_size=1,
-                filter=json.dumps({"username": username})
+                filter=json.dumps({"username": username}),
+                count_mode=database_pb2.COUNT_NONE
             )
             response = await self.stub.ListRecords(request)
             
@@ -86,7 +94,7 @@ class UserService:
 
     async def create_user(self, user_create: UserCreate) -> User:
         """Create a new user"""
-        hashed_password = get_password_hash(user_create.password)
+        hashed_password = await get_password_hash_async(user_create.password)
         
         user_data = {
             "email": user_create.email,
@@ -114,25 +122,22 @@ class UserService:
 
     async def update_user(self, user_id: int, user_update: UserUpdate) -> Optional[User]:
         """Update user"""
-        # First get the existing user
-        existing_user = await self.get_user_by_id(user_id)
-        if not existing_user:
-            return None
-        
         # Update only the provided fields
         update_data = user_update.dict(exclude_unset=True)
         update_data["updated_at"] = datetime.utcnow().isoformat()
         
+        # A missing user fails the update, and the updated row comes back with it
         request = database_pb2.UpdateRecordRequest(
             table_name="users",
             record_id=user_id,
-            data=json.dumps(update_data)
+            data=json.dumps(update_data),
+            return_record=True
         )
         response = await self.stub.UpdateRecord(request)
+        await user_cache.invalidate(user_id)
         
-        if response.success:
-            # Return updated user
-            return await self.get_user_by_id(user_id)
+        if response.success and response.data:
+            return User(**json.loads(response.data))
         return None
 
     async def delete_user(self, user_id: int) -> bool:
@@ -143,6 +148,8 @@ class UserService:
                 record_id=user_id
             )
             response = await self.stub.DeleteRecord(request)
+            if response.success:
+                await user_cache.invalidate(user_id)
             return response.success
         except grpc.RpcError:
             return False
@@ -152,10 +159,29 @@ class UserService:
         user = await self.get_user_by_email(email)
         if not user or not user.hashed_password:
             return None
-        if not verify_password(password, user.hashed_password):
+        valid, new_hash = await verify_password_async(password, user.hashed_password)
+        if not valid:
             return None
+        if new_hash:
+            await self._update_password_hash(user, new_hash)
         return user
 
+    async def _update_password_hash(self, user: User, new_hash: str):
+        """Store a hash upgraded to the current scheme; a failure leaves the old one working"""
+        try:
+            request = database_pb2.UpdateRecordRequest(
+                table_name="users",
+                record_id=user.id,
+                data=json.dumps({"hashed_password": new_hash})
+            )
+            response = await self.stub.UpdateRecord(request)
+            if response.success:
+                user.hashed_password = new_hash
+                PASSWORD_REHASHES.inc()
+                await user_cache.invalidate(user.id)
+        except grpc.RpcError:
+            pass
+
     async def create_oauth_user(self, email: str, username: str, full_name: str, 
                                oauth_provider: str, oauth_id: str) -> User:
         """Create OAuth user"""
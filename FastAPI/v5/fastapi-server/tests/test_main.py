@@ -1,6 +1,14 @@
+import asyncio
+import hashlib
+import time
 import pytest
 from fastapi.testclient import TestClient
 from app.main import app
+from app.core import security
+from app.core.security import create_access_token, decode_token, get_password_hash_async, verify_password_async
+from app.core.grpc_client import GRPCDatabaseClient
+from app.core.user_cache import UserCache
+from app.schemas.user import User
 
 client = TestClient(app)
 
@@ -14,5 +22,62 @@ def test_health_check():
     assert response.status_code == 200
     assert response.json()["status"] == "healthy"
 
+def test_user_cache_invalidation():
+    loads = []
+
+    async def load_user(user_id):
+        loads.append(user_id)
+        return User(id=user_id, email="test@example.com", username="test", created_at="2024-01-01T00:00:00")
+
+    async def run():
+        cache = UserCache(ttl=30, max_entries=10)
+        await cache.get_user(1, load_user)
+        await cache.get_user(1, load_user)
+        await cache.invalidate(1)
+        await cache.get_user(1, load_user)
+
+    asyncio.run(run())
+    assert loads == [1, 1]
+
+def test_password_hashing_off_event_loop():
+    async def run():
+        hashed = await get_password_hash_async("correct horse")
+        return await verify_password_async("correct horse", hashed), await verify_password_async("wrong", hashed)
+
+    (valid, new_hash), (invalid, _) = asyncio.run(run())
+    assert valid and new_hash is None
+    assert not invalid
+
+def test_token_cache_honours_exp():
+    token = create_access_token({"sub": "42"})
+    digest = hashlib.sha256(token.encode()).digest()
+    assert decode_token(token)["sub"] == "42"
+    assert digest in security._verified_tokens
+
+    # An entry past its exp is dropped and the token verified again
+    security._verified_tokens[digest] = (time.time() - 1, {"sub": "stale"})
+    assert decode_token(token)["sub"] == "42"
+
+def test_list_records_rejects_unknown_count_mode():
+    local_client = TestClient(app, base_url="http://localhost")
+    response = local_client.post("/api/v1/grpc/list_records", json={"table_name": "user", "count_mode": "exactly"})
+    assert response.status_code == 422
+
+def test_grpc_channel_pool_round_robin():
+    async def run():
+        pool = GRPCDatabaseClient(pool_size=3)
+        await pool.connect()
+        stubs = [pool.get_stub() for _ in range(6)]
+        await pool.close()
+        return stubs
+
+    stubs = asyncio.run(run())
+    assert len({id(stub) for stub in stubs}) == 3
+    assert stubs[:3] == stubs[3:]
+
+def test_grpc_get_stub_before_connect():
+    with pytest.raises(RuntimeError, match="not connected"):
+        GRPCDatabaseClient(pool_size=2).get_stub()
+
 # Note: Additional tests would require mocking the gRPC client
 # This is a basic structure for testing